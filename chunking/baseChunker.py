@@ -1,5 +1,12 @@
 from abc import ABC, abstractmethod
-from typing import Dict, Any, List
+from typing import Dict, Any, List, Iterable, Iterator, Union, TextIO
+
+# 流式分块时每次读取的字符数
+STREAM_READ_SIZE = 1 << 20
+# 流式分块时每个文本段的目标大小(字符数)，文本段在段落边界("\n\n")处切开
+STREAM_SEGMENT_SIZE = 1 << 20
+
+TextSource = Union[str, Iterable[str], TextIO]
 
 
 class Document:
@@ -21,10 +28,89 @@ class Document:
         return f"{metadata_str}\n\n{self.chunk}"
 
 
+def iter_text_pieces(source: TextSource, read_size: int = STREAM_READ_SIZE) -> Iterator[str]:
+    """
+    将字符串、字符串迭代器或文本文件句柄统一为字符串片段的迭代器，片段的边界是任意的。
+    """
+    if isinstance(source, str):
+        yield source
+    elif hasattr(source, "read"):
+        while True:
+            piece = source.read(read_size)
+            if not piece:
+                return
+            yield piece
+    else:
+        for piece in source:
+            if piece:
+                yield piece
+
+
+def iter_lines(source: TextSource) -> Iterator[str]:
+    """
+    按 "\n" 逐行产出文本(不含换行符)，结果与 text.split("\n") 一致，但不会一次性构造所有行。
+    """
+    remainder = ""
+    for piece in iter_text_pieces(source):
+        if remainder:
+            piece = remainder + piece
+        start = 0
+        while True:
+            end = piece.find("\n", start)
+            if end == -1:
+                break
+            yield piece[start:end]
+            start = end + 1
+        remainder = piece[start:]
+    yield remainder
+
+
+def iter_text_segments(source: TextSource, segment_size: int = STREAM_SEGMENT_SIZE) -> Iterator[str]:
+    """
+    将文本切成约 segment_size 大小的文本段，尽量在段落边界("\n\n")处切开，
+    找不到段落边界时退而在换行处切开，文本段最多为 segment_size 的两倍。
+    """
+    buffer, start = "", 0
+    for piece in iter_text_pieces(source):
+        # 用起始下标代替反复切片，避免大字符串被多次复制
+        buffer, start = buffer[start:] + piece, 0
+        while len(buffer) - start >= segment_size:
+            limit = start + 2 * segment_size
+            cut = buffer.rfind("\n\n", start, limit)
+            if cut > start:
+                cut += 2
+            else:
+                cut = buffer.rfind("\n", start, limit) + 1
+                if cut <= start:
+                    if len(buffer) < limit:
+                        break
+                    cut = limit
+            yield buffer[start:cut]
+            start = cut
+    if start < len(buffer):
+        yield buffer[start:]
+
+
 class BaseChunker(ABC):
     def __init__(self):
         pass
 
+    def iter_chunks(self, source: TextSource, title: str = "", **kwargs) -> Iterator[Document]:
+        """
+        流式分块：从字符串、字符串迭代器或文本文件句柄中增量读取文本，逐个产出 Document，
+        内存占用只与单个文本段的大小有关，可直接传给 MilvusEmbeddingManager.ingest。
+
+        默认实现按段落边界把文本切成有限大小的文本段后逐段调用 chunk，
+        因此结果只在文本段边界处可能与一次性调用 chunk 不同。
+
+        Args:
+            source: 要切分的文本、文本片段迭代器或文本文件句柄
+            title (str): 文档标题，默认为空字符串
+            **kwargs: 传给 chunk 的其他参数
+        """
+        for segment in iter_text_segments(source):
+            yield from self.chunk(segment, title=title, **kwargs)
+
     @abstractmethod
     def chunk(self, text: str, title: str = "", **kwargs) -> List[Document]:
         """
@@ -3,8 +3,82 @@ import sys
 sys.path.append(".")
 sys.path.append("..")
 
-from typing import List, Dict, Tuple, Any, Optional
-from chunking.baseChunker import BaseChunker, Document
+from typing import List, Dict, Tuple, Any, Optional, Iterator
+from chunking.baseChunker import BaseChunker, Document, TextSource, iter_text_pieces
+
+
+# Supported HTML parser backends of HTMLChunker
+HTML_PARSER_BACKENDS = ("html.parser", "lxml")
+
+
+class _SectionState:
+    """Header tracking shared by the parser backends of HTMLChunker."""
+
+    def __init__(self, chunker: "HTMLChunker", title: str):
+        self.chunker = chunker
+        self.title = title
+        self.active_headers: Dict[str, Tuple[str, int, int]] = {}  # {header_name: (text, level, depth)}
+        self.current_chunk: List[str] = []
+
+    def metadata(self) -> Dict[str, str]:
+        meta = {}
+        if self.title:
+            meta["title"] = self.title
+        meta.update({k: v[0] for k, v in self.active_headers.items()})
+        return meta
+
+    def finalize_chunk(self) -> Optional[Document]:
+        """Finalize the current chunk into a Document."""
+        if not self.current_chunk:
+            return None
+        final_text = "  \n".join(line for line in self.current_chunk if line.strip())
+        self.current_chunk.clear()
+        if not final_text.strip():
+            return None
+        return Document(chunk=final_text, metadata=self.metadata())
+
+    def add_node(self, tag: str, node_text: str, dom_depth: int) -> Iterator[Document]:
+        """Consume the direct text of one element and yield the Documents it completes."""
+        # Handle header tags
+        if tag in self.chunker.header_mapping:
+            if not self.chunker.return_each_element:
+                doc = self.finalize_chunk()
+                if doc:
+                    yield doc
+
+            # Determine header level (e.g., h1 -> 1)
+            level = int(tag[1:]) if tag[1:].isdigit() else 9999
+
+            # Remove headers at or below this level
+            headers_to_remove = [k for k, (_, lvl, _) in self.active_headers.items() if lvl >= level]
+            for key in headers_to_remove:
+                del self.active_headers[key]
+
+            # Update active headers
+            header_name = self.chunker.header_mapping[tag]
+            self.active_headers[header_name] = (node_text, level, dom_depth)
+
+            # Add header as a Document
+            yield Document(chunk=node_text, metadata=self.metadata())
+
+        # Handle non-header content
+        else:
+            # Remove headers out of scope (deeper than current depth)
+            headers_out_of_scope = [k for k, (_, _, d) in self.active_headers.items() if dom_depth < d]
+            for key in headers_out_of_scope:
+                del self.active_headers[key]
+
+            if self.chunker.return_each_element:
+                yield Document(chunk=node_text, metadata=self.metadata())
+            else:
+                self.current_chunk.append(node_text)
+
+    def close(self) -> Iterator[Document]:
+        # Finalize any remaining chunk
+        if not self.chunker.return_each_element:
+            doc = self.finalize_chunk()
+            if doc:
+                yield doc
 
 
 class HTMLChunker(BaseChunker):
@@ -13,14 +87,49 @@ class HTMLChunker(BaseChunker):
     def __init__(
         self,
         html_headers_to_split_on: List[Tuple[str, str]],
-        return_each_element: bool = False
+        return_each_element: bool = False,
+        parser_backend: str = "html.parser"
     ):
-        """Initialize the HTMLChunker with splitting options."""
+        """
+        Initialize the HTMLChunker with splitting options.
+
+        Args:
+            html_headers_to_split_on: (tag, metadata name) pairs of the headers to split on
+            return_each_element: Whether to return one Document per element instead of per section
+            parser_backend: "html.parser" (BeautifulSoup, pure Python, the reference behaviour) or
+                "lxml" (libxml2, C parser with streaming support in iter_chunks). The lxml backend
+                produces the same Documents as html.parser on well-formed markup, including loose
+                text directly inside <body>, which both join into one leading node. Malformed markup
+                is repaired by libxml2 its own way (e.g. <p>x<h2>H</h2>y</p> closes the <p> before
+                <h2>, so "y" follows the header). Its chunk() and iter_chunks() always agree.
+        """
         super().__init__()
+        if parser_backend not in HTML_PARSER_BACKENDS:
+            raise ValueError(f"Invalid HTML parser backend: '{parser_backend}'. "
+                             f"Valid backends are: {', '.join(HTML_PARSER_BACKENDS)}")
         self.html_headers_to_split_on = sorted(html_headers_to_split_on, key=lambda x: int(x[0][1:]))
         self.header_mapping = dict(self.html_headers_to_split_on)
         self.header_tags = [tag for tag, _ in self.html_headers_to_split_on]
         self.return_each_element = return_each_element
+        self.parser_backend = parser_backend
+
+    def iter_chunks(self, source: TextSource, title: str = "", **kwargs) -> Iterator[Document]:
+        """
+        Yield the Documents of an HTML source lazily.
+
+        With the "lxml" backend the source is fed to an incremental parser and every top-level
+        element of <body> is reduced to its text nodes and released as soon as it is closed, so
+        the parsed tree never holds more than the largest top-level element. Loose text directly
+        inside <body> comes first in the reference order no matter where it appears, so the
+        Documents are produced once <body> is closed. Content outside <body> (e.g. <head>) is
+        skipped. With the "html.parser" backend the HTML tree has
+        to be parsed as a whole, so the source is read completely before the first Document is
+        produced; only the output side is incremental.
+        """
+        if self.parser_backend == "lxml":
+            yield from self._iter_chunks_lxml(source, title)
+        else:
+            yield from self.chunk("".join(iter_text_pieces(source)), title=title, **kwargs)
 
     def chunk(self, text: str, title: str = "", **kwargs) -> List[Document]:
         """
@@ -34,8 +143,12 @@ class HTMLChunker(BaseChunker):
         Returns:
             List[Document]: A list of Document objects with chunk and metadata
         """
+        if self.parser_backend == "lxml":
+            return self._chunk_lxml(text, title)
+
         try:
             from bs4 import BeautifulSoup
+            from bs4.element import Tag
         except ImportError:
             raise ImportError("Please install BeautifulSoup via `pip install bs4`.")
 
@@ -43,25 +156,7 @@ class HTMLChunker(BaseChunker):
         soup = BeautifulSoup(text, "html.parser")
         body = soup.body if soup.body else soup
 
-        # Internal state for chunking
-        active_headers: Dict[str, Tuple[str, int, int]] = {}  # {header_name: (text, level, depth)}
-        current_chunk: List[str] = []
-
-        def finalize_chunk() -> Optional[Document]:
-            """Finalize the current chunk into a Document."""
-            if not current_chunk:
-                return None
-            final_text = "  \n".join(line for line in current_chunk if line.strip())
-            current_chunk.clear()
-            if not final_text.strip():
-                return None
-            final_meta = {}
-            if title:
-                final_meta["title"] = title
-            final_meta.update({k: v[0] for k, v in active_headers.items()})
-            return Document(chunk=final_text, metadata=final_meta)
-
-        # Result list
+        state = _SectionState(self, title)
         documents: List[Document] = []
 
         # DFS traversal using a stack
@@ -69,7 +164,6 @@ class HTMLChunker(BaseChunker):
         while stack:
             node = stack.pop()
             children = list(node.children)
-            from bs4.element import Tag
 
             for child in reversed(children):
                 if isinstance(child, Tag):
@@ -85,56 +179,118 @@ class HTMLChunker(BaseChunker):
                 continue
 
             dom_depth = len(list(node.parents))
+            documents.extend(state.add_node(tag, node_text, dom_depth))
 
-            # Handle header tags
-            if tag in self.header_tags:
-                if not self.return_each_element:
-                    doc = finalize_chunk()
-                    if doc:
-                        documents.append(doc)
-
-                # Determine header level (e.g., h1 -> 1)
-                level = int(tag[1:]) if tag[1:].isdigit() else 9999
-
-                # Remove headers at or below this level
-                headers_to_remove = [k for k, (_, lvl, _) in active_headers.items() if lvl >= level]
-                for key in headers_to_remove:
-                    del active_headers[key]
-
-                # Update active headers
-                header_name = self.header_mapping[tag]
-                active_headers[header_name] = (node_text, level, dom_depth)
-
-                # Add header as a Document
-                header_meta = {}
-                if title:
-                    header_meta["title"] = title
-                header_meta.update({k: v[0] for k, v in active_headers.items()})
-                documents.append(Document(chunk=node_text, metadata=header_meta))
-
-            # Handle non-header content
-            else:
-                # Remove headers out of scope (deeper than current depth)
-                headers_out_of_scope = [k for k, (_, _, d) in active_headers.items() if dom_depth < d]
-                for key in headers_out_of_scope:
-                    del active_headers[key]
-
-                if self.return_each_element:
-                    meta = {}
-                    if title:
-                        meta["title"] = title
-                    meta.update({k: v[0] for k, v in active_headers.items()})
-                    documents.append(Document(chunk=node_text, metadata=meta))
-                else:
-                    current_chunk.append(node_text)
+        documents.extend(state.close())
+        return documents
 
-        # Finalize any remaining chunk
-        if not self.return_each_element:
-            doc = finalize_chunk()
-            if doc:
-                documents.append(doc)
+    @staticmethod
+    def _import_lxml():
+        try:
+            from lxml import etree
+        except ImportError:
+            raise ImportError("Please install lxml via `pip install lxml` to use the lxml HTML parser backend.")
+        return etree
 
-        return documents
+    @staticmethod
+    def _lxml_direct_text(element, etree) -> str:
+        """Join the direct text of an element like BeautifulSoup's find_all(string=True, recursive=False)."""
+        text_elements = [element.text] if element.text else []
+        for child in element:
+            # comments are strings of their parent in BeautifulSoup
+            if child.tag is etree.Comment and child.text:
+                text_elements.append(child.text)
+            if child.tail:
+                text_elements.append(child.tail)
+        return " ".join(elem for elem in (e.strip() for e in text_elements) if elem)
+
+    def _iter_lxml_nodes(self, root, root_depth: int, etree) -> Iterator[Tuple[str, str, int]]:
+        """Pre-order traversal of an lxml subtree, the same order as the BeautifulSoup backend."""
+        stack = [(root, root_depth)]
+        while stack:
+            node, dom_depth = stack.pop()
+            children = list(node.iterchildren(etree.Element))
+            for child in reversed(children):
+                stack.append((child, dom_depth + 1))
+
+            node_text = self._lxml_direct_text(node, etree)
+            if not node_text:
+                continue
+            yield node.tag, node_text, dom_depth
+
+    def _chunk_lxml(self, text: str, title: str = "") -> List[Document]:
+        """Chunk a whole HTML document with lxml, the same Documents as the streaming lxml path."""
+        return list(self._iter_chunks_lxml(text, title))
+
+    def _iter_chunks_lxml(self, source: TextSource, title: str = "") -> Iterator[Document]:
+        """Streaming lxml chunking: reduce and free each top-level element of <body> once it closes."""
+        etree = self._import_lxml()
+        parser = etree.HTMLPullParser(events=("start", "end"))
+        state = _SectionState(self, title)
+        body = None
+        body_text_done = False
+        # loose text directly inside <body>, and the (tag, text, depth) nodes of its closed children
+        loose_texts: List[str] = []
+        nodes: List[Tuple[str, str, int]] = []
+
+        def collect_before(element) -> None:
+            """Collect the loose text of <body> up to `element` and drop the nodes already reduced."""
+            nonlocal body_text_done
+            if not body_text_done:
+                body_text_done = True
+                loose_texts.append(body.text or "")
+            for node in list(body):
+                if node is element:
+                    break
+                # comments are not reported as events, their text is loose text as well
+                if node.tag is etree.Comment:
+                    loose_texts.append(node.text or "")
+                loose_texts.append(node.tail or "")
+                body.remove(node)
+
+        def handle_events() -> Iterator[Document]:
+            nonlocal body
+            for event, element in parser.read_events():
+                if event == "start":
+                    if body is None and element.tag == "body":
+                        body = element
+                    continue
+                if body is None:
+                    continue
+                if element is body:
+                    # <body> is the first node in pre-order, its direct text precedes all children
+                    collect_before(None)
+                    body_text = " ".join(text for text in (t.strip() for t in loose_texts) if text)
+                    if body_text:
+                        yield from state.add_node(body.tag, body_text, 0)
+                    for node in nodes:
+                        yield from state.add_node(*node)
+                    loose_texts.clear()
+                    nodes.clear()
+                    continue
+                if element.getparent() is not body:
+                    continue
+
+                # a top-level element of <body> is complete
+                collect_before(element)
+                nodes.extend(self._iter_lxml_nodes(element, 1, etree))
+                element.clear(keep_tail=True)
+
+        fed = False
+        for piece in iter_text_pieces(source):
+            if not piece.strip() and not fed:
+                continue
+            fed = True
+            parser.feed(piece)
+            yield from handle_events()
+        if fed:
+            root = parser.close()
+            yield from handle_events()
+            if body is None and root is not None:
+                # no <body> was reported, chunk the whole document at once
+                for node in self._iter_lxml_nodes(root, 0, etree):
+                    yield from state.add_node(*node)
+        yield from state.close()
     
     
 # Example usage:
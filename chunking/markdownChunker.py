@@ -1,11 +1,12 @@
+import re
 import sys
 
 sys.path.append(".")
 sys.path.append("..")
 
-from typing import List, Union, Literal, Any, Dict
+from typing import List, Union, Literal, Any, Dict, Iterable, Iterator, Tuple
 from chunking.baseChunker import BaseChunker
-from chunking.baseChunker import Document
+from chunking.baseChunker import Document, TextSource, iter_lines
 from chunking.textChunker import RecursiveChunker
 
 
@@ -39,6 +40,11 @@ class MarkdownChunker(BaseChunker):
         )
         self.strip_headers = strip_headers
         self.markdown_chunk_limit = markdown_chunk_limit
+        # 所有标题标记编译为一个正则，按长度降序尝试，标记后须为空格或行尾
+        self._header_names = dict(reversed(self.markdown_headers_to_split_on))
+        self._header_pattern = re.compile(
+            "(" + "|".join(re.escape(sep) for sep, _ in self.markdown_headers_to_split_on) + r")(?= |\Z)"
+        ) if self.markdown_headers_to_split_on else None
         self.recursive_chunker = RecursiveChunker(chunk_size=markdown_chunk_limit)
 
     def aggregate_lines_to_chunks(
@@ -52,30 +58,65 @@ class MarkdownChunker(BaseChunker):
         Returns:
             聚合后的内容块列表
         """
-        aggregated_chunks: List[Dict[str, Union[str, Dict[str, str]]]] = []
+        metadata_cache: Dict[Tuple[Tuple[str, str], ...], Tuple[Tuple[str, str], ...]] = {}
+        lines_with_metadata = (
+            (line["content"], self._intern_metadata(tuple(line["metadata"].items()), metadata_cache))
+            for line in lines
+        )
+        return [
+            {"content": content, "metadata": dict(metadata)}
+            for content, metadata in self._iter_aggregated_chunks(lines_with_metadata)
+        ]
+
+    @staticmethod
+    def _intern_metadata(metadata, metadata_cache: Dict) -> Tuple[Tuple[str, str], ...]:
+        """相同的元数据共享同一个不可变元组，聚合时的比较大多只需比较对象标识"""
+        return metadata_cache.setdefault(metadata, metadata)
+
+    @staticmethod
+    def _same_metadata(metadata, other_metadata) -> bool:
+        """元数据相同的判断与字典比较一致(不考虑键的顺序)，共享的元组只需比较对象标识"""
+        if metadata is other_metadata or metadata == other_metadata:
+            return True
+        return len(metadata) == len(other_metadata) and dict(metadata) == dict(other_metadata)
+
+    def _iter_aggregated_chunks(
+        self, lines: Iterable[Tuple[str, Tuple[Tuple[str, str], ...]]]
+    ) -> Iterator[Tuple[str, Tuple[Tuple[str, str], ...]]]:
+        """aggregate_lines_to_chunks 的生成器版本，只保留正在聚合的一个内容块
 
-        for line in lines:
+        Args:
+            lines: (内容, 元数据元组) 的迭代器
+
+        Returns:
+            聚合后的 (内容, 元数据元组) 迭代器
+        """
+        # 正在聚合的内容块，内容片段在产出时才拼接
+        last_parts: List[str] = []
+        last_metadata = None
+
+        for content, metadata in lines:
             # 如果当前行与上一个块的元数据相同，则合并内容
-            if (
-                aggregated_chunks
-                and aggregated_chunks[-1]["metadata"] == line["metadata"]
-            ):
-                aggregated_chunks[-1]["content"] += "  \n" + line["content"]
+            if last_parts and self._same_metadata(last_metadata, metadata):
+                last_parts.append(content)
             # 处理标题层级变化的情况
             elif (
-                aggregated_chunks
-                and aggregated_chunks[-1]["metadata"] != line["metadata"]
-                and len(aggregated_chunks[-1]["metadata"]) < len(line["metadata"])
-                and aggregated_chunks[-1]["content"].split("\n")[-1][0] == "#"
+                last_parts
                 and not self.strip_headers
+                and len(last_metadata) < len(metadata)
+                and last_parts[-1][last_parts[-1].rfind("\n") + 1:].startswith("#")
             ):
-                aggregated_chunks[-1]["content"] += "  \n" + line["content"]
-                aggregated_chunks[-1]["metadata"] = line["metadata"]
+                last_parts.append(content)
+                last_metadata = metadata
             # 创建新的内容块
             else:
-                aggregated_chunks.append(line)
+                if last_parts:
+                    yield "  \n".join(last_parts), last_metadata
+                last_parts = [content]
+                last_metadata = metadata
 
-        return aggregated_chunks
+        if last_parts:
+            yield "  \n".join(last_parts), last_metadata
     
     def split_text(self, text: str) -> List[Dict[str, Union[str, Dict[str, str]]]]:
         """分割Markdown文本
@@ -86,14 +127,41 @@ class MarkdownChunker(BaseChunker):
         Returns:
             分割后的内容块列表，每个块包含内容和元数据
         """
-        # 按行分割文本
-        lines = text.split("\n")
-        # 存储带元数据的行
-        lines_with_metadata: List[Dict[str, Union[str, Dict[str, str]]]] = []
+        return [
+            {"content": content, "metadata": dict(metadata)}
+            for content, metadata in self._iter_split_lines(iter_lines(text))
+        ]
+
+    def _iter_split_lines(self, lines: Iterable[str]) -> Iterator[Tuple[str, Tuple[Tuple[str, str], ...]]]:
+        """逐行分割Markdown文本并逐个产出内容块，split_text 与 iter_chunks 共用
+
+        Args:
+            lines: Markdown文本的行迭代器(不含换行符)
+
+        Returns:
+            (内容, 元数据元组) 迭代器
+        """
+        lines_with_metadata = self._iter_lines_with_metadata(lines)
+        # 根据设置返回每行内容或聚合后的内容块
+        if not self.return_each_line:
+            return self._iter_aggregated_chunks(lines_with_metadata)
+        else:
+            return lines_with_metadata
+
+    def _iter_lines_with_metadata(self, lines: Iterable[str]) -> Iterator[Tuple[str, Tuple[Tuple[str, str], ...]]]:
+        """逐行解析标题层级，产出 (内容, 元数据元组)
+
+        元数据只在标题行处重新生成，并通过缓存复用相同的元组，普通文本行不做任何复制。
+        """
+        header_pattern = self._header_pattern
+        header_names = self._header_names
+        strip_headers = self.strip_headers
+        metadata_cache: Dict[Tuple[Tuple[str, str], ...], Tuple[Tuple[str, str], ...]] = {}
+
         # 当前正在收集的内容
         current_content: List[str] = []
         # 当前块的元数据
-        current_metadata: Dict[str, str] = {}
+        current_metadata: Tuple[Tuple[str, str], ...] = ()
         # 标题栈，用于维护标题层级
         header_stack: List[Dict[str, Union[int, str]]] = []
         # 初始元数据
@@ -104,9 +172,10 @@ class MarkdownChunker(BaseChunker):
         opening_fence = ""
 
         for line in lines:
-            # 清理行内容
+            # 清理行内容，只有含不可打印字符的行才需要逐字符过滤
             stripped_line = line.strip()
-            stripped_line = "".join(filter(str.isprintable, stripped_line))
+            if not stripped_line.isprintable():
+                stripped_line = "".join(filter(str.isprintable, stripped_line))
             
             # 处理代码块
             if not in_code_block:
@@ -127,77 +196,54 @@ class MarkdownChunker(BaseChunker):
                 continue
 
             # 检查是否是标题行
-            for sep, name in self.markdown_headers_to_split_on:
-                if stripped_line.startswith(sep) and (
-                    len(stripped_line) == len(sep) or stripped_line[len(sep)] == " "
-                ):
-                    if name is not None:
-                        # 计算当前标题层级
-                        current_header_level = sep.count("#")
-                        # 清理比当前层级高的标题
-                        while (
-                            header_stack
-                            and header_stack[-1]["level"] >= current_header_level
-                        ):
-                            popped_header = header_stack.pop()
-                            if popped_header["name"] in initial_metadata:
-                                initial_metadata.pop(popped_header["name"])
-
-                        # 添加新标题到栈中
-                        header = {
-                            "level": current_header_level,
-                            "name": name,
-                            "data": stripped_line[len(sep):].strip(),
-                        }
-                        header_stack.append(header)
-                        initial_metadata[name] = header["data"]
-
-                    # 保存当前收集的内容
-                    if current_content:
-                        lines_with_metadata.append(
-                            {
-                                "content": "\n".join(current_content),
-                                "metadata": current_metadata.copy(),
-                            }
-                        )
-                        current_content.clear()
-
-                    # 如果不移除标题，将标题添加到内容中
-                    if not self.strip_headers:
-                        current_content.append(stripped_line)
-
-                    break
+            header_match = header_pattern.match(stripped_line) if header_pattern is not None else None
+            if header_match is not None:
+                sep = header_match.group(1)
+                name = header_names[sep]
+                if name is not None:
+                    # 计算当前标题层级
+                    current_header_level = sep.count("#")
+                    # 清理比当前层级高的标题
+                    while (
+                        header_stack
+                        and header_stack[-1]["level"] >= current_header_level
+                    ):
+                        popped_header = header_stack.pop()
+                        if popped_header["name"] in initial_metadata:
+                            initial_metadata.pop(popped_header["name"])
+
+                    # 添加新标题到栈中
+                    header = {
+                        "level": current_header_level,
+                        "name": name,
+                        "data": stripped_line[len(sep):].strip(),
+                    }
+                    header_stack.append(header)
+                    initial_metadata[name] = header["data"]
+
+                # 保存当前收集的内容
+                if current_content:
+                    yield "\n".join(current_content), current_metadata
+                    current_content.clear()
+
+                # 如果不移除标题，将标题添加到内容中
+                if not strip_headers:
+                    current_content.append(stripped_line)
+
+                # 只在标题处更新当前元数据
+                current_metadata = self._intern_metadata(tuple(initial_metadata.items()), metadata_cache)
             else:
                 # 处理普通文本行
                 if stripped_line:
                     current_content.append(stripped_line)
                 elif current_content:
                     # 遇到空行时保存当前内容
-                    lines_with_metadata.append(
-                        {
-                            "content": "\n".join(current_content),
-                            "metadata": current_metadata.copy(),
-                        }
-                    )
+                    yield "\n".join(current_content), current_metadata
                     current_content.clear()
 
-            # 更新当前元数据
-            current_metadata = initial_metadata.copy()
-
         # 处理最后的内容块
         if current_content:
-            lines_with_metadata.append(
-                {
-                    "content": "\n".join(current_content),
-                    "metadata": current_metadata,
-                }
-            )
-
-        # 根据设置返回每行内容或聚合后的内容块
-        if not self.return_each_line:
-            return self.aggregate_lines_to_chunks(lines_with_metadata)
-        else:
-            return lines_with_metadata
+            yield "\n".join(current_content), current_metadata
         
     def chunk(self, text: str, title: str = "", **kwargs) -> List[Document]:
         """实现 BaseChunker 的抽象方法，用于将Markdown文本切分成小块。
@@ -210,31 +256,46 @@ class MarkdownChunker(BaseChunker):
         Returns:
             List[Document]: 包含分割后的内容块和元数据的文档对象列表。
         """
-        chunks = self.split_text(text)
-        # 创建文档列表
-        documents = []
-        for chunk in chunks:
+        return list(self._iter_documents(self._iter_split_lines(iter_lines(text)), title, **kwargs))
+
+    def iter_chunks(self, source: TextSource, title: str = "", **kwargs) -> Iterator[Document]:
+        """流式版本的 chunk：逐行读取Markdown文本并逐个产出文档对象，结果与 chunk 完全一致，
+        内存占用只与单个内容块的大小有关。
+        
+        Args:
+            source: Markdown文本、文本片段迭代器或文本文件句柄
+            title (str): 文档标题，默认为空字符串
+            **kwargs: 可选参数，会传给 RecursiveChunker。
+        
+        Returns:
+            Iterator[Document]: 文档对象迭代器。
+        """
+        return self._iter_documents(self._iter_split_lines(iter_lines(source)), title, **kwargs)
+
+    def _iter_documents(
+        self, chunks: Iterable[Tuple[str, Tuple[Tuple[str, str], ...]]], title: str, **kwargs
+    ) -> Iterator[Document]:
+        """将 (内容, 元数据元组) 转换为文档对象，超过长度限制的块使用 RecursiveChunker 进一步切分"""
+        for content, chunk_metadata in chunks:
             # 创建元数据字典，确保 title 在首位
             metadata = {"title": title}
             # 添加其他元数据
-            metadata.update(chunk["metadata"])
+            metadata.update(chunk_metadata)
             
             # 如果内容长度超过限制，使用 RecursiveChunker 进行进一步切分
-            if len(chunk["content"]) > self.markdown_chunk_limit:
+            if len(content) > self.markdown_chunk_limit:
                 recursive_docs = self.recursive_chunker.chunk(
-                    text=chunk["content"],
+                    text=content,
                     title=title,
                     **kwargs
                 )
                 # 为每个递归切分的文档添加原始元数据
                 for doc in recursive_docs:
                     doc.metadata.update(metadata)
-                documents.extend(recursive_docs)
+                yield from recursive_docs
             else:
                 # 创建文档对象
-                doc = Document(chunk=chunk["content"], metadata=metadata)
-                documents.append(doc)
-        return documents
+                yield Document(chunk=content, metadata=metadata)
     
 
 # 示例使用
@@ -1,10 +1,11 @@
 import re
 import sys
+from bisect import bisect_left
 
 sys.path.append(".")
 sys.path.append("..")
 
-from typing import List, Union, Literal, Any
+from typing import List, Union, Literal, Any, Dict, Tuple
 from chunking.baseChunker import BaseChunker
 from chunking.baseChunker import Document
 
@@ -16,6 +17,9 @@ class PunctuationChunker(BaseChunker):
         ):
         super().__init__()
         self.punctuation_set = punctuation_set if punctuation_set else {'.', ',', '!', '?', ';', "。", "，"}
+        # 单次正则扫描即可找出所有标点位置，标点集合只包含单个字符
+        punctuations = "".join(re.escape(p) for p in sorted(self.punctuation_set) if len(p) == 1)
+        self._punctuation_pattern = re.compile(f"[{punctuations}]") if punctuations else None
 
     def chunk(self, text: str, title: str = "", **kwargs) -> List[Document]:
         """
@@ -43,9 +47,11 @@ class PunctuationChunker(BaseChunker):
         chunks = []
         start = 0
         text_length = len(text)
+        # 预先计算所有标点符号的位置(升序)，之后每个窗口只需二分查找
+        punctuation_positions = self._find_punctuation_positions(text)
         while start < text_length:
             # 确定当前块的结束位置，必须在标点符号处
-            end = self._find_next_punctuation(text, start, min_chunk_size, max_chunk_size)
+            end = self._find_next_punctuation(text, start, min_chunk_size, max_chunk_size, punctuation_positions)
             if end == -1:  # 没有找到标点符号
                 end = text_length  # 分到文本末尾
             # 提取当前块
@@ -54,8 +60,8 @@ class PunctuationChunker(BaseChunker):
             # 如果到达文本末尾，退出循环
             if end == text_length:
                 break
-            # 计算下一个块的起始位置，考虑重叠
-            start = end - overlap_chunk_size
+            # 计算下一个块的起始位置，考虑重叠；重叠不小于当前块长度时至少前进一个字符，避免死循环
+            start = max(end - overlap_chunk_size, start + 1)
 
         # 处理最后一个块小于 min_chunk_size 的情况
         if len(chunks) > 1 and len(chunks[-1].chunk) < min_chunk_size:
@@ -66,20 +72,32 @@ class PunctuationChunker(BaseChunker):
             )
         return chunks
     
-    def _find_next_punctuation(self, text: str, start: int, min_chunk_size: int, max_chunk_size: int):
+    def _find_punctuation_positions(self, text: str) -> List[int]:
         """
-        在 [start + min_chunk_size, start + max_chunk_size] 范围内寻找第一个标点符号的位置。
+        返回文本中所有标点符号的位置(升序)。
+        """
+        if self._punctuation_pattern is None:
+            return []
+        return [match.start() for match in self._punctuation_pattern.finditer(text)]
+
+    def _find_next_punctuation(
+        self, 
+        text: str, 
+        start: int, 
+        min_chunk_size: int, 
+        max_chunk_size: int, 
+        punctuation_positions: List[int] = None
+    ):
+        """
+        在 [start + min_chunk_size, start + max_chunk_size] 范围内寻找第一个标点符号的位置，
+        如果在范围内没有标点符号，继续向后找第一个标点符号，即 start + min_chunk_size 之后的第一个标点符号。
         如果没有找到，返回 -1。
         """
-        min_end = start + min_chunk_size
-        max_end = min(start + max_chunk_size, len(text))
-        for i in range(min_end, max_end):
-            if text[i] in self.punctuation_set:
-                return i + 1  # 返回标点符号后的位置
-        # 如果在范围内没有标点符号，继续向后找第一个标点符号
-        for i in range(max_end, len(text)):
-            if text[i] in self.punctuation_set:
-                return i + 1
+        if punctuation_positions is None:
+            punctuation_positions = self._find_punctuation_positions(text)
+        index = bisect_left(punctuation_positions, start + min_chunk_size)
+        if index < len(punctuation_positions):
+            return punctuation_positions[index] + 1  # 返回标点符号后的位置
         return -1  # 没有找到标点符号
     
 
@@ -112,23 +130,72 @@ class RecursiveChunker(BaseChunker):
         self._is_separator_regex = is_separator_regex
         self._length_function = length_function
         self._overlap_chunk_size = overlap_chunk_size
+        # 预编译的分隔符正则，键为转义后(或原始正则)的分隔符
+        self._compiled_patterns: Dict[str, Tuple[re.Pattern, re.Pattern]] = {}
+
+    def _get_patterns(self, separator: str) -> Tuple[re.Pattern, re.Pattern]:
+        """辅助方法：返回分隔符预编译后的(分割用, 带捕获组的分割用)正则。"""
+        patterns = self._compiled_patterns.get(separator)
+        if patterns is None:
+            patterns = (re.compile(separator), re.compile(f"({separator})"))
+            self._compiled_patterns[separator] = patterns
+        return patterns
+
+    def _contains_separator(self, text: str, separator: str) -> bool:
+        """辅助方法：判断文本中是否含有分隔符，普通分隔符直接做子串查找。"""
+        if self._is_separator_regex:
+            return self._get_patterns(separator)[0].search(text) is not None
+        return separator in text
 
     def _split_text_with_regex(self, text: str, separator: str) -> List[str]:
         """辅助方法：使用正则表达式分割文本，并根据 keep_separator 处理分隔符。"""
+        pattern, capture_pattern = self._get_patterns(separator)
         if self._keep_separator == "start":
-            splits = re.split(f"({separator})", text)
-            return [splits[i] + splits[i + 1] if i + 1 < len(splits) else splits[i] for i in range(0, len(splits) - 1, 2)]
+            # 分隔符放在其后片段的开头：[t0, s1 + t1, s2 + t2, ...]
+            splits = capture_pattern.split(text)
+            return splits[:1] + [splits[i] + splits[i + 1] for i in range(1, len(splits) - 1, 2)]
         elif self._keep_separator == "end":
-            splits = re.split(f"({separator})", text)
+            splits = capture_pattern.split(text)
             return [splits[i] + splits[i + 1] if i + 1 < len(splits) else splits[i] for i in range(0, len(splits), 2)]
         elif self._keep_separator:
-            splits = re.split(f"({separator})", text)
+            splits = capture_pattern.split(text)
             return [s + sep for s, sep in zip(splits[::2], splits[1::2] + [""])]
         else:
-            return re.split(separator, text)
+            return pattern.split(text)
 
     def _merge_splits(self, splits: List[str], separator: str) -> List[str]:
-        """辅助方法：合并小的文本块。"""
+        """辅助方法：合并小的文本块。
+        
+        使用 len 作为长度函数时维护当前块的累计长度，每个片段只计算一次长度，
+        片段先收集到列表中、合并完成后再一次性拼接，整体为线性复杂度。
+        """
+        if self._length_function is not len:
+            return self._merge_splits_with_length_function(splits, separator)
+
+        result = []
+        current_parts: List[str] = []
+        current_length = 0
+        separator_length = len(separator)
+        for s in splits:
+            s_length = len(s)
+            # 与 len(current_chunk + separator + s) 等价
+            if current_length + separator_length + s_length < self._chunk_size:
+                if current_length:
+                    current_parts.append(separator)
+                    current_length += separator_length
+                current_parts.append(s)
+                current_length += s_length
+            else:
+                if current_length:
+                    result.append("".join(current_parts))
+                current_parts = [s]
+                current_length = s_length
+        if current_length:
+            result.append("".join(current_parts))
+        return result
+
+    def _merge_splits_with_length_function(self, splits: List[str], separator: str) -> List[str]:
+        """辅助方法：合并小的文本块，自定义长度函数不一定可加，只能对拼接后的文本计算长度。"""
         result = []
         current_chunk = ""
         for s in splits:
@@ -142,18 +209,87 @@ class RecursiveChunker(BaseChunker):
             result.append(current_chunk)
         return result
 
+    def _uses_spans(self) -> bool:
+        """
+        保留分隔符(True 或 "end")时切分出的片段首尾相接、合并时不插入分隔符，
+        合并结果就是原文的一个区间，可以只按偏移量切分与合并，不生成中间子串。
+        正则分隔符在区间内匹配时 ^、$ 等锚点的含义与对子串匹配不同，自定义长度函数
+        不能按偏移量计算长度，这两种情况仍使用子串切分。
+        """
+        return (
+            self._keep_separator in (True, "end")
+            and not self._is_separator_regex
+            and self._length_function is len
+        )
+
+    def _split_spans(self, text: str, start: int, end: int, separators: List[str]) -> List[Tuple[int, int]]:
+        """
+        按偏移量进行的递归切分，与 _split_text 的结果一致，返回各块在 text 中的 (起, 止) 区间。
+        """
+        final_spans = []
+        # 选择合适的 separator
+        separator = separators[-1]
+        new_separators = []
+        for i, _s in enumerate(separators):
+            if _s == "":
+                separator = _s
+                break
+            if text.find(_s, start, end) != -1:
+                separator = _s
+                new_separators = separators[i + 1:]
+                break
+
+        # 每个片段包含其后的分隔符：[上一个分隔符结束, 本分隔符结束)，最后一段到区间末尾
+        pattern = self._get_patterns(re.escape(separator))[0]
+        pieces = []
+        piece_start = start
+        for match in pattern.finditer(text, start, end):
+            pieces.append((piece_start, match.end()))
+            piece_start = match.end()
+        pieces.append((piece_start, end))
+
+        # 合并和递归分割，片段首尾相接，合并后的块即第一个片段起点到最后一个片段终点
+        group_start, group_end = start, start
+        for piece_start, piece_end in pieces:
+            if piece_end - piece_start < self._chunk_size:
+                if group_end - group_start + piece_end - piece_start < self._chunk_size:
+                    if group_end == group_start:
+                        group_start = piece_start
+                    group_end = piece_end
+                else:
+                    if group_end > group_start:
+                        final_spans.append((group_start, group_end))
+                    group_start, group_end = piece_start, piece_end
+            else:
+                if group_end > group_start:
+                    final_spans.append((group_start, group_end))
+                group_start, group_end = piece_end, piece_end
+                if not new_separators:
+                    final_spans.append((piece_start, piece_end))
+                else:
+                    final_spans.extend(self._split_spans(text, piece_start, piece_end, new_separators))
+        if group_end > group_start:
+            final_spans.append((group_start, group_end))
+
+        return final_spans
+
     def _split_text(self, text: str, separators: List[str]) -> List[str]:
         """核心递归切分逻辑。"""
+        if self._uses_spans():
+            return [text[span_start:span_end] for span_start, span_end in self._split_spans(text, 0, len(text), separators)]
+        return self._split_substrings(text, separators)
+
+    def _split_substrings(self, text: str, separators: List[str]) -> List[str]:
+        """按子串进行的递归切分，用于分隔符不保留在片段中、正则分隔符或自定义长度函数的情况。"""
         final_chunks = []
         # 选择合适的 separator
         separator = separators[-1]
         new_separators = []
         for i, _s in enumerate(separators):
-            _separator = _s if self._is_separator_regex else re.escape(_s)
             if _s == "":
                 separator = _s
                 break
-            if re.search(_separator, text):
+            if self._contains_separator(text, _s):
                 separator = _s
                 new_separators = separators[i + 1:]
                 break
@@ -176,7 +312,7 @@ class RecursiveChunker(BaseChunker):
                 if not new_separators:
                     final_chunks.append(s)
                 else:
-                    other_info = self._split_text(s, new_separators)
+                    other_info = self._split_substrings(s, new_separators)
                     final_chunks.extend(other_info)
         if _good_splits:
             merged_text = self._merge_splits(_good_splits, _separator)
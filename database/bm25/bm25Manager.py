@@ -0,0 +1,222 @@
+import os
+import re
+import json
+import math
+import heapq
+import sqlite3
+import threading
+from collections import Counter, OrderedDict
+from typing import Any, Dict, Iterable, List, Optional
+from loguru import logger
+import sys
+
+sys.path.append("../..")
+
+from chunking.baseChunker import Document
+from database.baseManager import BaseManager
+from database.bm25.config import BM25_DB_DIR, BM25_K1, BM25_B, BM25_MANAGER_CACHE_SIZE
+from database.bm25.tokenizer import tokenize
+
+
+COLLECTION_NAME_PATTERN = re.compile(r"^[A-Za-z_][A-Za-z0-9_]{0,254}$")
+
+
+class BM25Manager(BaseManager):
+    """
+    Sparse lexical retrieval with an inverted index stored in one SQLite file per collection
+    (`{db_dir}/{collection_name}.db`), so exact terms such as tickers, figures and code names
+    can be found without an Elasticsearch server.
+
+    Collection names follow the Milvus rules (letters, digits and underscores, not starting
+    with a digit), so a name can never point outside `db_dir`. The index file is created by
+    the first ingest; searching a collection that has never been ingested returns [] without
+    creating it. The connection is opened lazily and reopened after `close`.
+
+    Search results have the same shape as the ones of MilvusEmbeddingManager
+    ({"chunk", "metadata", "score", "id"}), so both can be fused in the pipeline.
+    """
+    def __init__(self, collection_name: str = "text_collection", db_dir: str = BM25_DB_DIR,
+                 k1: float = BM25_K1, b: float = BM25_B):
+        if not isinstance(collection_name, str) or not COLLECTION_NAME_PATTERN.match(collection_name):
+            raise ValueError(f"Invalid collection name: '{collection_name}'. Collection names may only contain "
+                             f"letters, digits and underscores and must not start with a digit")
+        super().__init__(collection_name=collection_name)
+        self.k1 = k1
+        self.b = b
+        self.db_dir = db_dir
+        self.db_path = os.path.join(db_dir, f"{collection_name}.db")
+
+        self._lock = threading.Lock()
+        self._conn: Optional[sqlite3.Connection] = None
+
+    def _connection(self, create: bool) -> Optional[sqlite3.Connection]:
+        """
+        Return the open connection of the index, opening it first if needed. Without `create`,
+        None is returned when the index file does not exist. Must be called with the lock held.
+        """
+        if self._conn is not None:
+            return self._conn
+        if not create and not os.path.exists(self.db_path):
+            return None
+
+        os.makedirs(self.db_dir, exist_ok=True)
+        conn = sqlite3.connect(self.db_path, check_same_thread=False, timeout=30)
+        conn.execute("PRAGMA journal_mode=WAL")
+        conn.execute("PRAGMA synchronous=NORMAL")
+        conn.execute(
+            "CREATE TABLE IF NOT EXISTS docs ("
+            "id INTEGER PRIMARY KEY AUTOINCREMENT, text TEXT NOT NULL, metadata TEXT NOT NULL, length INTEGER NOT NULL)"
+        )
+        conn.execute(
+            "CREATE TABLE IF NOT EXISTS postings ("
+            "term TEXT NOT NULL, doc_id INTEGER NOT NULL, tf INTEGER NOT NULL, PRIMARY KEY (term, doc_id)) WITHOUT ROWID"
+        )
+        conn.commit()
+        self._conn = conn
+        logger.info(f"Opened BM25 index of collection {self.collection_name}: {self.db_path}")
+        return conn
+
+    def ingest(self, texts_with_metadata: Iterable[Document], batch_size_limit: int = 16, **kwargs) -> List[Dict]:
+        """
+        Tokenize and index Document objects. Extra expand field values (kwargs) are not indexed.
+        
+        Args:
+            texts_with_metadata (Iterable[Document]): Document objects to index.
+            batch_size_limit (int): Number of documents written per transaction.
+        
+        Returns:
+            Per-batch results with the inserted ids, like MilvusEmbeddingManager.ingest.
+        """
+        ingest_return_value_set = []
+        batch = []
+        for doc in texts_with_metadata:
+            batch.append(doc)
+            if len(batch) >= batch_size_limit:
+                ingest_return_value_set.append(self._ingest_batch(batch))
+                batch = []
+        if batch:
+            ingest_return_value_set.append(self._ingest_batch(batch))
+        return ingest_return_value_set
+
+    def _ingest_batch(self, texts_with_metadata: List[Document]) -> Dict:
+        ids = []
+        with self._lock:
+            conn = self._connection(create=True)
+            for doc in texts_with_metadata:
+                term_counts = Counter(tokenize(doc.chunk))
+                cursor = conn.execute(
+                    "INSERT INTO docs (text, metadata, length) VALUES (?, ?, ?)",
+                    (doc.chunk, json.dumps(doc.metadata, ensure_ascii=False), sum(term_counts.values()))
+                )
+                doc_id = cursor.lastrowid
+                conn.executemany(
+                    "INSERT INTO postings (term, doc_id, tf) VALUES (?, ?, ?)",
+                    [(term, doc_id, tf) for term, tf in term_counts.items()]
+                )
+                ids.append(doc_id)
+            conn.commit()
+        logger.info(f"Successfully indexed {len(ids)} records into BM25 collection {self.collection_name}")
+        return {"insert_count": len(ids), "ids": ids}
+
+    def search(self, query: str, top_k: int = 3, **kwargs) -> Optional[List[Dict[str, Any]]]:
+        """
+        Return the top-k documents by BM25 score.
+        
+        Args:
+            query (str): The search query text.
+            top_k (int): The number of top results to retrieve.
+            **kwargs: Dense search options (search_params, filter) are not supported and ignored.
+        
+        Returns:
+            A list of dictionaries containing text, metadata, score and id, or None if the search fails.
+        """
+        if not query or not query.strip():
+            logger.error("Query text cannot be empty")
+            return None
+        if kwargs.get("filter"):
+            logger.warning("BM25 search does not support filter expressions, ignoring it")
+
+        query_terms = Counter(tokenize(query))
+        if not query_terms:
+            return []
+
+        try:
+            with self._lock:
+                conn = self._connection(create=False)
+                if conn is None:
+                    # the collection has never been ingested
+                    return []
+                num_docs, total_length = conn.execute("SELECT COUNT(*), COALESCE(SUM(length), 0) FROM docs").fetchone()
+                if num_docs == 0:
+                    return []
+                avg_length = total_length / num_docs
+
+                scores: Dict[int, float] = {}
+                for term, query_tf in query_terms.items():
+                    postings = conn.execute(
+                        "SELECT p.doc_id, p.tf, d.length FROM postings p JOIN docs d ON d.id = p.doc_id WHERE p.term = ?",
+                        (term,)
+                    ).fetchall()
+                    if not postings:
+                        continue
+                    idf = math.log(1 + (num_docs - len(postings) + 0.5) / (len(postings) + 0.5))
+                    for doc_id, tf, length in postings:
+                        norm = tf + self.k1 * (1 - self.b + self.b * length / avg_length)
+                        scores[doc_id] = scores.get(doc_id, 0.0) + query_tf * idf * tf * (self.k1 + 1) / norm
+
+                top_docs = heapq.nlargest(top_k, scores.items(), key=lambda item: item[1])
+                rows = {}
+                if top_docs:
+                    placeholders = ",".join("?" * len(top_docs))
+                    rows = {
+                        row[0]: row for row in conn.execute(
+                            f"SELECT id, text, metadata FROM docs WHERE id IN ({placeholders})",
+                            [doc_id for doc_id, _ in top_docs]
+                        )
+                    }
+            return [
+                {
+                    "chunk": rows[doc_id][1],
+                    "metadata": json.loads(rows[doc_id][2]),
+                    "score": score,
+                    "id": doc_id
+                }
+                for doc_id, score in top_docs
+            ]
+        except Exception as e:
+            logger.error(f"Error occurred during the BM25 search process: {str(e)}")
+            return None
+
+    def count(self) -> int:
+        with self._lock:
+            conn = self._connection(create=False)
+            return conn.execute("SELECT COUNT(*) FROM docs").fetchone()[0] if conn is not None else 0
+
+    def close(self):
+        with self._lock:
+            if self._conn is not None:
+                self._conn.close()
+                self._conn = None
+
+
+_bm25_managers: "OrderedDict[str, BM25Manager]" = OrderedDict()
+_bm25_managers_lock = threading.Lock()
+
+
+def get_bm25_manager(collection_name: str) -> BM25Manager:
+    """
+    Return the process-wide BM25 manager of a collection. At most BM25_MANAGER_CACHE_SIZE
+    managers are kept, the least recently used one is closed beyond that; a caller still
+    holding it just reopens the index on its next call.
+    """
+    with _bm25_managers_lock:
+        manager = _bm25_managers.get(collection_name)
+        if manager is not None:
+            _bm25_managers.move_to_end(collection_name)
+            return manager
+        manager = BM25Manager(collection_name=collection_name)
+        _bm25_managers[collection_name] = manager
+        while len(_bm25_managers) > BM25_MANAGER_CACHE_SIZE:
+            _, evicted = _bm25_managers.popitem(last=False)
+            evicted.close()
+        return manager
@@ -0,0 +1,13 @@
+"""
+配置文件
+"""
+from pathlib import Path
+
+# 获取当前工作目录
+CURRENT_DIR = Path(__file__).parent
+
+# BM25倒排索引配置，每个collection一个SQLite文件
+BM25_DB_DIR = f"{CURRENT_DIR}/bm25_db"
+BM25_K1 = 1.5    # 词频饱和参数
+BM25_B = 0.75    # 文档长度归一化参数
+BM25_MANAGER_CACHE_SIZE = 32  # 进程内最多缓存的 BM25Manager 数量，超出后按LRU关闭
@@ -0,0 +1,33 @@
+"""
+@File   : tokenizer.py
+@Desc   : BM25使用的中英文混合分词：连续的汉字切成二元组，字母数字按词切分并保留小数点、连字符等内部符号
+"""
+import re
+import unicodedata
+from typing import List
+
+# a run of CJK characters, or a latin/digit word that may contain inner . - _ (e.g. 2.5, 600519.sh, gpt-4)
+_TOKEN_PATTERN = re.compile(r"[\u3400-\u4dbf\u4e00-\u9fff\uf900-\ufaff]+|[a-z0-9]+(?:[._\-][a-z0-9]+)*")
+_PART_SEPARATOR = re.compile(r"[._\-]")
+
+
+def tokenize(text: str) -> List[str]:
+    """
+    Split text into index terms. Chinese has no word boundaries, so CJK runs are split into
+    overlapping character bigrams (a single character stays a unigram), which matches any
+    substring of two or more characters without a dictionary.
+    """
+    tokens = []
+    for match in _TOKEN_PATTERN.finditer(unicodedata.normalize("NFKC", text).lower()):
+        token = match.group()
+        if token[0].isascii():
+            tokens.append(token)
+            # compound words (600519.sh, gpt-4) are also indexed by their parts
+            parts = _PART_SEPARATOR.split(token)
+            if len(parts) > 1:
+                tokens.extend(parts)
+        elif len(token) == 1:
+            tokens.append(token)
+        else:
+            tokens.extend(token[i:i + 2] for i in range(len(token) - 1))
+    return tokens
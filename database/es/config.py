@@ -1,4 +1,10 @@
 """
 配置文件
 """
-VECTOR_DIM = 1024
\ No newline at end of file
+VECTOR_DIM = 1024
+
+# Elasticsearch 连接与检索配置
+ES_HOST = "http://localhost:9200"
+ES_BULK_CHUNK_SIZE = 500           # streaming_bulk 每个请求包含的文档数
+KNN_NUM_CANDIDATES_FACTOR = 10     # knn 每个分片的候选数 = top_k * 该系数
+KNN_MAX_NUM_CANDIDATES = 10000     # Elasticsearch 允许的 num_candidates 上限
@@ -1,29 +1,44 @@
-import numpy as np
-from tqdm import tqdm
+import threading
 from loguru import logger
-from typing import List, Optional
+from typing import Any, Dict, Iterable, Iterator, List, Optional, Tuple
 from elasticsearch import Elasticsearch
-from elasticsearch.helpers import bulk
+from elasticsearch.helpers import streaming_bulk
 
+from chunking.baseChunker import Document
 from database.baseManager import BaseManager
-from database.es.config import VECTOR_DIM
+from database.es.config import (
+    VECTOR_DIM,
+    ES_HOST,
+    ES_BULK_CHUNK_SIZE,
+    KNN_NUM_CANDIDATES_FACTOR,
+    KNN_MAX_NUM_CANDIDATES
+)
+from utils.embedding_api import EMBEDDING_API_MAP
 
 
 class ESManager(BaseManager):
     """
     Elasticsearch 嵌入管理器，继承自 BaseManager。
     管理 Elasticsearch 数据库中的嵌入向量，包括 ingest 和 search 功能。
+    文档通过 streaming_bulk 流式写入，检索使用 dense_vector 字段上的原生近似 knn 搜索。
     """
     def __init__(
             self, 
             collection_name="text_collection", 
-            es_host="http://localhost:9200"
+            embedding_api="openai_embedding_api",
+            es_host=ES_HOST,
+            client: Optional[Elasticsearch] = None
         ):
         super().__init__(collection_name=collection_name)
 
+        if embedding_api not in EMBEDDING_API_MAP:
+            raise ValueError(f"Unsupported embedding API: {embedding_api}")
+        self.embedding_api = embedding_api
+        self.embedding = EMBEDDING_API_MAP[embedding_api]
+
         try:
-            # 初始化 Elasticsearch 客户端
-            self.client = Elasticsearch([es_host])
+            # 初始化 Elasticsearch 客户端，可复用外部传入的客户端
+            self.client = client if client is not None else Elasticsearch(es_host)
 
             # 确保索引存在，不存在则创建
             if not self.client.indices.exists(index=self.collection_name):
@@ -41,88 +56,140 @@ class ESManager(BaseManager):
             index_name (str): 索引名称。
         """
         try:
-            # 定义索引映射
-            mapping = {
-                "mappings": {
-                    "properties": {
-                        "vector": {
-                            "type": "dense_vector",
-                            "dims": VECTOR_DIM,
-                            "index": True,
-                            "similarity": "cosine"  # 使用余弦相似度
-                        },
-                        "text": {
-                            "type": "text"
-                        }
+            # 定义索引映射，metadata 只存储不建索引，避免字段映射膨胀
+            mappings = {
+                "properties": {
+                    "vector": {
+                        "type": "dense_vector",
+                        "dims": VECTOR_DIM,
+                        "index": True,
+                        "similarity": "cosine"  # 使用余弦相似度
+                    },
+                    "text": {
+                        "type": "text"
+                    },
+                    "metadata": {
+                        "type": "object",
+                        "enabled": False
                     }
                 }
             }
-            self.client.indices.create(index=index_name, body=mapping)
+            self.client.indices.create(index=index_name, mappings=mappings)
             logger.info(f"成功为索引 {index_name} 创建映射")
         except Exception as e:
             logger.error(f"创建索引时发生错误: {str(e)}")
             raise
 
-    def ingest(self, texts: List[str], batch_size_limit: int=16):
+    def ingest(self, texts_with_metadata: Iterable[Document], batch_size_limit: int = 16, **kwargs) -> List[Dict]:
         """
-        处理并存储批量文本到 Elasticsearch。
-        如果超过批量大小限制，则分批处理。
+        处理并存储批量 Document 到 Elasticsearch。
+        每 batch_size_limit 个文档请求一次嵌入，嵌入好的文档经 streaming_bulk 流式写入，
+        不会把全部文档和向量同时保存在内存中；嵌入失败的批次被跳过，计入 failed_count。
         
         参数:
-            texts (list): 要处理和存储的文本块列表。
+            texts_with_metadata (Iterable[Document]): 要处理和存储的 Document 对象。
+            batch_size_limit (int): 每次嵌入请求的文档数。
+            **kwargs: 扩展字段的值，写入每个文档。
+        
+        返回:
+            [{"insert_count", "ids", "failed_count"}]，failed_count 包括写入失败和所在批次嵌入失败的文档数
         """
-        if len(texts) > batch_size_limit:
-            # 分批处理
-            for i in range(0, len(texts), batch_size_limit):
-                batch = texts[i:i + batch_size_limit]
-                self._ingest_batch(batch)
-        else:
-            self._ingest_batch(texts)
-
-    def _ingest_batch(self, texts: List[str]):
+        ingest_return, _ = self.ingest_with_stats(texts_with_metadata, batch_size_limit, **kwargs)
+        return ingest_return
+
+    def ingest_with_stats(self, texts_with_metadata: Iterable[Document], batch_size_limit: int = 16, **kwargs) -> Tuple[List[Dict], Dict]:
         """
-        辅助方法，处理并存储单个批次的文本。
-        生成嵌入向量并插入到 Elasticsearch。
-        
-        参数:
-            texts (list): 文本批次。
+        与 ingest 相同，另外返回统计信息：
+        {"batches", "records": 成功写入的文档数, "failed_batches": [{"batch_index", "size", "error"}]}，
+        failed_batches 与 MilvusEmbeddingManager.ingest_with_stats 的格式一致。
         """
-        try:
-            # 生成嵌入向量
-            embeddings = self.embedding(texts=texts)
-            
-            # 批量构造数据
-            actions = []
-            for text, vector in tqdm(zip(texts, embeddings), total=len(texts)):
-                actions.append({
+        ids = []
+        failed_count = 0
+        stats = {"batches": 0, "records": 0, "failed_batches": []}
+        for ok, item in streaming_bulk(
+            self.client,
+            self._iter_actions(texts_with_metadata, batch_size_limit, kwargs, stats),
+            chunk_size=ES_BULK_CHUNK_SIZE,
+            raise_on_error=False
+        ):
+            result = next(iter(item.values()))
+            if ok:
+                ids.append(result.get("_id"))
+            else:
+                failed_count += 1
+                logger.error(f"写入文档失败: {result.get('error')}")
+
+        # 刷新索引，使写入的文档立即可被检索
+        self.client.indices.refresh(index=self.collection_name)
+        failed_count += sum(batch["size"] for batch in stats["failed_batches"])
+        stats["records"] = len(ids)
+        logger.info(f"成功插入 {len(ids)} 条数据到索引 {self.collection_name}，失败 {failed_count} 条")
+        return [{"insert_count": len(ids), "ids": ids, "failed_count": failed_count}], stats
+
+    def _iter_batches(self, texts_with_metadata: Iterable[Document], batch_size_limit: int) -> Iterator[List[Document]]:
+        batch = []
+        for doc in texts_with_metadata:
+            batch.append(doc)
+            if len(batch) >= batch_size_limit:
+                yield batch
+                batch = []
+        if batch:
+            yield batch
+
+    def _iter_actions(self, texts_with_metadata: Iterable[Document], batch_size_limit: int, fields: Dict, stats: Dict) -> Iterator[Dict]:
+        """
+        辅助方法，逐批生成嵌入向量并产出 bulk 写入动作，嵌入失败的批次记录到 stats["failed_batches"]。
+        """
+        for batch_index, batch in enumerate(self._iter_batches(texts_with_metadata, batch_size_limit)):
+            stats["batches"] += 1
+            error = "embedding API returned no vectors or a wrong number of vectors"
+            try:
+                embeddings = self.embedding([doc.chunk for doc in batch])
+            except Exception as e:
+                logger.error(f"生成嵌入向量时发生错误: {str(e)}")
+                embeddings, error = None, str(e)
+            if not embeddings or len(embeddings) != len(batch):
+                logger.error(f"跳过嵌入失败的批次 {batch_index}，共 {len(batch)} 条数据")
+                stats["failed_batches"].append({"batch_index": batch_index, "size": len(batch), "error": error})
+                continue
+            for doc, vector in zip(batch, embeddings):
+                yield {
                     "_op_type": "index",
                     "_index": self.collection_name,
                     "_source": {
                         "vector": vector,
-                        "text": text
+                        "text": doc.chunk,
+                        "metadata": doc.metadata,
+                        **fields
                     }
-                })
-            
-            # 批量插入数据
-            bulk(self.client, actions)
-            logger.info(f"成功插入 {len(texts)} 条数据到索引 {self.collection_name}")
-        except Exception as e:
-            logger.error(f"插入过程发生错误: {str(e)}")
+                }
 
-    def search(self, query: str, top_k: int = 3) -> Optional[List[str]]:
+    def search(
+            self, 
+            query: str, 
+            top_k: int = 3, 
+            search_params: Optional[Dict[str, Any]] = None, 
+            filter: Optional[Dict[str, Any]] = None,
+            **kwargs
+        ) -> Optional[List[Dict[str, Any]]]:
         """
-        执行 top-k 相似性搜索。
-        返回索引中与查询最相似的 top-k 文本。
+        执行 top-k 近似最近邻搜索(knn)。
+        返回索引中与查询最相似的 top-k 文档。
         
         参数:
             query (str): 查询文本。
+            top_k (int): 检索结果数量。
+            search_params (Dict): knn 参数，如 {"num_candidates": 200}，默认 top_k * KNN_NUM_CANDIDATES_FACTOR。
+            filter (Dict): Elasticsearch 查询 DSL 形式的过滤条件，在 knn 搜索过程中生效。
         
         返回:
-            top-k 相似文本列表，如果搜索失败则返回 None。
+            包含 chunk、metadata、score、id 的字典列表，如果搜索失败则返回 None。
         """
         if not query or not query.strip():
             logger.error("查询文本不能为空")
             return None
+        if filter is not None and not isinstance(filter, dict):
+            raise ValueError("Elasticsearch filter must be a query DSL dict, e.g. {\"term\": {\"source\": \"report\"}}")
             
         try:
             # 为查询生成嵌入向量
@@ -131,30 +198,51 @@ class ESManager(BaseManager):
                 logger.error("生成查询嵌入向量失败")
                 return None
 
-            # 构造搜索请求
-            search_query = {
-                "size": top_k,
-                "query": {
-                    "script_score": {
-                        "query": {"match_all": {}},
-                        "script": {
-                            "source": "cosineSimilarity(params.query_vector, 'vector') + 1.0",  # 余弦相似度
-                            "params": {
-                                "query_vector": query_embedding[0]
-                            }
-                        }
-                    }
-                },
-                "_source": ["text"]  # 返回文本字段
+            # 构造 knn 搜索请求
+            knn = {
+                "field": "vector",
+                "query_vector": query_embedding[0],
+                "k": top_k,
+                "num_candidates": min(max(top_k * KNN_NUM_CANDIDATES_FACTOR, top_k), KNN_MAX_NUM_CANDIDATES)
             }
+            if search_params:
+                knn.update(search_params)
+            if filter:
+                knn["filter"] = filter
 
             # 执行搜索
-            response = self.client.search(index=self.collection_name, body=search_query)
+            response = self.client.search(
+                index=self.collection_name,
+                knn=knn,
+                size=top_k,
+                source=["text", "metadata"]
+            )
 
-            # 提取并返回文本
             hits = response.get("hits", {}).get("hits", [])
-            return [hit["_source"]["text"] for hit in hits]
+            return [
+                {
+                    "chunk": hit["_source"]["text"],
+                    "metadata": hit["_source"].get("metadata", {}),
+                    "score": hit["_score"],
+                    "id": hit["_id"]
+                }
+                for hit in hits
+            ]
             
         except Exception as e:
             logger.error(f"搜索过程发生错误: {str(e)}")
             return None
+
+
+_es_managers: Dict[Tuple[str, str], ESManager] = {}
+_es_managers_lock = threading.Lock()
+
+
+def get_es_manager(collection_name: str, embedding_api: str = "openai_embedding_api") -> ESManager:
+    """Return the process-wide ES manager of a collection, creating the index on first use."""
+    key = (collection_name, embedding_api)
+    if key not in _es_managers:
+        with _es_managers_lock:
+            if key not in _es_managers:
+                _es_managers[key] = ESManager(collection_name=collection_name, embedding_api=embedding_api)
+    return _es_managers[key]
@@ -22,8 +22,55 @@ EMBEDDING_API_URL = "http://10.100.167.66:13456/bge_m3_embedding"
 REQUEST_TIMEOUT = 300
 MAX_RETRIES = 1
 
+# 嵌入向量持久化缓存配置
+EMBEDDING_CACHE_ENABLED = True
+EMBEDDING_CACHE_PATH = f"{CURRENT_DIR}/milvus_db/embedding_cache.db"
+EMBEDDING_CACHE_MAX_BYTES = 2 * 1024 ** 3  # 2GB
+
+# 热点查询的内存缓存配置(查询向量与检索结果)，collection写入或重建索引后其检索结果自动失效
+SEARCH_CACHE_ENABLED = True
+QUERY_EMBEDDING_CACHE_SIZE = 4096   # 缓存的查询向量条数
+QUERY_EMBEDDING_CACHE_TTL = 3600    # 查询向量缓存过期时间（秒）
+SEARCH_RESULT_CACHE_SIZE = 1024     # 缓存的检索结果条数
+SEARCH_RESULT_CACHE_TTL = 300       # 检索结果缓存过期时间（秒）
+
 # 批处理配置
 DEFAULT_BATCH_SIZE = 32
+EMBEDDING_CONCURRENCY = 4       # ingest时并发的嵌入请求数
+INGEST_MAX_PENDING_BATCHES = 8  # 已提交但尚未插入的批次上限（背压）
 
 # 向量维度配置
-VECTOR_DIM = 1024 
\ No newline at end of file
+VECTOR_DIM = 1024 
+
+# 管理器连接池配置
+MANAGER_POOL_MAX_SIZE = 32              # 最多缓存的 MilvusEmbeddingManager 数量
+MANAGER_POOL_IDLE_TIMEOUT = 600         # 空闲超时时间（秒），超时后的管理器会被回收
+MANAGER_POOL_HEALTH_CHECK_INTERVAL = 60 # 距上次使用超过该时间（秒）后，复用前先做健康检查
+
+# 向量索引配置
+VECTOR_INDEX_NAME = "vector_index"
+VECTOR_METRIC_TYPE = "IP"
+DEFAULT_INDEX_TYPE = "FLAT"
+# 各索引类型默认的构建参数(build_params)与查询参数(search_params)
+INDEX_TYPE_DEFAULTS = {
+    "FLAT": {
+        "build_params": {},
+        "search_params": {}
+    },
+    "HNSW": {
+        "build_params": {"M": 16, "efConstruction": 200},
+        "search_params": {"ef": 64}
+    },
+    "IVF_FLAT": {
+        "build_params": {"nlist": 1024},
+        "search_params": {"nprobe": 16}
+    },
+    "IVF_PQ": {
+        "build_params": {"nlist": 1024, "m": 16, "nbits": 8},
+        "search_params": {"nprobe": 16}
+    },
+    "DISKANN": {
+        "build_params": {},
+        "search_params": {"search_list": 100}
+    }
+}
@@ -0,0 +1,322 @@
+import time
+import threading
+from collections import OrderedDict
+from contextlib import contextmanager
+from loguru import logger
+from typing import Dict, Any, Iterator, Optional, Tuple
+from pymilvus import MilvusClient
+import sys
+
+sys.path.append("../..")
+
+from database.milvus.config import (
+    MILVUS_URI,
+    LOCAL_MILVUS_LITE_DB_PATH,
+    MANAGER_POOL_MAX_SIZE,
+    MANAGER_POOL_IDLE_TIMEOUT,
+    MANAGER_POOL_HEALTH_CHECK_INTERVAL
+)
+from database.milvus.milvusManager import MilvusEmbeddingManager
+
+
+class _ClientEntry:
+    def __init__(self, client: MilvusClient, client_key: Tuple):
+        self.client = client
+        self.client_key = client_key
+        # pooled managers built on this client and managers currently leased to callers
+        self.managers = 0
+        self.leases = 0
+        self.closed = False
+
+
+class _PoolEntry:
+    def __init__(self, manager: MilvusEmbeddingManager, client_entry: _ClientEntry):
+        self.manager = manager
+        self.client_entry = client_entry
+        self.last_used = time.monotonic()
+
+
+class MilvusManagerPool:
+    """
+    Process-wide, thread-safe pool of MilvusEmbeddingManager instances.
+
+    Managers are keyed by (collection_name, embedding_api, use_milvus_lite, db_path), so the
+    ingest and search paths of one collection share a manager, and managers share one
+    MilvusClient per connection target,
+    so repeated requests skip client creation, `has_collection` and `load_collection`. Entries
+    are evicted in LRU order once `max_size` is reached, dropped after `idle_timeout` seconds
+    without use, and health-checked before reuse when they have been idle for
+    `health_check_interval` seconds.
+
+    Managers are handed out as leases: every `get_manager` must be paired with `release`
+    (or use `lease`). A client is only closed once no pooled manager uses it and no leased
+    manager is still running on it, so eviction never closes a client under a request.
+    Clients and managers are built outside the pool lock, a miss only blocks callers of
+    the same key.
+    """
+    def __init__(
+        self,
+        max_size: int = MANAGER_POOL_MAX_SIZE,
+        idle_timeout: float = MANAGER_POOL_IDLE_TIMEOUT,
+        health_check_interval: float = MANAGER_POOL_HEALTH_CHECK_INTERVAL,
+        build_lock_stripes: int = 16
+    ):
+        self.max_size = max_size
+        self.idle_timeout = idle_timeout
+        self.health_check_interval = health_check_interval
+
+        self._lock = threading.RLock()
+        self._managers: "OrderedDict[Tuple, _PoolEntry]" = OrderedDict()
+        self._clients: Dict[Tuple, _ClientEntry] = {}
+        # id(manager) -> [client entry, lease count]
+        self._leases: Dict[int, list] = {}
+        # striped locks that serialize the construction of one key without a global lock
+        self._manager_build_locks = [threading.Lock() for _ in range(build_lock_stripes)]
+        self._client_build_locks = [threading.Lock() for _ in range(build_lock_stripes)]
+
+        self.hits = 0
+        self.misses = 0
+        self.evictions = 0
+        self.health_check_failures = 0
+
+    @staticmethod
+    def _client_key(use_milvus_lite: bool, db_path: str) -> Tuple:
+        return ("lite", db_path) if use_milvus_lite else ("remote", MILVUS_URI)
+
+    def _stripe(self, locks: list, key: Tuple) -> threading.Lock:
+        return locks[hash(key) % len(locks)]
+
+    @staticmethod
+    def _open_client(client_key: Tuple) -> MilvusClient:
+        if client_key[0] == "lite":
+            client = MilvusClient(uri=client_key[1])
+            logger.info(f"Manager pool opened Milvus Lite client: {client_key[1]}")
+        else:
+            client = MilvusClient(uri=client_key[1], token="root:Milvus")
+            logger.info(f"Manager pool opened remote Milvus client: {client_key[1]}")
+        return client
+
+    def _maybe_close_client(self, client_entry: _ClientEntry):
+        """Close a client once nothing uses it any more. Must be called with the lock held."""
+        if client_entry.managers > 0 or client_entry.leases > 0 or client_entry.closed:
+            return
+        client_entry.closed = True
+        if self._clients.get(client_entry.client_key) is client_entry:
+            del self._clients[client_entry.client_key]
+        try:
+            client_entry.client.close()
+        except Exception as e:
+            logger.warning(f"Failed to close Milvus client {client_entry.client_key}: {str(e)}")
+
+    def _retire_client(self, client_entry: _ClientEntry):
+        """Stop handing out a client; it is closed when its last lease is released."""
+        if self._clients.get(client_entry.client_key) is client_entry:
+            del self._clients[client_entry.client_key]
+        for key in [k for k, e in self._managers.items() if e.client_entry is client_entry]:
+            self._drop(key)
+
+    def _drop(self, key: Tuple):
+        entry = self._managers.pop(key, None)
+        if entry is not None:
+            entry.client_entry.managers -= 1
+            self._maybe_close_client(entry.client_entry)
+
+    def _evict_idle(self, now: float):
+        idle_keys = [
+            key for key, entry in self._managers.items()
+            if now - entry.last_used > self.idle_timeout
+        ]
+        for key in idle_keys:
+            logger.info(f"Manager pool evicting idle manager: {key}")
+            self._drop(key)
+            self.evictions += 1
+
+    def _add_lease(self, manager: MilvusEmbeddingManager, client_entry: _ClientEntry):
+        lease = self._leases.setdefault(id(manager), [client_entry, 0])
+        lease[1] += 1
+        client_entry.leases += 1
+
+    def _checkout(self, key: Tuple) -> Tuple[Optional[_PoolEntry], bool]:
+        """
+        Lease the pooled manager of `key` if there is one. The second value tells whether it
+        has been idle long enough to need a health check before use.
+        """
+        with self._lock:
+            now = time.monotonic()
+            self._evict_idle(now)
+            entry = self._managers.get(key)
+            if entry is None:
+                return None, False
+            needs_check = now - entry.last_used > self.health_check_interval
+            entry.last_used = now
+            self._managers.move_to_end(key)
+            self._add_lease(entry.manager, entry.client_entry)
+            return entry, needs_check
+
+    def _acquire_client(self, client_key: Tuple) -> _ClientEntry:
+        """Return the shared client of `client_key` with one lease taken, opening it if needed."""
+        with self._lock:
+            client_entry = self._clients.get(client_key)
+            if client_entry is not None:
+                client_entry.leases += 1
+                return client_entry
+
+        with self._stripe(self._client_build_locks, client_key):
+            with self._lock:
+                client_entry = self._clients.get(client_key)
+                if client_entry is not None:
+                    client_entry.leases += 1
+                    return client_entry
+            client_entry = _ClientEntry(self._open_client(client_key), client_key)
+            with self._lock:
+                client_entry.leases = 1
+                self._clients[client_key] = client_entry
+            return client_entry
+
+    def get_manager(
+        self,
+        collection_name: str,
+        embedding_api: str = "openai_embedding_api",
+        use_milvus_lite: bool = True,
+        db_path: str = LOCAL_MILVUS_LITE_DB_PATH,
+        **manager_kwargs
+    ) -> MilvusEmbeddingManager:
+        """
+        Lease a pooled manager for the given key, creating it on a miss. The caller must hand
+        it back with `release` once the request is done.
+
+        Args:
+            collection_name (str): The name of the collection.
+            embedding_api (str): The embedding API used by the manager.
+            use_milvus_lite (bool): Whether to connect to the local Milvus Lite database.
+            db_path (str): Milvus Lite database file path.
+            **manager_kwargs: Extra MilvusEmbeddingManager arguments (e.g. expand_fields,
+                index_type, index_params), applied when the manager has to be created. Like
+                MilvusEmbeddingManager itself, an existing collection keeps the schema and
+                index it was created with.
+
+        Returns:
+            MilvusEmbeddingManager: A ready-to-use manager.
+        """
+        key = (collection_name, embedding_api, use_milvus_lite, db_path)
+        entry, needs_check = self._checkout(key)
+        if entry is not None and needs_check and not entry.manager.health_check():
+            logger.warning(f"Manager pool health check failed, rebuilding manager: {key}")
+            with self._lock:
+                self.health_check_failures += 1
+                # the shared client may be broken, rebuild every manager that uses it
+                self._retire_client(entry.client_entry)
+            self.release(entry.manager)
+            entry = None
+        if entry is not None:
+            with self._lock:
+                self.hits += 1
+            return entry.manager
+
+        with self._stripe(self._manager_build_locks, key):
+            # another caller may have built the manager while we waited
+            entry, _ = self._checkout(key)
+            if entry is not None:
+                with self._lock:
+                    self.hits += 1
+                return entry.manager
+
+            client_key = self._client_key(use_milvus_lite, db_path)
+            client_entry = self._acquire_client(client_key)
+            try:
+                manager = MilvusEmbeddingManager(
+                    collection_name=collection_name,
+                    embedding_api=embedding_api,
+                    use_milvus_lite=use_milvus_lite,
+                    db_path=db_path,
+                    client=client_entry.client,
+                    **manager_kwargs
+                )
+            except Exception:
+                with self._lock:
+                    client_entry.leases -= 1
+                    self._maybe_close_client(client_entry)
+                raise
+
+            with self._lock:
+                self.misses += 1
+                # the client lease taken above becomes the lease of the new manager
+                self._leases[id(manager)] = [client_entry, 1]
+                client_entry.managers += 1
+                self._managers[key] = _PoolEntry(manager, client_entry)
+                while len(self._managers) > self.max_size:
+                    lru_key = next(iter(self._managers))
+                    logger.info(f"Manager pool evicting least recently used manager: {lru_key}")
+                    self._drop(lru_key)
+                    self.evictions += 1
+            return manager
+
+    def release(self, manager: MilvusEmbeddingManager):
+        """Hand back a manager leased with `get_manager`."""
+        with self._lock:
+            lease = self._leases.get(id(manager))
+            if lease is None:
+                logger.warning(f"Manager pool release of a manager that is not leased: {manager.collection_name}")
+                return
+            client_entry = lease[0]
+            lease[1] -= 1
+            if lease[1] <= 0:
+                del self._leases[id(manager)]
+            client_entry.leases -= 1
+            self._maybe_close_client(client_entry)
+
+    @contextmanager
+    def lease(self, collection_name: str, **kwargs) -> Iterator[MilvusEmbeddingManager]:
+        """Context manager around `get_manager` / `release`."""
+        manager = self.get_manager(collection_name, **kwargs)
+        try:
+            yield manager
+        finally:
+            self.release(manager)
+
+    def invalidate(self, collection_name: str):
+        """
+        Drop every pooled manager of a collection, e.g. after the collection has been changed
+        outside of the pool.
+        """
+        with self._lock:
+            for key in [k for k in self._managers if k[0] == collection_name]:
+                self._drop(key)
+
+    def clear(self):
+        """Drop all pooled managers; their clients are closed once the running requests end."""
+        with self._lock:
+            for key in list(self._managers):
+                self._drop(key)
+
+    def stats(self) -> Dict[str, Any]:
+        """
+        Return pool counters used to confirm manager reuse.
+        """
+        with self._lock:
+            total = self.hits + self.misses
+            return {
+                "size": len(self._managers),
+                "max_size": self.max_size,
+                "clients": len(self._clients),
+                "leased": sum(lease[1] for lease in self._leases.values()),
+                "hits": self.hits,
+                "misses": self.misses,
+                "hit_ratio": self.hits / total if total else 0.0,
+                "evictions": self.evictions,
+                "health_check_failures": self.health_check_failures
+            }
+
+
+_default_pool: Optional[MilvusManagerPool] = None
+_default_pool_lock = threading.Lock()
+
+
+def get_manager_pool() -> MilvusManagerPool:
+    """Return the process-wide manager pool, creating it on first use."""
+    global _default_pool
+    if _default_pool is None:
+        with _default_pool_lock:
+            if _default_pool is None:
+                _default_pool = MilvusManagerPool()
+    return _default_pool
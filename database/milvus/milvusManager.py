@@ -1,13 +1,29 @@
+import time
+import asyncio
+from collections import deque
+from itertools import islice
+from concurrent.futures import ThreadPoolExecutor
 from tqdm import tqdm
 from loguru import logger
-from typing import List, Optional, Dict, Any
+from typing import List, Optional, Dict, Any, Iterable, Tuple
 from pymilvus import MilvusClient, DataType, CollectionSchema, FieldSchema
 import sys
 
 sys.path.append("../..")
 
-from database.milvus.config import VECTOR_DIM, MILVUS_URI, LOCAL_MILVUS_LITE_DB_PATH
-from utils.embedding_api import bge_m3_embedding_api, openai_embedding_api, milvus_model_embedding
+from database.milvus.config import (
+    VECTOR_DIM, 
+    MILVUS_URI, 
+    LOCAL_MILVUS_LITE_DB_PATH,
+    VECTOR_INDEX_NAME,
+    VECTOR_METRIC_TYPE,
+    DEFAULT_INDEX_TYPE,
+    INDEX_TYPE_DEFAULTS,
+    EMBEDDING_CONCURRENCY,
+    INGEST_MAX_PENDING_BATCHES
+)
+from utils.embedding_api import EMBEDDING_API_MAP, ASYNC_EMBEDDING_API_MAP
+from database.milvus.searchCache import get_search_cache
 from database.baseManager import BaseManager
 from chunking.baseChunker import Document
 
@@ -34,21 +50,28 @@ class MilvusEmbeddingManager(BaseManager):
         embedding_api="openai_embedding_api", 
         expand_fields=None, 
         use_milvus_lite=True, 
-        db_path=LOCAL_MILVUS_LITE_DB_PATH
+        db_path=LOCAL_MILVUS_LITE_DB_PATH,
+        client=None,
+        index_type=DEFAULT_INDEX_TYPE,
+        index_params=None,
+        search_params=None
     ):
         super().__init__(collection_name=collection_name)
-        if embedding_api == "bge_m3_embedding_api":
-            self.embedding = bge_m3_embedding_api
-        elif embedding_api == "openai_embedding_api":
-            self.embedding = openai_embedding_api
-        elif embedding_api == "milvus_model_embedding":
-            self.embedding = milvus_model_embedding
-        else:
+        self.embedding_api = embedding_api
+        self.use_milvus_lite = use_milvus_lite
+        # identifies the collection across managers for search cache invalidation
+        self.collection_key = ("lite", db_path, collection_name) if use_milvus_lite else ("remote", MILVUS_URI, collection_name)
+        self._check_index_type(index_type)
+        if embedding_api not in EMBEDDING_API_MAP:
             raise ValueError(f"Unsupported embedding API: {embedding_api}")
+        self.embedding = EMBEDDING_API_MAP[embedding_api]
+        self.async_embedding = ASYNC_EMBEDDING_API_MAP[embedding_api]
 
         # try:
-        # Connect to the Milvus database
-        if use_milvus_lite:
+        # Connect to the Milvus database, reusing a shared client when one is provided
+        if client is not None:
+            self.client = client
+        elif use_milvus_lite:
             # 使用Milvus Lite本地文件连接
             self.client = MilvusClient(uri=db_path)
             logger.info(f"Using Milvus Lite with local database file: {db_path}")
@@ -59,7 +82,15 @@ class MilvusEmbeddingManager(BaseManager):
 
         # Create the collection if it doesn't exist
         if not self.client.has_collection(collection_name=self.collection_name):
-            self._create_collection(self.collection_name, expand_fields)
+            self._create_collection(self.collection_name, expand_fields, index_type, index_params)
+        else:
+            # An existing collection keeps the index it was built with
+            existing_index_type = self._describe_index_type()
+            if existing_index_type and existing_index_type != index_type:
+                logger.info(f"Collection {self.collection_name} already uses {existing_index_type} index, "
+                            f"ignoring requested index type {index_type}. Use reindex() to change it.")
+                index_type = existing_index_type
+        self._set_index_type(index_type, search_params)
         
         # Ensure the collection is loaded
         self.client.load_collection(self.collection_name)
@@ -69,12 +100,58 @@ class MilvusEmbeddingManager(BaseManager):
         #     logger.error(f"Failed to initialize the Milvus client: {str(e)}")
         #     raise
 
-    def _create_collection(self, collection_name, expand_fields):
+    def _check_index_type(self, index_type):
+        if index_type not in INDEX_TYPE_DEFAULTS:
+            logger.error(f"Unsupported index type: {index_type}. Allowed index types are {list(INDEX_TYPE_DEFAULTS.keys())}")
+            raise ValueError(f"Unsupported index type: {index_type}")
+        if self.use_milvus_lite and index_type != "FLAT":
+            logger.warning(f"Milvus Lite may not support {index_type} and can fall back to FLAT; "
+                           f"use a remote Milvus server for ANN indexes.")
+
+    def _set_index_type(self, index_type, search_params=None):
+        """
+        Record the index type of the collection and the default search parameters that match it.
+        """
+        self.index_type = index_type
+        self.search_params = dict(INDEX_TYPE_DEFAULTS.get(index_type, {}).get("search_params", {}))
+        if search_params:
+            self.search_params.update(search_params)
+
+    def _describe_index_type(self) -> Optional[str]:
+        try:
+            index_info = self.client.describe_index(
+                collection_name=self.collection_name, 
+                index_name=VECTOR_INDEX_NAME
+            )
+            return index_info.get("index_type") if index_info else None
+        except Exception as e:
+            logger.warning(f"Failed to describe index of collection {self.collection_name}: {str(e)}")
+            return None
+
+    def _build_index_params(self, index_type, index_params=None):
+        build_params = dict(INDEX_TYPE_DEFAULTS[index_type]["build_params"])
+        if index_params:
+            build_params.update(index_params)
+
+        milvus_index_params = MilvusClient.prepare_index_params()
+        milvus_index_params.add_index(
+            field_name="vector", 
+            index_type=index_type, 
+            index_name=VECTOR_INDEX_NAME, 
+            metric_type=VECTOR_METRIC_TYPE,
+            params=build_params
+        )
+        return milvus_index_params
+
+    def _create_collection(self, collection_name, expand_fields, index_type=DEFAULT_INDEX_TYPE, index_params=None):
         """
         Create a Milvus collection and build an index for the vector field.
         
         Args:
             collection_name (str): The name of the collection.
+            expand_fields (List[Dict]): Extra scalar fields of the collection.
+            index_type (str): Vector index type, one of INDEX_TYPE_DEFAULTS.
+            index_params (Dict): Index build parameters overriding the defaults of the index type.
         """
         # Define default fields
         defaulted_fields = [
@@ -117,49 +194,221 @@ class MilvusEmbeddingManager(BaseManager):
             schema=schema
         )
         
-        # Define index parameters
-        index_params = MilvusClient.prepare_index_params()
-        index_params.add_index(
-            field_name="vector", 
-            index_type="FLAT", 
-            index_name="vector_index", 
-            metric_type="IP",
-            # params={
-            #     "M": 64,  # Maximum number of connections per node
-            #     "efConstruction": 100  # Number of candidate nodes to consider during index construction
-            # }
-        )
-        
         # Create the index for the vector field
         self.client.create_index(
             collection_name=collection_name,
-            index_params=index_params
+            index_params=self._build_index_params(index_type, index_params)
         )
-        logger.info(f"Successfully created an index for the 'vector' field in collection {collection_name}")
+        logger.info(f"Successfully created a {index_type} index for the 'vector' field in collection {collection_name}")
+
+    def reindex(self, index_type: str, index_params: Optional[Dict[str, Any]] = None, search_params: Optional[Dict[str, Any]] = None):
+        """
+        Rebuild the vector index of the existing collection with another index type.
+        The stored vectors are kept; the collection is released while the index is rebuilt
+        and loaded again afterwards, so searches fail only during that window.
+        
+        Args:
+            index_type (str): The new index type, one of INDEX_TYPE_DEFAULTS.
+            index_params (Dict): Index build parameters overriding the defaults of the index type.
+            search_params (Dict): Default search parameters overriding the defaults of the index type.
+        """
+        self._check_index_type(index_type)
+        previous_index_type = self.index_type
+
+        self.client.release_collection(collection_name=self.collection_name)
+        try:
+            self.client.drop_index(collection_name=self.collection_name, index_name=VECTOR_INDEX_NAME)
+            self.client.create_index(
+                collection_name=self.collection_name,
+                index_params=self._build_index_params(index_type, index_params)
+            )
+        finally:
+            self.client.load_collection(self.collection_name)
+
+        self._set_index_type(index_type, search_params)
+        self._invalidate_search_cache()
+        logger.info(f"Successfully reindexed collection {self.collection_name} from {previous_index_type} to {index_type}")
+        return {"collection_name": self.collection_name, "previous_index_type": previous_index_type, "index_type": index_type}
 
     def get_collection(self):
         return self.client.list_collections()
 
-    def ingest(self, texts_with_metadata: List[Document], batch_size_limit: int = 16, **kwargs):
+    def _invalidate_search_cache(self):
+        search_cache = get_search_cache()
+        if search_cache is not None:
+            search_cache.invalidate_collection(self.collection_key)
+
+    def health_check(self) -> bool:
+        """
+        Check that the underlying client is still usable and the collection still exists.
+
+        Returns:
+            bool: True if the manager can keep serving requests.
+        """
+        try:
+            return self.client.has_collection(collection_name=self.collection_name)
+        except Exception as e:
+            logger.warning(f"Health check failed for collection {self.collection_name}: {str(e)}")
+            return False
+
+    def ingest(
+        self, 
+        texts_with_metadata: Iterable[Document], 
+        batch_size_limit: int = 16, 
+        embedding_concurrency: int = EMBEDDING_CONCURRENCY, 
+        **kwargs
+    ):
         """
         Process and store a batch of Document objects into Milvus.
         If the batch size exceeds the limit, process in chunks.
         
         Args:
-            texts_with_metadata (List[Document]): List of Document objects to process and store.
+            texts_with_metadata (Iterable[Document]): Document objects to process and store.
             batch_size_limit (int): Maximum batch size for processing.
+            embedding_concurrency (int): Number of embedding requests in flight at once.
         """
+        ingest_return_value_set, _ = self.ingest_with_stats(
+            texts_with_metadata, 
+            batch_size_limit=batch_size_limit, 
+            embedding_concurrency=embedding_concurrency, 
+            **kwargs
+        )
+        return ingest_return_value_set
+
+    def ingest_with_stats(
+        self, 
+        texts_with_metadata: Iterable[Document], 
+        batch_size_limit: int = 16, 
+        embedding_concurrency: int = EMBEDDING_CONCURRENCY, 
+        max_pending_batches: int = INGEST_MAX_PENDING_BATCHES,
+        **kwargs
+    ) -> Tuple[List[Optional[Dict]], Dict[str, Any]]:
+        """
+        Pipelined ingest: up to `embedding_concurrency` batches are embedded concurrently
+        while the calling thread inserts finished batches into Milvus in their original order.
+        At most `max_pending_batches` batches are embedded ahead of the insert stage, so a
+        slow Milvus applies backpressure to the embedding stage and memory stays bounded
+        even when `texts_with_metadata` is a lazy iterator.
+        
+        Args:
+            texts_with_metadata (Iterable[Document]): Document objects to process and store.
+            batch_size_limit (int): Maximum batch size for processing.
+            embedding_concurrency (int): Number of embedding requests in flight at once.
+            max_pending_batches (int): Maximum number of batches embedded but not yet inserted.
+        
+        Returns:
+            Tuple of the per-batch insert results (None for a failed batch) and a stats dict
+            with per-stage timings and the failed batches in batch order.
+        """
+        embedding_concurrency = max(1, embedding_concurrency)
+        max_pending_batches = max(embedding_concurrency, max_pending_batches)
 
         ingest_return_value_set = []
-        if len(texts_with_metadata) > batch_size_limit:
-            # Process in chunks
-            for i in tqdm(range(0, len(texts_with_metadata), batch_size_limit), desc="Ingesting batch data into Milvus: "):
-                batch = texts_with_metadata[i:i + batch_size_limit]
-                ingest_return_value_set.append(self._ingest_batch(batch, **kwargs))
-        else:
-            ingest_return_value_set.append(self._ingest_batch(texts_with_metadata, **kwargs))
+        failed_batches = []
+        stats = {
+            "batches": 0,
+            "records": 0,
+            "embedding_concurrency": embedding_concurrency,
+            "embed_time": 0.0,        # summed embedding time of all batches
+            "embed_wait_time": 0.0,   # time the insert stage waited for embeddings
+            "insert_time": 0.0,
+            "wall_time": 0.0
+        }
 
-        return ingest_return_value_set
+        total = len(texts_with_metadata) if hasattr(texts_with_metadata, "__len__") else None
+        progress = tqdm(
+            total=-(-total // batch_size_limit) if total is not None else None, 
+            desc="Ingesting batch data into Milvus: "
+        )
+
+        def batches():
+            iterator = iter(texts_with_metadata)
+            while True:
+                batch = list(islice(iterator, batch_size_limit))
+                if not batch:
+                    return
+                yield batch
+
+        def consume(pending: deque):
+            batch_index, batch, future = pending.popleft()
+            wait_start = time.perf_counter()
+            try:
+                embeddings, embed_time = future.result()
+                stats["embed_wait_time"] += time.perf_counter() - wait_start
+                stats["embed_time"] += embed_time
+
+                insert_start = time.perf_counter()
+                ingest_return_value = self._insert_batch(batch, embeddings, **kwargs)
+                stats["insert_time"] += time.perf_counter() - insert_start
+                stats["records"] += len(batch)
+                ingest_return_value_set.append(ingest_return_value)
+            except Exception as e:
+                logger.error(f"Error occurred during the insertion process of batch {batch_index}: {str(e)}")
+                failed_batches.append({"batch_index": batch_index, "size": len(batch), "error": str(e)})
+                ingest_return_value_set.append(None)
+            progress.update(1)
+
+        wall_start = time.perf_counter()
+        pending = deque()
+        with ThreadPoolExecutor(max_workers=embedding_concurrency, thread_name_prefix="embedding") as executor:
+            for batch_index, batch in enumerate(batches()):
+                pending.append((batch_index, batch, executor.submit(self._embed_batch, batch)))
+                stats["batches"] += 1
+                # backpressure: wait for the oldest batch before embedding further ahead
+                while len(pending) >= max_pending_batches:
+                    consume(pending)
+            while pending:
+                consume(pending)
+        progress.close()
+
+        stats["wall_time"] = time.perf_counter() - wall_start
+        stats["failed_batches"] = failed_batches
+        return ingest_return_value_set, stats
+
+    def _embed_batch(self, texts_with_metadata: List[Document]) -> Tuple[List[List[float]], float]:
+        """
+        Helper method to generate the embedding vectors of a single batch.
+        
+        Returns:
+            Tuple of the embedding vectors and the time spent embedding.
+        """
+        start_time = time.perf_counter()
+        # 提取所有文档的chunk用于生成嵌入向量
+        chunks = [doc.chunk for doc in texts_with_metadata]
+        
+        # 生成嵌入向量
+        embeddings = self.embedding(texts=chunks)
+        if not embeddings or len(embeddings) != len(chunks):
+            raise ValueError(f"Embedding API returned no vectors for a batch of {len(chunks)} chunks")
+        return embeddings, time.perf_counter() - start_time
+
+    def _insert_batch(self, texts_with_metadata: List[Document], embeddings: List[List[float]], **kwargs) -> Dict:
+        """
+        Helper method to insert a single embedded batch of Document objects into Milvus.
+        """
+        # 准备插入数据
+        data = []
+        for embedding, doc in zip(embeddings, texts_with_metadata):
+            items_to_ingest = {
+                "vector": embedding, 
+                "text": doc.chunk,
+                "metadata": doc.metadata
+            }
+            if kwargs:
+                items_to_ingest.update(kwargs)
+            data.append(items_to_ingest)
+        
+        # 插入到Milvus
+        ingest_return_value = self.client.insert(
+            collection_name=self.collection_name,
+            data=data
+        )
+        self._invalidate_search_cache()
+        logger.info(f"Successfully inserted {len(texts_with_metadata)} records into collection {self.collection_name}")
+
+        ingest_return_value.update({"ids": list(ingest_return_value["ids"])})
+
+        return ingest_return_value
 
     def _ingest_batch(self, texts_with_metadata: List[Document], **kwargs):
         """
@@ -170,45 +419,30 @@ class MilvusEmbeddingManager(BaseManager):
             texts_with_metadata (List[Document]): A batch of Document objects.
         """
         try:
-            # 提取所有文档的chunk用于生成嵌入向量
-            chunks = [doc.chunk for doc in texts_with_metadata]
-            
-            # 生成嵌入向量
-            embeddings = self.embedding(texts=chunks)
-
-            # 准备插入数据
-            data = []
-            for embedding, doc in zip(embeddings, texts_with_metadata):
-                items_to_ingest = {
-                    "vector": embedding, 
-                    "text": doc.chunk,
-                    "metadata": doc.metadata
-                }
-                if kwargs:
-                    items_to_ingest.update(kwargs)
-                data.append(items_to_ingest)
-            
-            # 插入到Milvus
-            ingest_return_value = self.client.insert(
-                collection_name=self.collection_name,
-                data=data
-            )
-            logger.info(f"Successfully inserted {len(texts_with_metadata)} records into collection {self.collection_name}")
-
-            ingest_return_value.update({"ids": list(ingest_return_value["ids"])})
-
-            return ingest_return_value
+            embeddings, _ = self._embed_batch(texts_with_metadata)
+            return self._insert_batch(texts_with_metadata, embeddings, **kwargs)
         except Exception as e:
             logger.error(f"Error occurred during the insertion process: {str(e)}")
 
-    def search(self, query: str, top_k: int = 3, **kwargs) -> Optional[List[Dict[str, Any]]]:
+    def search(
+        self, 
+        query: str, 
+        top_k: int = 3, 
+        search_params: Optional[Dict[str, Any]] = None, 
+        use_cache: bool = True, 
+        **kwargs
+    ) -> Optional[List[Dict[str, Any]]]:
         """
         Perform a top-k similarity search.
         Returns the top-k most similar documents in the database for the query.
+        Repeated queries are answered from the in-memory search cache until the collection
+        is written to or the cache entry expires.
         
         Args:
             query (str): The search query text.
             top_k (int): The number of top results to retrieve.
+            search_params (Dict): Index search parameters (e.g. ef, nprobe) overriding the collection defaults.
+            use_cache (bool): Whether to use the query embedding and search result caches.
             expr (str): Optional filtering expression.
         
         Returns:
@@ -219,43 +453,241 @@ class MilvusEmbeddingManager(BaseManager):
             return None
             
         try:
+            search_cache = get_search_cache() if use_cache else None
+            if search_cache is not None:
+                result_key = search_cache.result_key(self.collection_key, self.embedding_api, query, top_k, search_params, kwargs)
+                cached_results = search_cache.get_results(result_key)
+                if cached_results is not None:
+                    return cached_results
+
             # Generate an embedding vector for the query
-            query_embedding = self.embedding([query])
-            if not query_embedding:
+            query_embedding = self._embed_query(query, search_cache)
+            if query_embedding is None:
                 logger.error("Failed to generate embedding vector for the query")
                 return None
-                
-            # Search in Milvus
-            search_params = {"metric_type": "IP", "params": {"ef": 10}}
-            
-            # Build search arguments
-            search_args = {
-                "collection_name": self.collection_name,
-                "data": [query_embedding[0]],
-                "limit": top_k,
-                "output_fields": ["text", "metadata", "id"],
-                "search_params": search_params,
-            }
-                
-            # Add any additional kwargs
-            search_args.update(kwargs)
+            results = self._search_by_embedding(query_embedding, top_k, search_params, **kwargs)
+
+            if search_cache is not None:
+                search_cache.put_results(result_key, results)
+            return results
             
-            results = self.client.search(**search_args)
+        except Exception as e:
+            logger.error(f"Error occurred during the search process: {str(e)}")
+            return None
+
+    def search_many(
+        self, 
+        queries: List[str], 
+        top_k: int = 3, 
+        search_params: Optional[Dict[str, Any]] = None, 
+        use_cache: bool = True, 
+        **kwargs
+    ) -> List[Optional[List[Dict[str, Any]]]]:
+        """
+        Perform a top-k similarity search for several queries at once.
+        All uncached queries are embedded in a single embedding call and searched with a
+        single vectorized Milvus request, instead of one round-trip pair per query.
+        
+        Args:
+            queries (List[str]): The search query texts.
+            top_k (int): The number of top results to retrieve per query.
+            search_params (Dict): Index search parameters overriding the collection defaults.
+            use_cache (bool): Whether to use the query embedding and search result caches.
+            expr (str): Optional filtering expression applied to every query.
+        
+        Returns:
+            A list with the results of each query in input order, None for an empty query
+            or when the search fails.
+        """
+        results: List[Optional[List[Dict[str, Any]]]] = [None] * len(queries)
+        search_cache = get_search_cache() if use_cache else None
+
+        # query -> positions, so duplicated queries are embedded and searched once
+        pending: Dict[str, List[int]] = {}
+        result_keys = {}
+        for position, query in enumerate(queries):
+            if not query or not query.strip():
+                logger.error(f"Query text at position {position} cannot be empty")
+                continue
+            if search_cache is not None:
+                if query not in result_keys:
+                    result_keys[query] = search_cache.result_key(
+                        self.collection_key, self.embedding_api, query, top_k, search_params, kwargs
+                    )
+                cached_results = search_cache.get_results(result_keys[query])
+                if cached_results is not None:
+                    results[position] = cached_results
+                    continue
+            pending.setdefault(query, []).append(position)
+
+        if not pending:
+            return results
+
+        try:
+            query_embeddings = {}
+            if search_cache is not None:
+                for query in pending:
+                    query_embedding = search_cache.get_embedding(self.embedding_api, query)
+                    if query_embedding is not None:
+                        query_embeddings[query] = query_embedding
+
+            to_embed = [query for query in pending if query not in query_embeddings]
+            if to_embed:
+                embeddings = self.embedding(to_embed)
+                if not embeddings or len(embeddings) != len(to_embed):
+                    logger.error(f"Failed to generate embedding vectors for {len(to_embed)} queries")
+                    return results
+                for query, embedding in zip(to_embed, embeddings):
+                    query_embeddings[query] = embedding
+                    if search_cache is not None:
+                        search_cache.put_embedding(self.embedding_api, query, embedding)
+
+            pending_queries = list(pending)
+            batch_results = self._search_by_embeddings(
+                [query_embeddings[query] for query in pending_queries], top_k, search_params, **kwargs
+            )
+        except Exception as e:
+            logger.error(f"Error occurred during the batch search process: {str(e)}")
+            return results
+
+        for query, query_results in zip(pending_queries, batch_results):
+            if search_cache is not None:
+                search_cache.put_results(result_keys[query], query_results)
+            positions = pending[query]
+            results[positions[0]] = query_results
+            for position in positions[1:]:
+                results[position] = [dict(doc) for doc in query_results]
+        return results
+
+    async def asearch(
+        self, 
+        query: str, 
+        top_k: int = 3, 
+        search_params: Optional[Dict[str, Any]] = None, 
+        executor=None, 
+        use_cache: bool = True, 
+        **kwargs
+    ) -> Optional[List[Dict[str, Any]]]:
+        """
+        Async variant of search: the query embedding is awaited on the event loop and the
+        blocking Milvus call runs in a worker thread.
+        
+        Args:
+            query (str): The search query text.
+            top_k (int): The number of top results to retrieve.
+            search_params (Dict): Index search parameters overriding the collection defaults.
+            executor: Optional object with an async `run(func, *args)` method used for the
+                Milvus call, defaults to asyncio.to_thread.
+            use_cache (bool): Whether to use the query embedding and search result caches.
+        
+        Returns:
+            A list of dictionaries containing text and metadata, or None if the search fails.
+        """
+        if not query or not query.strip():
+            logger.error("Query text cannot be empty")
+            return None
+
+        try:
+            search_cache = get_search_cache() if use_cache else None
+            if search_cache is not None:
+                result_key = search_cache.result_key(self.collection_key, self.embedding_api, query, top_k, search_params, kwargs)
+                cached_results = search_cache.get_results(result_key)
+                if cached_results is not None:
+                    return cached_results
+
+            query_embedding = search_cache.get_embedding(self.embedding_api, query) if search_cache is not None else None
+            if query_embedding is None:
+                embeddings = await self.async_embedding([query])
+                if not embeddings:
+                    logger.error("Failed to generate embedding vector for the query")
+                    return None
+                query_embedding = embeddings[0]
+                if search_cache is not None:
+                    search_cache.put_embedding(self.embedding_api, query, query_embedding)
+
+            if executor is not None:
+                results = await executor.run(self._search_by_embedding, query_embedding, top_k, search_params, **kwargs)
+            else:
+                results = await asyncio.to_thread(self._search_by_embedding, query_embedding, top_k, search_params, **kwargs)
+
+            if search_cache is not None:
+                search_cache.put_results(result_key, results)
+            return results
+
+        except Exception as e:
+            logger.error(f"Error occurred during the search process: {str(e)}")
+            return None
+
+    def _embed_query(self, query: str, search_cache=None) -> Optional[List[float]]:
+        """
+        Helper method to embed a single query, going through the query embedding cache if given.
+        """
+        if search_cache is not None:
+            query_embedding = search_cache.get_embedding(self.embedding_api, query)
+            if query_embedding is not None:
+                return query_embedding
+
+        embeddings = self.embedding([query])
+        if not embeddings:
+            return None
+        if search_cache is not None:
+            search_cache.put_embedding(self.embedding_api, query, embeddings[0])
+        return embeddings[0]
+
+    def _search_by_embedding(
+        self, 
+        query_embedding: List[float], 
+        top_k: int, 
+        search_params: Optional[Dict[str, Any]] = None, 
+        **kwargs
+    ) -> List[Dict[str, Any]]:
+        """
+        Helper method to run the Milvus search for an already embedded query.
+        """
+        return self._search_by_embeddings([query_embedding], top_k, search_params, **kwargs)[0]
+
+    def _search_by_embeddings(
+        self, 
+        query_embeddings: List[List[float]], 
+        top_k: int, 
+        search_params: Optional[Dict[str, Any]] = None, 
+        **kwargs
+    ) -> List[List[Dict[str, Any]]]:
+        """
+        Helper method to run one Milvus search request for several embedded queries.
+        """
+        # Search in Milvus with the parameters matching the collection's index type
+        index_search_params = dict(self.search_params)
+        if search_params:
+            index_search_params.update(search_params)
+        
+        # Build search arguments
+        search_args = {
+            "collection_name": self.collection_name,
+            "data": query_embeddings,
+            "limit": top_k,
+            "output_fields": ["text", "metadata", "id"],
+            "search_params": {"metric_type": VECTOR_METRIC_TYPE, "params": index_search_params},
+        }
             
-            # Extract and return the documents with text and metadata
-            documents = []
-            for hit in results[0]:
-                documents.append({
+        # Add any additional kwargs
+        search_args.update(kwargs)
+        
+        results = self.client.search(**search_args)
+        
+        # Extract and return the documents with text and metadata of every query
+        return [
+            [
+                {
                     "chunk": hit["entity"]["text"],
                     "metadata": hit["entity"]["metadata"],
                     "score": hit["distance"],
                     "id": hit["entity"]["id"]
-                })
-            return documents
-            
-        except Exception as e:
-            logger.error(f"Error occurred during the search process: {str(e)}")
-            return None
+                }
+                for hit in hits
+            ]
+            for hits in results
+        ]
         
 
 if __name__ == "__main__":
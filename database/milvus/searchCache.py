@@ -0,0 +1,154 @@
+import copy
+import json
+import threading
+from loguru import logger
+from cachetools import TTLCache
+from typing import Dict, Any, Optional, List, Tuple
+import sys
+
+sys.path.append("../..")
+
+from database.milvus.config import (
+    SEARCH_CACHE_ENABLED,
+    QUERY_EMBEDDING_CACHE_SIZE,
+    QUERY_EMBEDDING_CACHE_TTL,
+    SEARCH_RESULT_CACHE_SIZE,
+    SEARCH_RESULT_CACHE_TTL
+)
+from utils.embedding_cache import normalize_text
+
+
+class SearchCache:
+    """
+    In-memory LRU/TTL caches for hot queries, shared by all managers of the process.
+
+    `embeddings` maps (embedding_api, normalized query) to the query vector, `results` maps
+    (collection, generation, embedding_api, normalized query, top_k, search_params, filter)
+    to the search results. Every collection has a generation counter that is bumped when
+    the collection is written to or reindexed, so stale results are never returned and
+    simply age out of the cache.
+    """
+    def __init__(
+        self,
+        embedding_cache_size: int = QUERY_EMBEDDING_CACHE_SIZE,
+        embedding_cache_ttl: float = QUERY_EMBEDDING_CACHE_TTL,
+        result_cache_size: int = SEARCH_RESULT_CACHE_SIZE,
+        result_cache_ttl: float = SEARCH_RESULT_CACHE_TTL
+    ):
+        self._lock = threading.Lock()
+        self._embeddings = TTLCache(maxsize=embedding_cache_size, ttl=embedding_cache_ttl)
+        self._results = TTLCache(maxsize=result_cache_size, ttl=result_cache_ttl)
+        self._generations: Dict[Tuple, int] = {}
+
+        self.embedding_hits = 0
+        self.embedding_misses = 0
+        self.result_hits = 0
+        self.result_misses = 0
+        self.invalidations = 0
+
+    def get_embedding(self, embedding_api: str, query: str) -> Optional[List[float]]:
+        key = (embedding_api, normalize_text(query))
+        with self._lock:
+            embedding = self._embeddings.get(key)
+            if embedding is None:
+                self.embedding_misses += 1
+            else:
+                self.embedding_hits += 1
+            return embedding
+
+    def put_embedding(self, embedding_api: str, query: str, embedding: List[float]):
+        with self._lock:
+            self._embeddings[(embedding_api, normalize_text(query))] = embedding
+
+    def result_key(
+        self,
+        collection_key: Tuple,
+        embedding_api: str,
+        query: str,
+        top_k: int,
+        search_params: Optional[Dict[str, Any]],
+        search_kwargs: Dict[str, Any]
+    ) -> Tuple:
+        """
+        Build the result cache key. The collection generation is read here, so a key built
+        before a write is never served after it.
+        """
+        with self._lock:
+            generation = self._generations.get(collection_key, 0)
+        return (
+            collection_key,
+            generation,
+            embedding_api,
+            normalize_text(query),
+            top_k,
+            json.dumps(search_params or {}, sort_keys=True, default=str),
+            # filter / expr and any other search arguments
+            json.dumps(search_kwargs, sort_keys=True, default=str)
+        )
+
+    def get_results(self, key: Tuple) -> Optional[List[Dict[str, Any]]]:
+        with self._lock:
+            results = self._results.get(key)
+            if results is None:
+                self.result_misses += 1
+                return None
+            self.result_hits += 1
+        # callers are free to modify the returned documents
+        return copy.deepcopy(results)
+
+    def put_results(self, key: Tuple, results: List[Dict[str, Any]]):
+        collection_key, generation = key[0], key[1]
+        with self._lock:
+            # the collection changed while the search was running
+            if self._generations.get(collection_key, 0) != generation:
+                return
+            self._results[key] = copy.deepcopy(results)
+
+    def invalidate_collection(self, collection_key: Tuple):
+        """Make every cached result of the collection unreachable."""
+        with self._lock:
+            self._generations[collection_key] = self._generations.get(collection_key, 0) + 1
+            self.invalidations += 1
+        logger.debug(f"Search cache invalidated for collection {collection_key}")
+
+    def clear(self):
+        with self._lock:
+            self._embeddings.clear()
+            self._results.clear()
+
+    def stats(self) -> Dict[str, Any]:
+        with self._lock:
+            embedding_total = self.embedding_hits + self.embedding_misses
+            result_total = self.result_hits + self.result_misses
+            return {
+                "query_embeddings": len(self._embeddings),
+                "embedding_hits": self.embedding_hits,
+                "embedding_misses": self.embedding_misses,
+                "embedding_hit_ratio": self.embedding_hits / embedding_total if embedding_total else 0.0,
+                "results": len(self._results),
+                "result_hits": self.result_hits,
+                "result_misses": self.result_misses,
+                "result_hit_ratio": self.result_hits / result_total if result_total else 0.0,
+                "invalidations": self.invalidations
+            }
+
+
+_search_cache: Optional[SearchCache] = None
+_search_cache_lock = threading.Lock()
+
+
+def get_search_cache() -> Optional[SearchCache]:
+    """Return the process-wide search cache, or None if it is disabled."""
+    global _search_cache
+    if not SEARCH_CACHE_ENABLED:
+        return None
+    if _search_cache is None:
+        with _search_cache_lock:
+            if _search_cache is None:
+                _search_cache = SearchCache()
+    return _search_cache
+
+
+def search_cache_stats() -> Dict[str, Any]:
+    cache = get_search_cache()
+    return cache.stats() if cache is not None else {"enabled": False}
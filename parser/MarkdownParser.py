@@ -1,3 +1,5 @@
+import io
+
 from parser.baseParser import BaseParser
 
 
@@ -12,10 +14,14 @@ class NaiveMarkdownParser(MarkdownParser):
         super().__init__(markdown_path=markdown_path)
     
     def read_content(self):
-        """Read content from the markdown file."""
+        """Read content from the markdown file or the in-memory markdown bytes."""
         try:
-            with open(self.markdown_path, 'r', encoding='utf-8') as f:
-                self.content = f.read()
+            if self.in_memory:
+                # decode like open(..., 'r'), including universal newline translation
+                self.content = io.TextIOWrapper(io.BytesIO(self.read_bytes()), encoding='utf-8').read()
+            else:
+                with open(self.markdown_path, 'r', encoding='utf-8') as f:
+                    self.content = f.read()
         except Exception as e:
             raise Exception(f"Failed to read markdown file: {str(e)}")
     
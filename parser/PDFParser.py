@@ -1,6 +1,11 @@
+from collections import deque
+from typing import Iterator, List
+
 from PyPDF2 import PdfReader
 from parser.baseParser import BaseParser
-from utils.minerU_api import mineru_file_parse_api
+from parser.config import PDF_PROCESS_POOL_SIZE, PDF_PARALLEL_WORKERS, PDF_PAGES_PER_TASK, PDF_PARALLEL_MIN_PAGES
+from utils.minerU_api import mineru_sharded_parse_api
+from utils.process_pool import get_process_pool
 
 
 class PDFParser(BaseParser):
@@ -22,20 +27,88 @@ class PyPDF2Parser(PDFParser):
 
     def read_content(self):
         """Read the PDF file using PyPDF2 and store the reader object in self.content."""
-        self.content = PdfReader(self.path)
+        self.content = PdfReader(self.open_source())
 
-    def extract_text(self):
-        """Extract text from the PDF reader stored in self.content."""
+    def iter_pages(self) -> Iterator[str]:
+        """Yield the text of each page in order, so consumers can start before the last page is extracted."""
         if self.content is None:
             raise ValueError("Content is not loaded. Call read_content() first.")
 
-        full_text = ""
         for page in self.content.pages:
             page_text = page.extract_text()
-            full_text += page_text if page_text else ""  # Ensure text extraction handles possible None values.
-            full_text += "\n"
+            yield page_text if page_text else ""  # Ensure text extraction handles possible None values.
+
+    def extract_text(self):
+        """Extract text from the PDF reader stored in self.content."""
+        # join once instead of growing the string page by page
+        return "".join(f"{page_text}\n" for page_text in self.iter_pages())
+
+
+def _extract_page_range(pdf_path: str, start: int, end: int) -> List[str]:
+    """Extract the texts of pages [start, end) in a worker process that opens the PDF on its own."""
+    reader = PdfReader(pdf_path)
+    page_texts = []
+    for page_number in range(start, end):
+        page_text = reader.pages[page_number].extract_text()
+        page_texts.append(page_text if page_text else "")
+    return page_texts
+
+
+def get_pdf_process_pool():
+    """Return the process pool shared by all page-parallel PDF parses."""
+    return get_process_pool("pdf", PDF_PROCESS_POOL_SIZE)
+
+
+class ParallelPyPDF2Parser(PyPDF2Parser):
+    """
+    PyPDF2 parser that extracts page ranges in a process pool. Each worker opens the PDF
+    independently, page texts are yielded in order as soon as their range is done and joined
+    once at the end. Small PDFs are parsed serially in the calling process.
+    """
+    def __init__(
+        self, 
+        pdf_path, 
+        max_workers: int = PDF_PARALLEL_WORKERS, 
+        pages_per_task: int = PDF_PAGES_PER_TASK, 
+        min_parallel_pages: int = PDF_PARALLEL_MIN_PAGES
+    ):
+        super().__init__(pdf_path)
+        self.max_workers = max_workers
+        self.pages_per_task = pages_per_task
+        self.min_parallel_pages = min_parallel_pages
+
+    def iter_pages(self) -> Iterator[str]:
+        """Yield the text of each page in order, extracting page ranges in parallel."""
+        if self.content is None:
+            raise ValueError("Content is not loaded. Call read_content() first.")
 
-        return full_text
+        num_pages = len(self.content.pages)
+        if num_pages < self.min_parallel_pages or self.max_workers <= 1:
+            yield from super().iter_pages()
+            return
+
+        page_ranges = [
+            (start, min(start + self.pages_per_task, num_pages))
+            for start in range(0, num_pages, self.pages_per_task)
+        ]
+        max_workers = min(self.max_workers, len(page_ranges))
+        # the "pdf" process pool is shared by all parses, max_workers only bounds this parse
+        executor = get_pdf_process_pool()
+        # every worker opens the PDF on its own, so in-memory sources need a file on disk
+        with self.spill_to_disk(suffix=".pdf") as pdf_path:
+            # keep a bounded number of ranges in flight and yield them in page order
+            pending = deque()
+            try:
+                for start, end in page_ranges:
+                    pending.append(executor.submit(_extract_page_range, pdf_path, start, end))
+                    if len(pending) >= 2 * max_workers:
+                        yield from pending.popleft().result()
+                while pending:
+                    yield from pending.popleft().result()
+            finally:
+                # an abandoned parse must not keep occupying the shared pool
+                for future in pending:
+                    future.cancel()
 
 
 class minerUParser(PDFParser):
@@ -44,7 +117,11 @@ class minerUParser(PDFParser):
 
     def read_content(self):
         """Read the PDF file using PyPDF2 and store the reader object in self.content."""
-        self.content = mineru_file_parse_api(self.path).get("md_content", "")
+        # long PDFs are split into page-range shards that MinerU parses concurrently
+        result = mineru_sharded_parse_api(self.read_bytes())
+        if result is None:
+            raise ValueError("MinerU failed to parse the PDF file.")
+        self.content = result.get("md_content", "")
 
     def extract_text(self):
         """Extract text from the PDF reader stored in self.content."""
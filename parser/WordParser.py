@@ -14,7 +14,7 @@ class DocxParser(WordParser):
     def read_content(self):
         """读取Word文档内容并存储到self.content中"""
         try:
-            self.content = Document(self.path)
+            self.content = Document(self.open_source())
         except Exception as e:
             raise Exception(f"无法读取Word文档: {str(e)}")
     
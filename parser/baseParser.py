@@ -1,11 +1,70 @@
+import io
+import os
+import tempfile
 from abc import ABC, abstractmethod
+from contextlib import contextmanager
+from typing import Union, BinaryIO, Iterator
+
+# A parser source is either a file path or the file content held in memory
+ParserSource = Union[str, os.PathLike, bytes, bytearray, memoryview, BinaryIO]
 
 
 class BaseParser(ABC):
-    def __init__(self, path):
-        self.path = path
+    # part of the parse cache key, bump it when a change of the parser alters its extracted text
+    VERSION = "1"
+
+    def __init__(self, path: ParserSource):
+        # path is kept for the parsers that need a file on disk, None for in-memory sources
+        self.source = path
+        self.path = path if isinstance(path, (str, os.PathLike)) else None
         self.content = None
 
+    @property
+    def in_memory(self) -> bool:
+        return self.path is None
+
+    def open_source(self) -> Union[str, BinaryIO]:
+        """
+        Return the source in a form accepted by libraries that read either a path or a binary
+        stream (PdfReader, python-docx): the path itself, or a stream positioned at the start.
+        """
+        if not self.in_memory:
+            return self.path
+        if isinstance(self.source, (bytes, bytearray, memoryview)):
+            return io.BytesIO(self.source)
+        if self.source.seekable():
+            self.source.seek(0)
+        return self.source
+
+    def read_bytes(self) -> bytes:
+        """Return the whole source as bytes."""
+        if isinstance(self.source, bytes):
+            return self.source
+        if isinstance(self.source, (bytearray, memoryview)):
+            return bytes(self.source)
+        if not self.in_memory:
+            with open(self.path, "rb") as f:
+                return f.read()
+        return self.open_source().read()
+
+    @contextmanager
+    def spill_to_disk(self, suffix: str = "") -> Iterator[str]:
+        """
+        Yield a file path of the source for backends that can only read from disk. In-memory
+        sources are written to a temporary file that is always removed afterwards.
+        """
+        if not self.in_memory:
+            yield os.fspath(self.path)
+            return
+
+        fd, spill_path = tempfile.mkstemp(suffix=suffix)
+        try:
+            with os.fdopen(fd, "wb") as f:
+                f.write(self.read_bytes())
+            yield spill_path
+        finally:
+            os.remove(spill_path)
+
     @abstractmethod
     def read_content(self):
         """Read content from the source file and store it in self.content."""
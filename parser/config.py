@@ -1,2 +1,29 @@
+import os
+
+CURRENT_DIR = os.path.dirname(os.path.abspath(__file__))
+
 REQUEST_TIMEOUT = 1000
-MAX_RETRIES = 1
\ No newline at end of file
+MAX_RETRIES = 1
+
+MINERU_JOBS_URL = "http://127.0.0.1:8888/jobs"  # MinerU 异步解析任务接口
+
+# MinerU 异步任务轮询配置，REQUEST_TIMEOUT 为等待解析结果的总时长
+MINERU_POLL_INTERVAL = 2       # 轮询间隔（秒）
+MINERU_POLL_TIMEOUT = 30       # 单次轮询请求的超时时间（秒）
+MINERU_UPLOAD_TIMEOUT = 300    # 提交任务(上传文件)请求的超时时间（秒），大文件上传远慢于轮询
+
+# MinerU 分片解析配置：按页切分PDF，各分片并发提交、单独重试，再按页序拼接markdown
+MINERU_PAGES_PER_SHARD = 20    # 每个分片的页数
+MINERU_SHARD_CONCURRENCY = 4   # 同时解析的分片数，不宜超过MinerU服务的进程数与队列长度
+MINERU_SHARD_RETRIES = 3       # 单个分片的最大尝试次数
+
+# 页级并行 PDF 解析配置(pypdf2_parallel)
+PDF_PROCESS_POOL_SIZE = os.cpu_count() or 4  # 所有解析共享的进程池"pdf"的进程数
+PDF_PARALLEL_WORKERS = os.cpu_count() or 4  # 单次解析最多占用的进程数
+PDF_PAGES_PER_TASK = 16                     # 每个进程任务负责的连续页数
+PDF_PARALLEL_MIN_PAGES = 32                 # 页数少于该值时直接在当前进程中串行解析
+
+# 文档解析结果持久化缓存配置，按(文件内容sha256, 文件类型, 解析策略, 解析器版本)缓存提取的文本
+PARSE_CACHE_ENABLED = True
+PARSE_CACHE_PATH = f"{CURRENT_DIR}/parse_cache/parse_cache.db"
+PARSE_CACHE_MAX_BYTES = 1024 ** 3  # 1GB
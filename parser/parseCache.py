@@ -0,0 +1,60 @@
+"""
+@File   : parseCache.py
+@Desc   : 文档解析结果的持久化缓存，相同文件重复上传时直接返回上次提取的文本
+"""
+import sys
+import zlib
+import hashlib
+import threading
+from typing import Optional
+
+from loguru import logger
+
+sys.path.append("..")
+
+from utils.sqlite_cache import SQLiteCache
+from parser.config import PARSE_CACHE_ENABLED, PARSE_CACHE_PATH, PARSE_CACHE_MAX_BYTES
+
+
+class ParseCache(SQLiteCache):
+    """
+    Disk-backed cache of extracted document text keyed by
+    (sha256 of the file bytes, file type, parse strategy, parser version).
+    Texts are stored zlib-compressed.
+    """
+    @staticmethod
+    def make_key(file_content: bytes, file_type: str, parse_strategy: str, parser_version: str) -> str:
+        digest = hashlib.sha256(file_content).hexdigest()
+        return f"{file_type}:{parse_strategy}:{parser_version}:{digest}"
+
+    def get_text(self, key: str) -> Optional[str]:
+        blob = self.get(key)
+        return zlib.decompress(blob).decode("utf-8") if blob is not None else None
+
+    def put_text(self, key: str, text: str):
+        self.put(key, zlib.compress(text.encode("utf-8")))
+
+
+_parse_cache: Optional[ParseCache] = None
+_parse_cache_lock = threading.Lock()
+
+
+def get_parse_cache() -> Optional[ParseCache]:
+    """Return the process-wide parse cache, or None if it is disabled or unavailable."""
+    global _parse_cache
+    if not PARSE_CACHE_ENABLED:
+        return None
+    if _parse_cache is None:
+        with _parse_cache_lock:
+            if _parse_cache is None:
+                try:
+                    _parse_cache = ParseCache(PARSE_CACHE_PATH, PARSE_CACHE_MAX_BYTES)
+                except Exception as e:
+                    logger.error(f"解析缓存初始化失败，将不使用缓存: {str(e)}")
+                    return None
+    return _parse_cache
+
+
+def parse_cache_stats() -> dict:
+    cache = get_parse_cache()
+    return cache.stats() if cache is not None else {"enabled": False}
@@ -1,3 +1,4 @@
+import asyncio
 from abc import ABC, abstractmethod
 from typing import List, Dict, Optional
 from loguru import logger
@@ -20,3 +21,10 @@ class BaseReranker(ABC):
             Optional[List[Dict[str, float]]]: List of re-ranked sentences and their scores.
         """
         pass
+
+    async def arerank(self, query: str, top_k: int, sentences: List[str]) -> Optional[List[Dict[str, float]]]:
+        """
+        Async variant of rerank. Runs rerank in a worker thread unless a subclass
+        provides a native async implementation.
+        """
+        return await asyncio.to_thread(self.rerank, query, top_k, sentences)
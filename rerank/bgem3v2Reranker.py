@@ -1,7 +1,7 @@
 from loguru import logger
 from typing import List, Dict, Optional
 from rerank.baseReranker import BaseReranker
-from utils.reranker_api import reranker_api
+from utils.reranker_api import reranker_api, async_reranker_api
 
 
 # Define BGEM3V2Reranker class inheriting from BaseReranker
@@ -26,6 +26,23 @@ class BGEM3V2Reranker(BaseReranker):
         except Exception as e:
             logger.error(f"An exception occurred when calling the Reranker API: {str(e)}")
             return None
+
+    async def arerank(self, query: str, top_k: int, sentences: List[str]) -> Optional[List[Dict[str, float]]]:
+        """
+        Use the Reranker API asynchronously, without blocking the event loop.
+        Args:
+            query (str): Query string.
+            top_k (int): Number of top results to return.
+            sentences (List[str]): List of candidate sentences.
+
+        Returns:
+            Optional[List[Dict[str, float]]]: List of re-ranked sentences and their scores.
+        """
+        try:
+            return await async_reranker_api(query=query, top_k=top_k, sentences=sentences)
+        except Exception as e:
+            logger.error(f"An exception occurred when calling the Reranker API: {str(e)}")
+            return None
         
 
 if __name__ == "__main__":
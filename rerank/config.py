@@ -4,3 +4,11 @@
 # RERANKER_API_URL = "http://10.100.167.66:13456/rerank"
 REQUEST_TIMEOUT = 30
 MAX_RETRIES = 3
+
+# 重排序分数缓存配置，按(模型, 查询, 候选文本)的哈希缓存分数，只把未命中的文本发送给重排序服务
+RERANK_MODEL_NAME = "bge-reranker-v2-m3"
+RERANK_SCORE_CACHE_ENABLED = True
+RERANK_SCORE_CACHE_MAX_ENTRIES = 200000          # 内存缓存的最大条数
+RERANK_SCORE_CACHE_MAX_BYTES = 64 * 1024 ** 2    # 内存缓存的最大估计占用(64MB)
+RERANK_SCORE_CACHE_PATH = None                   # 设为SQLite文件路径时启用磁盘缓存，如 "./rerank_cache/score_cache.db"
+RERANK_SCORE_CACHE_DISK_MAX_BYTES = 512 * 1024 ** 2
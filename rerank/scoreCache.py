@@ -0,0 +1,197 @@
+"""
+@File   : scoreCache.py
+@Desc   : 重排序分数缓存，按(模型, 查询, 候选文本)哈希缓存分数，内存LRU + 可选的SQLite磁盘缓存
+"""
+import sys
+import struct
+import hashlib
+import asyncio
+import functools
+import threading
+from collections import OrderedDict
+from typing import Callable, Dict, List, Optional
+
+from loguru import logger
+
+sys.path.append("..")
+
+from utils.sqlite_cache import SQLiteCache
+from rerank.config import (
+    RERANK_MODEL_NAME,
+    RERANK_SCORE_CACHE_ENABLED,
+    RERANK_SCORE_CACHE_MAX_ENTRIES,
+    RERANK_SCORE_CACHE_MAX_BYTES,
+    RERANK_SCORE_CACHE_PATH,
+    RERANK_SCORE_CACHE_DISK_MAX_BYTES
+)
+
+# estimated memory of one entry: the 64-char key string, the float and the OrderedDict node
+_ENTRY_BYTES = sys.getsizeof("0" * 64) + sys.getsizeof(0.0) + 100
+
+
+class ScoreCache:
+    """
+    LRU cache of reranker scores keyed by sha256(model, query, passage).
+
+    The in-memory LRU is bounded by both `max_entries` and `max_bytes`. When `path` is set,
+    scores are also written to a SQLiteCache, so they survive restarts and can be shared by
+    several processes; disk hits are promoted into memory.
+    """
+    def __init__(
+        self,
+        max_entries: int = RERANK_SCORE_CACHE_MAX_ENTRIES,
+        max_bytes: int = RERANK_SCORE_CACHE_MAX_BYTES,
+        path: Optional[str] = RERANK_SCORE_CACHE_PATH,
+        disk_max_bytes: int = RERANK_SCORE_CACHE_DISK_MAX_BYTES
+    ):
+        self.max_entries = min(max_entries, max_bytes // _ENTRY_BYTES)
+        self.max_bytes = max_bytes
+        self._lock = threading.Lock()
+        self._scores: "OrderedDict[str, float]" = OrderedDict()
+        self._disk = SQLiteCache(path, disk_max_bytes, table="rerank_scores") if path else None
+        self.hits = 0
+        self.misses = 0
+        self.evictions = 0
+
+    @staticmethod
+    def make_key(model: str, query: str, passage: str) -> str:
+        return hashlib.sha256(f"{model}\0{query}\0{passage}".encode("utf-8")).hexdigest()
+
+    def get_many(self, keys: List[str]) -> Dict[str, float]:
+        """Return the cached scores of the given keys; missing keys are left out."""
+        found = {}
+        with self._lock:
+            for key in keys:
+                score = self._scores.get(key)
+                if score is not None:
+                    self._scores.move_to_end(key)
+                    found[key] = score
+        if self._disk is not None:
+            missing = [key for key in keys if key not in found]
+            disk_found = {key: struct.unpack("<d", blob)[0] for key, blob in self._disk.get_many(missing).items()}
+            if disk_found:
+                self._put_memory(disk_found)
+                found.update(disk_found)
+        with self._lock:
+            self.hits += len(found)
+            self.misses += len(keys) - len(found)
+        return found
+
+    def put_many(self, scores: Dict[str, float]):
+        self._put_memory(scores)
+        if self._disk is not None:
+            self._disk.put_many({key: struct.pack("<d", score) for key, score in scores.items()})
+
+    def _put_memory(self, scores: Dict[str, float]):
+        with self._lock:
+            for key, score in scores.items():
+                self._scores[key] = score
+                self._scores.move_to_end(key)
+            while len(self._scores) > self.max_entries:
+                self._scores.popitem(last=False)
+                self.evictions += 1
+
+    def stats(self) -> Dict:
+        with self._lock:
+            total = self.hits + self.misses
+            stats = {
+                "entries": len(self._scores),
+                "max_entries": self.max_entries,
+                "bytes": len(self._scores) * _ENTRY_BYTES,
+                "max_bytes": self.max_bytes,
+                "hits": self.hits,
+                "misses": self.misses,
+                "hit_rate": self.hits / total if total else 0.0,
+                "evictions": self.evictions
+            }
+        if self._disk is not None:
+            stats["disk"] = self._disk.stats()
+        return stats
+
+
+_score_cache: Optional[ScoreCache] = None
+_score_cache_lock = threading.Lock()
+
+
+def get_score_cache() -> Optional[ScoreCache]:
+    """Return the process-wide score cache, or None if it is disabled or unavailable."""
+    global _score_cache
+    if not RERANK_SCORE_CACHE_ENABLED:
+        return None
+    if _score_cache is None:
+        with _score_cache_lock:
+            if _score_cache is None:
+                try:
+                    _score_cache = ScoreCache()
+                except Exception as e:
+                    logger.error(f"重排序分数缓存初始化失败，将不使用缓存: {str(e)}")
+                    return None
+    return _score_cache
+
+
+def cached_rerank(model: str = RERANK_MODEL_NAME):
+    """
+    为重排序函数加上分数缓存：命中的(查询, 文本)不再请求重排序服务，只把未命中的文本(去重后)发送打分，
+    再与缓存的分数合并、排序并截取top_k。
+
+    被装饰函数的签名须为 (query, top_k, sentences)，返回 [{"index", "sentence", "score"}]，
+    index 为文本在 sentences 中的位置；调用时可传入 `use_cache=False` 跳过缓存。
+    """
+    def prepare(query, sentences):
+        cache = get_score_cache()
+        if cache is None or not query or not query.strip() or not sentences \
+                or not all(isinstance(sentence, str) and sentence.strip() for sentence in sentences):
+            # 无效输入交给原函数处理，保持原有的报错行为
+            return None, None, None
+        keys = {sentence: cache.make_key(model, query, sentence) for sentence in sentences}
+        found = cache.get_many(list(keys.values()))
+        missing = [sentence for sentence, key in keys.items() if key not in found]
+        return cache, keys, (found, missing)
+
+    def merge(cache, keys, found, missing, top_k, sentences, results):
+        if missing:
+            if results is None:
+                return None
+            # older services return no index, fall back to the sentence text
+            computed = {
+                missing[result["index"]] if "index" in result else result["sentence"]: result["score"]
+                for result in results
+            }
+            if any(sentence not in computed for sentence in missing):
+                logger.error("重排序服务返回的结果不完整")
+                return None
+            cache.put_many({keys[sentence]: computed[sentence] for sentence in missing})
+            found = {**found, **{keys[sentence]: computed[sentence] for sentence in missing}}
+        merged = [
+            {"index": index, "sentence": sentence, "score": found[keys[sentence]]}
+            for index, sentence in enumerate(sentences)
+        ]
+        return sorted(merged, key=lambda x: x["score"], reverse=True)[:top_k]
+
+    def decorator(func: Callable):
+        if asyncio.iscoroutinefunction(func):
+            @functools.wraps(func)
+            async def async_wrapper(query: str, top_k: int, sentences: List[str], use_cache: bool = True):
+                cache, keys, lookup = prepare(query, sentences) if use_cache else (None, None, None)
+                if cache is None:
+                    return await func(query=query, top_k=top_k, sentences=sentences)
+                found, missing = lookup
+                results = await func(query=query, top_k=len(missing), sentences=missing) if missing else None
+                return merge(cache, keys, found, missing, top_k, sentences, results)
+            return async_wrapper
+
+        @functools.wraps(func)
+        def wrapper(query: str, top_k: int, sentences: List[str], use_cache: bool = True):
+            cache, keys, lookup = prepare(query, sentences) if use_cache else (None, None, None)
+            if cache is None:
+                return func(query=query, top_k=top_k, sentences=sentences)
+            found, missing = lookup
+            results = func(query=query, top_k=len(missing), sentences=missing) if missing else None
+            return merge(cache, keys, found, missing, top_k, sentences, results)
+        return wrapper
+    return decorator
+
+
+def score_cache_stats() -> dict:
+    cache = get_score_cache()
+    return cache.stats() if cache is not None else {"enabled": False}
@@ -1,8 +1,9 @@
 import json
 import sys
 import uvicorn
+from contextlib import asynccontextmanager
 from fastapi import FastAPI, UploadFile, File, HTTPException, Form, Depends, Request
-from fastapi.responses import JSONResponse
+from fastapi.responses import JSONResponse, StreamingResponse
 from typing import Optional, Union
 
 sys.path.append(".")
@@ -11,24 +12,40 @@ sys.path.append("..")
 from services.service import (
     PDFRequest, 
     ChunkRequest,
+    ChunkBatchRequest,
     IngestRequest,
     SearchRequest,
+    BatchSearchRequest,
     RerankerRequest,
+    ReindexRequest,
     authority_check,
+    get_service_stats,
     parse_pdf_file,
     parse_doc_file,
     process_chunk_text,
+    aprocess_chunk_batch,
     process_ingest_text,
-    process_search_text,
-    process_rerank_results
+    process_reindex,
+    aprocess_search_text,
+    process_search_text_batch,
+    aprocess_rerank_results
 )
+from services.executor import run_in_executor, start_process_pools, shutdown_executors
 from services.pipeline import (
     PipelineRequest, 
     run_pipeline
 )
 
+@asynccontextmanager
+async def lifespan(app: FastAPI):
+    # create the spawn-based process pools up front instead of lazily inside a request
+    start_process_pools()
+    yield
+    shutdown_executors()
+
+
 # FastAPI app
-app = FastAPI()
+app = FastAPI(lifespan=lifespan)
 
 
 def parse_pdf_request_json_data(data: str = Form(...)) -> PDFRequest:
@@ -72,7 +89,7 @@ async def extract_text(
 
     try:
         file_content = await file.read()
-        result = parse_pdf_file(file_content, request.parse_strategy)
+        result = await run_in_executor("parse", parse_pdf_file, file_content, request.parse_strategy)
         return JSONResponse(content=result)
     except ValueError as e:
         raise HTTPException(status_code=400, detail=str(e))
@@ -95,7 +112,7 @@ async def extract_text_doc(
 
     try:
         file_content = await file.read()
-        result = parse_doc_file(file_content, file.filename, request.parse_strategy)
+        result = await run_in_executor("parse", parse_doc_file, file_content, file.filename, request.parse_strategy)
         return JSONResponse(content=result)
     except ValueError as e:
         raise HTTPException(status_code=400, detail=str(e))
@@ -111,7 +128,7 @@ async def chunk_text(request: ChunkRequest):
     Chunk text into smaller pieces.
     """
     try:
-        result = process_chunk_text(request)
+        result = await run_in_executor("chunk", process_chunk_text, request)
         return JSONResponse(content=result)
     except ValueError as e:
         raise HTTPException(status_code=400, detail=str(e))
@@ -119,6 +136,21 @@ async def chunk_text(request: ChunkRequest):
         raise HTTPException(status_code=500, detail=f"Failed to chunk text: {str(e)}")
     
 
+@app.post("/chunk_batch")
+async def chunk_batch(request: ChunkBatchRequest):
+    """
+    Chunk many texts with a shared strategy in a process pool.
+    Results are streamed back as NDJSON, one line per text in input order.
+    """
+    try:
+        lines = await aprocess_chunk_batch(request)
+        return StreamingResponse(lines, media_type="application/x-ndjson")
+    except ValueError as e:
+        raise HTTPException(status_code=400, detail=str(e))
+    except Exception as e:
+        raise HTTPException(status_code=500, detail=f"Failed to chunk texts: {str(e)}")
+
+
 @app.post("/ingest_text")
 async def ingest_text(request: IngestRequest, fastapi_request: Request):
     """
@@ -129,7 +161,7 @@ async def ingest_text(request: IngestRequest, fastapi_request: Request):
         raise HTTPException(status_code=403, detail="Forbidden: IP not allowed.")
 
     try:
-        result = process_ingest_text(request)
+        result = await run_in_executor("database", process_ingest_text, request)
         return JSONResponse(content=result)
     except ValueError as e:
         raise HTTPException(status_code=400, detail=str(e))
@@ -149,7 +181,7 @@ async def search_text(request: SearchRequest, fastapi_request: Request):
         raise HTTPException(status_code=403, detail="Forbidden: IP not allowed.")
     
     try:
-        result = process_search_text(request)
+        result = await aprocess_search_text(request)
         return JSONResponse(content=result)
     except ValueError as e:
         raise HTTPException(status_code=400, detail=str(e))
@@ -159,6 +191,44 @@ async def search_text(request: SearchRequest, fastapi_request: Request):
         raise HTTPException(status_code=500, detail=f"Failed to search for text: {str(e)}")
 
 
+@app.post("/milvus_search_batch")
+async def search_text_batch(request: BatchSearchRequest, fastapi_request: Request):
+    """
+    Search for similar text of several queries in one request.
+    """
+    client_ip = fastapi_request.client.host
+    if not authority_check(client_ip):
+        raise HTTPException(status_code=403, detail="Forbidden: IP not allowed.")
+    
+    try:
+        result = await run_in_executor("database", process_search_text_batch, request)
+        return JSONResponse(content=result)
+    except ValueError as e:
+        raise HTTPException(status_code=400, detail=str(e))
+    except NotImplementedError as e:
+        raise HTTPException(status_code=501, detail=str(e))
+    except Exception as e:
+        raise HTTPException(status_code=500, detail=f"Failed to search for text: {str(e)}")
+
+
+@app.post("/milvus_reindex")
+async def reindex_collection(request: ReindexRequest, fastapi_request: Request):
+    """
+    Rebuild the vector index of an existing collection with another index type.
+    """
+    client_ip = fastapi_request.client.host
+    if not authority_check(client_ip):
+        raise HTTPException(status_code=403, detail="Forbidden: IP not allowed.")
+
+    try:
+        result = await run_in_executor("database", process_reindex, request)
+        return JSONResponse(content=result)
+    except ValueError as e:
+        raise HTTPException(status_code=400, detail=str(e))
+    except Exception as e:
+        raise HTTPException(status_code=500, detail=f"Failed to reindex collection: {str(e)}")
+
+
 @app.post("/rerank")
 async def rerank_results(request: RerankerRequest, fastapi_request: Request):
     """
@@ -169,7 +239,7 @@ async def rerank_results(request: RerankerRequest, fastapi_request: Request):
         raise HTTPException(status_code=403, detail="Forbidden: IP not allowed.")
 
     try:
-        result = process_rerank_results(request)
+        result = await aprocess_rerank_results(request)
         return JSONResponse(content=result)
     except ValueError as e:
         raise HTTPException(status_code=400, detail=str(e))
@@ -201,7 +271,9 @@ async def execute_pipeline(
             filename = file.filename
         
         # 运行pipeline, 传递所有参数给pipeline.py处理
-        result = run_pipeline(
+        result = await run_in_executor(
+            "pipeline",
+            run_pipeline,
             config=request_data.config, 
             file_content=file_content,
             filename=filename,
@@ -216,6 +288,18 @@ async def execute_pipeline(
         raise HTTPException(status_code=500, detail=f"Failed to execute pipeline: {str(e)}")
 
 
+@app.get("/service_stats")
+async def service_stats(fastapi_request: Request):
+    """
+    Report runtime counters of pooled resources and caches (e.g. manager pool hit/miss).
+    """
+    client_ip = fastapi_request.client.host
+    if not authority_check(client_ip):
+        raise HTTPException(status_code=403, detail="Forbidden: IP not allowed.")
+
+    return JSONResponse(content=get_service_stats())
+
+
 # Optional root endpoint
 @app.get("/")
 async def root():
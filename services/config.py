@@ -1,3 +1,5 @@
+import os
+
 # The IPs that allowed to access the services
 allowed_ips = [
     "10.100.167.66",
@@ -14,4 +16,40 @@ MINERU_API_URL = "http://127.0.0.1:8888/file_parse"
 OPENAI_API_KEY = ""
 
 MILVUS_RETRY_WAIT_TIME = 1
-MILVUS_RETRY_TIMES = 3
\ No newline at end of file
+MILVUS_RETRY_TIMES = 3
+
+# Maximum number of queries accepted by one batched search request
+SEARCH_BATCH_MAX_QUERIES = 256
+
+# Bounded executors used by the async endpoints to offload blocking work
+# pool name -> max worker threads
+EXECUTOR_POOL_SIZES = {
+    "parse": 4,
+    "chunk": 4,
+    "database": 16,
+    "pipeline": 4
+}
+# Extra jobs allowed to wait for a worker before callers are back-pressured
+EXECUTOR_QUEUE_SIZE = 64
+
+# Process pools for CPU-bound work that holds the GIL (e.g. batch chunking)
+# pool name -> max worker processes
+# (the pool of page-parallel PDF parsing is configured by PDF_PROCESS_POOL_SIZE in parser/config.py)
+PROCESS_POOL_SIZES = {
+    "chunk": os.cpu_count() or 4
+}
+# Texts of one /chunk_batch request submitted to the process pool ahead of the response
+CHUNK_BATCH_MAX_PENDING = 2 * PROCESS_POOL_SIZES["chunk"]
+
+# Pipeline retrieval fan-out: every retrieval config is searched concurrently
+RETRIEVAL_MAX_WORKERS = 16
+# Seconds to wait for one retrieval source, can be overridden by the "timeout" param of a config
+RETRIEVAL_TIMEOUT = 30
+# How results of several sources are merged: "rrf" (reciprocal rank fusion) or "score" (min-max normalized scores)
+RETRIEVAL_FUSION_METHOD = "rrf"
+RRF_K = 60
+
+# Also build the BM25 index of a collection when texts are ingested into Milvus,
+# so the collection can be searched with the "bm25" database strategy as well.
+# Off by default: indexing runs synchronously and adds to the ingest time.
+BM25_INDEX_ON_INGEST = False
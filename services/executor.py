@@ -0,0 +1,124 @@
+import asyncio
+import functools
+import threading
+from concurrent.futures import ThreadPoolExecutor, ProcessPoolExecutor
+from typing import Any, Callable, Dict
+
+from services.config import EXECUTOR_POOL_SIZES, EXECUTOR_QUEUE_SIZE, PROCESS_POOL_SIZES
+from parser.PDFParser import get_pdf_process_pool
+from utils import process_pool
+
+
+class BoundedExecutor:
+    """
+    A named thread pool for blocking calls made from async handlers.
+
+    At most `max_workers` jobs run at once and at most `max_workers + queue_size` jobs are
+    admitted; further callers wait on a semaphore instead of piling up in the unbounded
+    queue of ThreadPoolExecutor, so one kind of slow work (e.g. MinerU parsing) cannot
+    starve the threads used by searches.
+    """
+    def __init__(self, name: str, max_workers: int, queue_size: int = EXECUTOR_QUEUE_SIZE):
+        self.name = name
+        self.max_workers = max_workers
+        self.queue_size = queue_size
+        self._executor = ThreadPoolExecutor(max_workers=max_workers, thread_name_prefix=f"{name}-worker")
+        self._semaphore = None
+        self.running = 0
+        self.waiting = 0
+        self.completed = 0
+
+    def _get_semaphore(self) -> asyncio.Semaphore:
+        # created lazily so that it is bound to the running event loop
+        if self._semaphore is None:
+            self._semaphore = asyncio.Semaphore(self.max_workers + self.queue_size)
+        return self._semaphore
+
+    async def run(self, func: Callable, *args, **kwargs) -> Any:
+        loop = asyncio.get_running_loop()
+        semaphore = self._get_semaphore()
+        self.waiting += 1
+        try:
+            # a caller cancelled while queued (e.g. client disconnect) must not stay counted
+            await semaphore.acquire()
+        finally:
+            self.waiting -= 1
+        self.running += 1
+        try:
+            return await loop.run_in_executor(self._executor, functools.partial(func, *args, **kwargs))
+        finally:
+            self.running -= 1
+            self.completed += 1
+            semaphore.release()
+
+    def stats(self) -> Dict[str, int]:
+        return {
+            "max_workers": self.max_workers,
+            "queue_size": self.queue_size,
+            "admitted": self.running,
+            "waiting": self.waiting,
+            "completed": self.completed
+        }
+
+    def shutdown(self):
+        self._executor.shutdown(wait=False)
+
+
+_executors: Dict[str, BoundedExecutor] = {}
+_executors_lock = threading.Lock()
+
+
+def get_executor(pool_name: str) -> BoundedExecutor:
+    """Return the bounded executor registered under `pool_name` in EXECUTOR_POOL_SIZES."""
+    if pool_name not in EXECUTOR_POOL_SIZES:
+        raise ValueError(f"Unknown executor pool: '{pool_name}'. "
+                         f"Valid pools are: {', '.join(EXECUTOR_POOL_SIZES.keys())}")
+    if pool_name not in _executors:
+        with _executors_lock:
+            if pool_name not in _executors:
+                _executors[pool_name] = BoundedExecutor(pool_name, EXECUTOR_POOL_SIZES[pool_name])
+    return _executors[pool_name]
+
+
+async def run_in_executor(pool_name: str, func: Callable, *args, **kwargs) -> Any:
+    """
+    Run a blocking function in the named bounded executor without blocking the event loop.
+    """
+    return await get_executor(pool_name).run(func, *args, **kwargs)
+
+
+def get_process_pool(pool_name: str) -> ProcessPoolExecutor:
+    """
+    Return the process pool registered under `pool_name` in PROCESS_POOL_SIZES, for CPU-bound
+    work that would otherwise serialize on the GIL (see utils.process_pool). The pools are
+    created at application startup by `start_process_pools`.
+    """
+    if pool_name not in PROCESS_POOL_SIZES:
+        raise ValueError(f"Unknown process pool: '{pool_name}'. "
+                         f"Valid pools are: {', '.join(PROCESS_POOL_SIZES.keys())}")
+    return process_pool.get_process_pool(pool_name, PROCESS_POOL_SIZES[pool_name])
+
+
+def start_process_pools():
+    """
+    Create every process pool in PROCESS_POOL_SIZES and the pool of the page-parallel PDF
+    parser, called once when the application starts so spawning workers is not paid per request.
+    """
+    for pool_name in PROCESS_POOL_SIZES:
+        get_process_pool(pool_name)
+    get_pdf_process_pool()
+
+
+def shutdown_executors():
+    """Shut down the thread and process pools, called when the application stops."""
+    with _executors_lock:
+        for executor in _executors.values():
+            executor.shutdown()
+        _executors.clear()
+    process_pool.shutdown_process_pools()
+
+
+def executor_stats() -> Dict[str, Dict[str, int]]:
+    stats = {name: executor.stats() for name, executor in _executors.items()}
+    stats.update({f"process:{name}": pool_stats for name, pool_stats in process_pool.process_pool_stats().items()})
+    return stats
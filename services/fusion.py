@@ -0,0 +1,65 @@
+"""
+Merge ranked result lists of several retrieval sources into one ranking.
+
+Results are identified by their chunk text together with their metadata, so the same chunk
+found by several sources (e.g. Milvus and BM25 indexes of one collection, whose ids differ) is
+returned once with the names of the sources that found it, while distinct documents that
+happen to share a text stay separate.
+"""
+import json
+from typing import Dict, List, Tuple
+
+from services.config import RRF_K
+
+
+def _result_key(result: Dict) -> Tuple[str, str]:
+    return result.get("chunk", ""), json.dumps(result.get("metadata") or {}, sort_keys=True, ensure_ascii=False, default=str)
+
+
+def _fuse(ranked_lists: Dict[str, List[Dict]], contributions: Dict[str, List[float]]) -> List[Dict]:
+    fused: Dict[Tuple[str, str], Dict] = {}
+    for source, results in ranked_lists.items():
+        for result, contribution in zip(results, contributions[source]):
+            key = _result_key(result)
+            if key not in fused:
+                fused[key] = {**result, "fusion_score": 0.0, "sources": []}
+            fused[key]["fusion_score"] += contribution
+            fused[key]["sources"].append(source)
+    return sorted(fused.values(), key=lambda x: x["fusion_score"], reverse=True)
+
+
+def reciprocal_rank_fusion(ranked_lists: Dict[str, List[Dict]], k: int = RRF_K) -> List[Dict]:
+    """
+    Score every result by sum(1 / (k + rank)) over the sources that returned it. Only ranks
+    are used, so sources with incomparable scores (e.g. BM25 and cosine) can be merged.
+    """
+    contributions = {
+        source: [1.0 / (k + rank) for rank in range(1, len(results) + 1)]
+        for source, results in ranked_lists.items()
+    }
+    return _fuse(ranked_lists, contributions)
+
+
+def normalized_score_fusion(ranked_lists: Dict[str, List[Dict]]) -> List[Dict]:
+    """
+    Min-max normalize the "score" of each source to [0, 1] and sum the normalized scores.
+    """
+    contributions = {}
+    for source, results in ranked_lists.items():
+        scores = [float(result.get("score", 0.0)) for result in results]
+        low, high = (min(scores), max(scores)) if scores else (0.0, 0.0)
+        contributions[source] = [(score - low) / (high - low) if high > low else 1.0 for score in scores]
+    return _fuse(ranked_lists, contributions)
+
+
+FUSION_METHOD_MAP = {
+    "rrf": reciprocal_rank_fusion,
+    "score": normalized_score_fusion
+}
+
+
+def fuse_results(ranked_lists: Dict[str, List[Dict]], method: str = "rrf") -> List[Dict]:
+    if method not in FUSION_METHOD_MAP:
+        raise ValueError(f"Invalid fusion method: '{method}'. "
+                         f"Valid methods are: {', '.join(FUSION_METHOD_MAP.keys())}")
+    return FUSION_METHOD_MAP[method](ranked_lists)
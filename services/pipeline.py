@@ -1,6 +1,8 @@
 import os
 import json
+import time
 import uuid
+from concurrent.futures import ThreadPoolExecutor, TimeoutError as FutureTimeoutError
 from typing import Dict, List, Optional, Any, Union, Tuple
 from pydantic import BaseModel, Field
 from tenacity import RetryError
@@ -19,7 +21,10 @@ from services.service import (
     SearchRequest,
     RerankerRequest
 )
+from services.config import RETRIEVAL_MAX_WORKERS, RETRIEVAL_TIMEOUT, RETRIEVAL_FUSION_METHOD, BM25_INDEX_ON_INGEST
+from services.fusion import fuse_results
 from utils import aigc_api
+from database.milvus.config import EMBEDDING_CONCURRENCY
 
 
 class DocToTextConfig(BaseModel):
@@ -168,7 +173,11 @@ def ingest_text(config: List[IngestTextConfig], chunks: List[Dict]) -> bool:
             database_strategy=db_type,
             embedding_api=params.get("embedding_api", "openai_embedding_api"),
             expand_fields=params.get("expand_fields", []),
-            expand_fields_values=params.get("expand_fields_values", {})
+            expand_fields_values=params.get("expand_fields_values", {}),
+            index_type=params.get("index_type", "FLAT"),
+            index_params=params.get("index_params"),
+            embedding_concurrency=params.get("embedding_concurrency", EMBEDDING_CONCURRENCY),
+            bm25_index=params.get("bm25_index", BM25_INDEX_ON_INGEST)
         )
         
         try:
@@ -182,16 +191,43 @@ def ingest_text(config: List[IngestTextConfig], chunks: List[Dict]) -> bool:
     return success
 
 
-def retrieval(config: List[RetrievalConfig], query: str) -> List[Dict]:
-    """从向量数据库检索相关内容"""
+# 检索扇出使用的线程池，超时的检索在后台继续执行完毕，不阻塞流程
+_retrieval_executor = ThreadPoolExecutor(max_workers=RETRIEVAL_MAX_WORKERS, thread_name_prefix="retrieval")
+
+
+def _search_source(request: SearchRequest) -> Tuple[List[Dict], float, Optional[Exception]]:
+    start_time = time.perf_counter()
+    try:
+        result = process_search_text(request)
+        results = result.get("results")
+        if results is None:
+            # the database managers return None when the search itself failed
+            raise ValueError(f"{request.database_strategy} search on {request.collection_name} failed")
+        return results, time.perf_counter() - start_time, None
+    except Exception as e:
+        return [], time.perf_counter() - start_time, e
+
+
+def retrieval_with_stats(
+        config: List[RetrievalConfig],
+        query: str,
+        fusion_method: str = RETRIEVAL_FUSION_METHOD
+    ) -> Tuple[List[Dict], List[Dict]]:
+    """
+    并发检索所有检索配置，每个来源单独超时(params中的timeout，默认RETRIEVAL_TIMEOUT)，
+    失败或超时的来源不影响其它来源的结果；各来源的结果按fusion_method融合(只有一个来源时也是)，每条结果带有 fusion_score 与 sources。
+
+    Returns:
+        (检索结果, 每个来源的状态、结果数与耗时)
+    """
     logger.info(f"=== 运行检索，查询: {query} ===")
     
     if not config:
         logger.warning("未找到检索配置")
-        return []
-    
-    all_results = []
+        return [], []
     
+    start_time = time.perf_counter()
+    sources = []
     for retrieval_config in config:
         db_type = retrieval_config.type
         params = retrieval_config.params
@@ -201,18 +237,47 @@ def retrieval(config: List[RetrievalConfig], query: str) -> List[Dict]:
             query=query,
             top_k=params.get("top_k", 10),
             collection_name=params.get("collection_name", "default"),
-            database_strategy=db_type
+            database_strategy=db_type,
+            embedding_api=params.get("embedding_api", "openai_embedding_api"),
+            search_params=params.get("search_params")
         )
-        
+        source = f"{db_type}:{request.collection_name}"
+        if any(source == name for name, _, _ in sources):
+            source = f"{source}#{len(sources)}"
+        sources.append((
+            source,
+            params.get("timeout", RETRIEVAL_TIMEOUT),
+            _retrieval_executor.submit(_search_source, request)
+        ))
+
+    ranked_lists = {}
+    source_stats = []
+    for source, timeout, future in sources:
+        # 所有来源同时开始，按各自的截止时间等待
+        remaining = max(0.0, start_time + timeout - time.perf_counter())
         try:
-            # 直接调用service.py中的函数
-            result = process_search_text(request)
-            results = result.get("results", [])
-            logger.info(f"从 {db_type} 检索到 {len(results)} 条结果")
-            all_results.extend(results)
-        except RetryError as e:
-            logger.error(f"从 {db_type} 检索时错误: {str(e)}")
-    
+            results, latency, error = future.result(timeout=remaining)
+        except FutureTimeoutError:
+            future.cancel()
+            logger.error(f"从 {source} 检索超时({timeout}s)")
+            source_stats.append({"source": source, "status": "timeout", "count": 0, "latency": timeout})
+            continue
+        if error is not None:
+            logger.error(f"从 {source} 检索时错误: {str(error)}")
+            source_stats.append({"source": source, "status": "failed", "count": 0, "latency": latency, "error": str(error)})
+            continue
+        logger.info(f"从 {source} 检索到 {len(results)} 条结果，耗时 {latency:.3f}s")
+        ranked_lists[source] = results
+        source_stats.append({"source": source, "status": "success", "count": len(results), "latency": latency})
+
+    # 单个来源也经过融合，结果始终带有 fusion_score 和 sources 字段
+    all_results = fuse_results(ranked_lists, fusion_method)
+    return all_results, source_stats
+
+
+def retrieval(config: List[RetrievalConfig], query: str) -> List[Dict]:
+    """从向量数据库检索相关内容"""
+    all_results, _ = retrieval_with_stats(config, query)
     return all_results
 
 
@@ -326,7 +391,8 @@ def run_pipeline(
 
     # 步骤4: 检索（如果配置了）
     if config.retrieval:
-        search_results = retrieval(config.retrieval, query)
+        search_results, source_stats = retrieval_with_stats(config.retrieval, query)
+        results["retrieval_sources"] = source_stats
         results["search_results"] = search_results
         results["search_results_count"] = len(search_results)
         
@@ -1,18 +1,22 @@
 import json
-import uuid
-import os
 import time
+import asyncio
+from collections import deque
 from loguru import logger
-from typing import Type, List, Dict, Optional, Union, Literal, Tuple
-from pydantic import BaseModel
+from typing import Type, List, Dict, Optional, Union, Literal, Tuple, Iterator, AsyncIterator
+from pydantic import BaseModel, model_validator
 from tenacity import RetryError, retry, stop_after_attempt, wait_fixed
 from services.config import (
     MILVUS_RETRY_WAIT_TIME, 
-    MILVUS_RETRY_TIMES
+    MILVUS_RETRY_TIMES,
+    SEARCH_BATCH_MAX_QUERIES,
+    CHUNK_BATCH_MAX_PENDING,
+    BM25_INDEX_ON_INGEST
 )
 from parser.PDFParser import (
     PDFParser, 
     PyPDF2Parser,
+    ParallelPyPDF2Parser,
     minerUParser
 )
 from parser.MarkdownParser import (
@@ -30,8 +34,16 @@ from chunking.codeChunker import PythonChunker
 from chunking.htmlChunker import HTMLChunker
 from chunking.markdownChunker import MarkdownChunker
 from database.baseManager import BaseManager
-from database.es.esManager import ESManager
+from database.es.esManager import ESManager, get_es_manager
 from database.milvus.milvusManager import MilvusEmbeddingManager
+from database.milvus.managerPool import get_manager_pool
+from database.bm25.bm25Manager import BM25Manager, get_bm25_manager
+from database.milvus.searchCache import search_cache_stats
+from database.milvus.config import EMBEDDING_CONCURRENCY
+from services.executor import get_executor, get_process_pool, executor_stats
+from utils.embedding_cache import embedding_cache_stats
+from parser.parseCache import get_parse_cache, parse_cache_stats
+from rerank.scoreCache import score_cache_stats
 from rerank.baseReranker import BaseReranker
 from rerank.bgem3v2Reranker import BGEM3V2Reranker
 
@@ -41,10 +53,8 @@ class PDFRequest(BaseModel):
     parse_strategy: str
 
 
-class ChunkRequest(BaseModel):
-    text: str
+class ChunkParams(BaseModel):
     chunk_strategy: str
-    title: str = ""
     
     # 通用参数
     min_chunk_size: Optional[int] = 100
@@ -67,6 +77,8 @@ class ChunkRequest(BaseModel):
         ("h3", "Subsection")
     ]
     return_each_element: Optional[bool] = False
+    # HTML解析后端: "html.parser"(BeautifulSoup) 或 "lxml"(C解析器，速度更快)
+    html_parser_backend: Optional[str] = "html.parser"
     
     # MarkdownChunker
     markdown_headers_to_split_on: Optional[List[Tuple[str, str]]] = [
@@ -85,6 +97,17 @@ class ChunkRequest(BaseModel):
     format_chunk_flag: bool = False
 
 
+class ChunkRequest(ChunkParams):
+    text: str
+    title: str = ""
+
+
+class ChunkBatchRequest(ChunkParams):
+    texts: List[str]
+    # 与 texts 一一对应，默认为空标题
+    titles: Optional[List[str]] = None
+
+
 class IngestRequest(BaseModel):
     chunks_with_metadata: List[Dict]
     batch_size_limit: int
@@ -93,6 +116,26 @@ class IngestRequest(BaseModel):
     embedding_api: str = "openai_embedding_api"
     expand_fields: Optional[List[Dict]] = []
     expand_fields_values: Optional[Dict] = {}
+    # 向量索引类型及构建参数，仅在创建collection时生效
+    index_type: str = "FLAT"
+    index_params: Optional[Dict] = None
+    # 并发嵌入请求数，嵌入与插入流水线执行
+    embedding_concurrency: int = EMBEDDING_CONCURRENCY
+    # 导入Milvus时同时写入同名collection的BM25倒排索引
+    bm25_index: bool = BM25_INDEX_ON_INGEST
+
+
+def _check_search_filter(database_strategy: str, filter: Optional[Union[str, Dict]]):
+    """
+    Milvus takes a boolean filter expression (str), Elasticsearch a query DSL object (dict).
+    """
+    if filter is None:
+        return
+    if database_strategy == "es" and not isinstance(filter, dict):
+        raise ValueError("The es database strategy expects the filter as an Elasticsearch query DSL object, "
+                         "e.g. {\"term\": {\"source\": \"report\"}}, not a string expression")
+    if database_strategy == "milvus" and not isinstance(filter, str):
+        raise ValueError("The milvus database strategy expects the filter as a boolean expression string")
 
 
 class SearchRequest(BaseModel):
@@ -100,7 +143,40 @@ class SearchRequest(BaseModel):
     top_k: int
     collection_name: str
     database_strategy: str
-    filter: Optional[str] = None
+    embedding_api: str = "openai_embedding_api"
+    # milvus: 布尔表达式字符串；es: Elasticsearch 查询DSL对象
+    filter: Optional[Union[str, Dict]] = None
+    # 覆盖索引默认查询参数，如 {"ef": 128} 或 {"nprobe": 32}
+    search_params: Optional[Dict] = None
+
+    @model_validator(mode="after")
+    def check_filter(self):
+        _check_search_filter(self.database_strategy, self.filter)
+        return self
+
+
+class BatchSearchRequest(BaseModel):
+    queries: List[str]
+    top_k: int
+    collection_name: str
+    database_strategy: str
+    embedding_api: str = "openai_embedding_api"
+    filter: Optional[Union[str, Dict]] = None
+    search_params: Optional[Dict] = None
+
+    @model_validator(mode="after")
+    def check_filter(self):
+        _check_search_filter(self.database_strategy, self.filter)
+        return self
+
+
+class ReindexRequest(BaseModel):
+    collection_name: str
+    database_strategy: str = "milvus"
+    embedding_api: str = "openai_embedding_api"
+    index_type: str
+    index_params: Optional[Dict] = None
+    search_params: Optional[Dict] = None
 
 
 class RerankerRequest(BaseModel):
@@ -113,6 +189,7 @@ class RerankerRequest(BaseModel):
 ##############################StrategyMapping##############################
 PDFPARSE_STRATEGY_MAP = {
     "pypdf2": PyPDF2Parser,
+    "pypdf2_parallel": ParallelPyPDF2Parser,
     "minerU": minerUParser
 }
 
@@ -134,8 +211,8 @@ CHUNK_STRATEGY_MAP = {
 
 DATABASE_STRATEGY_MAP = {
     "milvus": MilvusEmbeddingManager,
-    # TODO
-    "es": ...
+    "bm25": BM25Manager,
+    "es": ESManager
 }
 
 RERANK_STRATEGY_MAP = {
@@ -143,6 +220,20 @@ RERANK_STRATEGY_MAP = {
 }
 
 
+def get_service_stats() -> Dict:
+    """
+    Collect runtime counters of the process-wide pools and caches.
+    """
+    return {
+        "milvus_manager_pool": get_manager_pool().stats(),
+        "executors": executor_stats(),
+        "embedding_cache": embedding_cache_stats(),
+        "search_cache": search_cache_stats(),
+        "parse_cache": parse_cache_stats(),
+        "rerank_score_cache": score_cache_stats()
+    }
+
+
 def authority_check(client_ip: str):
     # only allow registered ip to access
     if client_ip not in allowed_ips:
@@ -161,19 +252,13 @@ def parse_pdf_file(file_content: bytes, parse_strategy: str) -> Dict:
     
     pdf_parser_obj: Type[PDFParser] = PDFPARSE_STRATEGY_MAP[parse_strategy]
 
-    pdf_path = f"./__upload_file__/{uuid.uuid4().hex}.pdf"
-    if not os.path.exists("./__upload_file__"):
-        os.makedirs("./__upload_file__")
-    with open(pdf_path, "wb") as f:
-        f.write(file_content)
-
-    pdf_parser_instance = pdf_parser_obj(pdf_path=pdf_path)
+    # parse the uploaded bytes in memory, parsers that need a file on disk spill it themselves
+    pdf_parser_instance = pdf_parser_obj(file_content)
     start_time = time.time()
     pdf_parser_instance.read_content()
     extracted_text = pdf_parser_instance.extract_text()
     end_time = time.time()
 
-    os.remove(pdf_path)
     return {
         "status": "success",
         "extracted_text": extracted_text,
@@ -191,19 +276,13 @@ def parse_markdown_file(file_content: bytes, parse_strategy: str) -> Dict:
     
     markdown_parser_obj: Type[MarkdownParser] = MARKDOWN_PARSER_STRATEGY_MAP[parse_strategy]
 
-    markdown_path = f"./__upload_file__/{uuid.uuid4().hex}.md"
-    if not os.path.exists("./__upload_file__"):
-        os.makedirs("./__upload_file__")
-    with open(markdown_path, "wb") as f:
-        f.write(file_content)
-
-    markdown_parser_instance = markdown_parser_obj(markdown_path=markdown_path) 
+    # parse the uploaded bytes in memory, parsers that need a file on disk spill it themselves
+    markdown_parser_instance = markdown_parser_obj(file_content)
     start_time = time.time()
     markdown_parser_instance.read_content()
     extracted_text = markdown_parser_instance.extract_text()
     end_time = time.time()
 
-    os.remove(markdown_path)
     return {
         "status": "success",
         "extracted_text": extracted_text,
@@ -221,19 +300,13 @@ def parse_word_file(file_content: bytes, parse_strategy: str) -> Dict:
     
     word_parser_obj: Type[WordParser] = WORD_PARSER_STRATEGY_MAP[parse_strategy]
 
-    word_path = f"./__upload_file__/{uuid.uuid4().hex}.docx"
-    if not os.path.exists("./__upload_file__"):
-        os.makedirs("./__upload_file__")
-    with open(word_path, "wb") as f:
-        f.write(file_content)
-
-    word_parser_instance = word_parser_obj(word_path=word_path)
+    # parse the uploaded bytes in memory, parsers that need a file on disk spill it themselves
+    word_parser_instance = word_parser_obj(file_content)
     start_time = time.time()
     word_parser_instance.read_content()
     extracted_text = word_parser_instance.extract_text()
     end_time = time.time()
 
-    os.remove(word_path)
     return {
         "status": "success",
         "extracted_text": extracted_text,
@@ -241,20 +314,44 @@ def parse_word_file(file_content: bytes, parse_strategy: str) -> Dict:
     }
     
 
-def parse_doc_file(file_content: bytes, filename: str, parse_strategy: str) -> Dict:
+def parse_doc_file(file_content: bytes, filename: str, parse_strategy: str, use_cache: bool = True) -> Dict:
     """
     Extract text from an uploaded document file using a specific parse strategy.
+
+    Results are cached by (content hash, file type, parse strategy, parser version), so an
+    unchanged re-upload returns the previously extracted text without parsing it again.
     """
     file_type = filename.split(".")[-1]
 
     if file_type == "pdf":
-        return parse_pdf_file(file_content, parse_strategy)
+        parse_func, strategy_map = parse_pdf_file, PDFPARSE_STRATEGY_MAP
     elif file_type == "md":
-        return parse_markdown_file(file_content, parse_strategy)
+        parse_func, strategy_map = parse_markdown_file, MARKDOWN_PARSER_STRATEGY_MAP
     elif file_type == "docx":
-        return parse_word_file(file_content, parse_strategy)
+        parse_func, strategy_map = parse_word_file, WORD_PARSER_STRATEGY_MAP
     else:
         raise ValueError(f"Unsupported file type: {file_type}")
+
+    parse_cache = get_parse_cache() if use_cache and parse_strategy in strategy_map else None
+    if parse_cache is None:
+        return parse_func(file_content, parse_strategy)
+
+    start_time = time.time()
+    cache_key = parse_cache.make_key(file_content, file_type, parse_strategy, strategy_map[parse_strategy].VERSION)
+    extracted_text = parse_cache.get_text(cache_key)
+    if extracted_text is not None:
+        return {
+            "status": "success",
+            "extracted_text": extracted_text,
+            "time_taken": time.time() - start_time,
+            "cached": True
+        }
+
+    result = parse_func(file_content, parse_strategy)
+    # an empty text is more likely a failed parse (e.g. MinerU) than an empty document, do not keep it
+    if result.get("status") == "success" and result.get("extracted_text"):
+        parse_cache.put_text(cache_key, result["extracted_text"])
+    return result
     
 
 def process_chunk_text(request: ChunkRequest) -> List[Dict]:
@@ -327,6 +424,8 @@ def process_chunk_text(request: ChunkRequest) -> List[Dict]:
             init_kwargs["html_headers_to_split_on"] = request.html_headers_to_split_on
         if request.return_each_element is not None:
             init_kwargs["return_each_element"] = request.return_each_element
+        if request.html_parser_backend is not None:
+            init_kwargs["parser_backend"] = request.html_parser_backend
             
         chunker_instance = HTMLChunker(**init_kwargs)
     
@@ -367,6 +466,81 @@ def process_chunk_text(request: ChunkRequest) -> List[Dict]:
     }
 
 
+def _build_chunk_requests(request: ChunkBatchRequest) -> List[ChunkRequest]:
+    """
+    Validate a batch chunk request and split it into one ChunkRequest per text.
+    """
+    if request.chunk_strategy not in CHUNK_STRATEGY_MAP:
+        raise ValueError(f"Invalid chunk strategy: '{request.chunk_strategy}'. "
+                  f"Valid strategies are: {', '.join(CHUNK_STRATEGY_MAP.keys())}")
+    if request.titles is not None and len(request.titles) != len(request.texts):
+        raise ValueError(f"titles must have the same length as texts: {len(request.titles)} != {len(request.texts)}")
+
+    chunk_params = request.model_dump(exclude={"texts", "titles"})
+    titles = request.titles if request.titles is not None else [""] * len(request.texts)
+    return [ChunkRequest(text=text, title=title, **chunk_params) for text, title in zip(request.texts, titles)]
+
+
+def _chunk_batch_item(index: int, request: ChunkRequest) -> Dict:
+    """
+    Chunk one text of a batch in a worker process, reporting failures instead of raising.
+    """
+    start_time = time.time()
+    result = {"index": index, "title": request.title}
+    try:
+        result.update(process_chunk_text(request))
+    except Exception as e:
+        result.update({"status": "failed", "message": f"Failed to chunk text: {str(e)}", "data": []})
+    result["time_taken"] = time.time() - start_time
+    return result
+
+
+def _submit_chunk_batch(request: ChunkBatchRequest):
+    """
+    Submit the texts of a batch to the chunk process pool lazily, with a bounded number of
+    texts in flight, and yield the futures in input order.
+    """
+    chunk_requests = _build_chunk_requests(request)
+    process_pool = get_process_pool("chunk")
+
+    pending = deque()
+    for index, chunk_request in enumerate(chunk_requests):
+        pending.append(process_pool.submit(_chunk_batch_item, index, chunk_request))
+        if len(pending) >= CHUNK_BATCH_MAX_PENDING:
+            yield pending.popleft()
+    while pending:
+        yield pending.popleft()
+
+
+def process_chunk_batch(request: ChunkBatchRequest) -> Iterator[Dict]:
+    """
+    Chunk many texts with a shared strategy in the chunk process pool.
+    Results are yielded in input order, each with its index, title and time taken.
+    """
+    for future in _submit_chunk_batch(request):
+        yield future.result()
+
+
+async def aprocess_chunk_batch(request: ChunkBatchRequest) -> AsyncIterator[str]:
+    """
+    Async variant of process_chunk_batch yielding NDJSON lines without blocking the event loop.
+    """
+    futures = _submit_chunk_batch(request)
+    # validate the request before the response starts streaming
+    first_future = next(futures, None)
+    return _iter_chunk_batch_lines(first_future, futures)
+
+
+async def _iter_chunk_batch_lines(first_future, futures) -> AsyncIterator[str]:
+    if first_future is None:
+        return
+    result = await asyncio.wrap_future(first_future)
+    yield json.dumps(result, ensure_ascii=False) + "\n"
+    for future in futures:
+        result = await asyncio.wrap_future(future)
+        yield json.dumps(result, ensure_ascii=False) + "\n"
+
+
 @retry(stop=stop_after_attempt(MILVUS_RETRY_TIMES), wait=wait_fixed(MILVUS_RETRY_WAIT_TIME))
 def process_ingest_text(request: IngestRequest) -> Dict:
     """
@@ -383,16 +557,23 @@ def process_ingest_text(request: IngestRequest) -> Dict:
     embedding_api = request.embedding_api
     expand_fields = request.expand_fields
     expand_fields_values = request.expand_fields_values
+    index_type = request.index_type
+    index_params = request.index_params
     
     # create and initialize the ingest instance 
     ingest_obj: Type[BaseManager] = DATABASE_STRATEGY_MAP[database_strategy]
     if issubclass(ingest_obj, MilvusEmbeddingManager):
-        ingest_instance = ingest_obj(collection_name=collection_name, embedding_api=embedding_api, expand_fields=expand_fields)
+        ingest_instance = get_manager_pool().get_manager(
+            collection_name=collection_name, 
+            embedding_api=embedding_api, 
+            expand_fields=expand_fields,
+            index_type=index_type,
+            index_params=index_params
+        )
+    elif issubclass(ingest_obj, BM25Manager):
+        ingest_instance = get_bm25_manager(collection_name)
     elif issubclass(ingest_obj, ESManager):
-        # TODO
-        # need to implement the initialization of es manager
-        ingest_instance = None
-        raise NotImplementedError("ES Manager not implemented yet")
+        ingest_instance = get_es_manager(collection_name, embedding_api)
     else:
         logger.error(f"ingest_obj is not one of the database manager subclass")
         raise ValueError("Invalid database manager class")
@@ -406,57 +587,117 @@ def process_ingest_text(request: IngestRequest) -> Dict:
 
     # ingest the data
     status = "success"
+    stage_timings = {}
     start_time = time.time()
     try:
-        ingest_return = ingest_instance.ingest(
-            texts_with_metadata=documents, 
-            batch_size_limit=batch_size_limit,
-            **expand_fields_values
-        )
+        if isinstance(ingest_instance, MilvusEmbeddingManager):
+            ingest_return, stage_timings = ingest_instance.ingest_with_stats(
+                texts_with_metadata=documents, 
+                batch_size_limit=batch_size_limit,
+                embedding_concurrency=request.embedding_concurrency,
+                **expand_fields_values
+            )
+        elif isinstance(ingest_instance, ESManager):
+            ingest_return, stage_timings = ingest_instance.ingest_with_stats(
+                texts_with_metadata=documents, 
+                batch_size_limit=batch_size_limit,
+                **expand_fields_values
+            )
+        else:
+            ingest_return = ingest_instance.ingest(
+                texts_with_metadata=documents, 
+                batch_size_limit=batch_size_limit,
+                **expand_fields_values
+            )
     except Exception as e:
         logger.error(f"Error occurred during the ingestion process: {str(e)}")
         status = "failed"
         raise
+    finally:
+        _release_instance(ingest_instance)
+
+    failed_batches = stage_timings.pop("failed_batches", [])
+    if failed_batches:
+        logger.warning(f"{len(failed_batches)} batches failed during ingestion into {collection_name}")
+
+    if isinstance(ingest_instance, MilvusEmbeddingManager) and request.bm25_index:
+        # only index the batches that made it into Milvus, so both indexes hold the same chunks
+        failed_batch_indexes = {batch["batch_index"] for batch in failed_batches}
+        bm25_documents = [
+            doc for index, doc in enumerate(documents)
+            if index // batch_size_limit not in failed_batch_indexes
+        ]
+        # a failure here must not fail (and retry) the Milvus ingest that already succeeded
+        try:
+            get_bm25_manager(collection_name).ingest(texts_with_metadata=bm25_documents, batch_size_limit=batch_size_limit)
+        except Exception as e:
+            logger.error(f"Error occurred while building the BM25 index of {collection_name}: {str(e)}")
     end_time = time.time()
 
+    ingested = stage_timings.get("records", len(chunks_with_metadata))
+    if ingested < len(chunks_with_metadata):
+        message = f"Ingested {ingested} of {len(chunks_with_metadata)} text chunks into database."
+    else:
+        message = f"Successfully ingested {len(chunks_with_metadata)} text chunks into database."
+
     return {
         "status": status,
-        "message": f"Successfully ingested {len(chunks_with_metadata)} text chunks into database.",
+        "message": message,
         "ingest_return": json.dumps(ingest_return),
+        "failed_batches": failed_batches,
+        "stage_timings": stage_timings,
         "time_taken": end_time - start_time
     }
 
-@retry(stop=stop_after_attempt(MILVUS_RETRY_TIMES), wait=wait_fixed(MILVUS_RETRY_WAIT_TIME))
-def process_search_text(request: SearchRequest) -> Dict:
+def _get_search_instance(request: Union[SearchRequest, BatchSearchRequest]) -> BaseManager:
     """
-    Search for similar text in the database.
+    Validate the search request and create (or reuse) the database manager for it.
     """
     if request.database_strategy not in DATABASE_STRATEGY_MAP:
         raise ValueError(f"Invalid database strategy: '{request.database_strategy}'. "
                   f"Valid strategies are: {', '.join(DATABASE_STRATEGY_MAP.keys())}")
-    
-    query = request.query
-    top_k = request.top_k
-    collection_name = request.collection_name
-    database_strategy = request.database_strategy
-    filter = request.filter
 
-     # create and initialize the search instance 
-    search_obj: Type[BaseManager] = DATABASE_STRATEGY_MAP[database_strategy]
+    # create and initialize the search instance 
+    search_obj: Type[BaseManager] = DATABASE_STRATEGY_MAP[request.database_strategy]
     if issubclass(search_obj, MilvusEmbeddingManager):
-        search_instance = search_obj(collection_name=collection_name)
+        search_instance = get_manager_pool().get_manager(
+            collection_name=request.collection_name, 
+            embedding_api=request.embedding_api
+        )
+    elif issubclass(search_obj, BM25Manager):
+        search_instance = get_bm25_manager(request.collection_name)
     elif issubclass(search_obj, ESManager):
-        # TODO
-        # need to implement the initialization of es manager
-        search_instance = None
-        raise NotImplementedError("ES Manager not implemented yet")
+        search_instance = get_es_manager(request.collection_name, request.embedding_api)
     else:
         logger.error(f"search_obj is not one of the database manager subclass")
         raise ValueError("Invalid database manager class")
-    
-    search_params = {"query": query,"top_k": top_k}
-    if filter is not None:
-        search_params.update({"filter": filter})
+    return search_instance
+
+
+def _release_instance(instance: BaseManager):
+    """
+    Hand a pooled Milvus manager back to the pool once the request is done with it.
+    """
+    if isinstance(instance, MilvusEmbeddingManager):
+        get_manager_pool().release(instance)
+
+
+def _build_search_params(request: SearchRequest) -> Dict:
+    search_params = {"query": request.query, "top_k": request.top_k}
+    if request.filter is not None:
+        search_params.update({"filter": request.filter})
+    if request.search_params:
+        search_params.update({"search_params": request.search_params})
+    return search_params
+
+
+@retry(stop=stop_after_attempt(MILVUS_RETRY_TIMES), wait=wait_fixed(MILVUS_RETRY_WAIT_TIME))
+def process_search_text(request: SearchRequest) -> Dict:
+    """
+    Search for similar text in the database.
+    """
+    search_instance = _get_search_instance(request)
+    search_params = _build_search_params(request)
 
     # search the data
     status = "success"
@@ -467,50 +708,154 @@ def process_search_text(request: SearchRequest) -> Dict:
         logger.error(f"Error occurred during the search process: {str(e)}")
         status = "failed"
         raise
+    finally:
+        _release_instance(search_instance)
     end_time = time.time()
 
     return {
         "status": status,
-        "query": query,
+        "query": request.query,
         "results": results,
         "time_taken": end_time - start_time
     }
 
 
-def process_rerank_results(request: RerankerRequest) -> Dict:
+@retry(stop=stop_after_attempt(MILVUS_RETRY_TIMES), wait=wait_fixed(MILVUS_RETRY_WAIT_TIME))
+async def aprocess_search_text(request: SearchRequest) -> Dict:
     """
-    Re-rank search results using a specified strategy.
+    Search for similar text in the database without blocking the event loop.
+    The query embedding is awaited and the blocking database calls run in the bounded
+    "database" executor.
     """
-    query = request.query
-    top_k = request.top_k
-    rerank_strategy = request.rerank_strategy
-    chunks_with_metadata = request.chunks_with_metadata
+    database_executor = get_executor("database")
+    # creating a manager on a pool miss connects to Milvus, keep it off the event loop
+    search_instance = await database_executor.run(_get_search_instance, request)
+    search_params = _build_search_params(request)
+
+    status = "success"
+    start_time = time.time()
+    try:
+        if isinstance(search_instance, MilvusEmbeddingManager):
+            results = await search_instance.asearch(executor=database_executor, **search_params)
+        else:
+            results = await database_executor.run(search_instance.search, **search_params)
+    except Exception as e:
+        logger.error(f"Error occurred during the search process: {str(e)}")
+        status = "failed"
+        raise
+    finally:
+        _release_instance(search_instance)
+    end_time = time.time()
+
+    return {
+        "status": status,
+        "query": request.query,
+        "results": results,
+        "time_taken": end_time - start_time
+    }
+
+
+@retry(stop=stop_after_attempt(MILVUS_RETRY_TIMES), wait=wait_fixed(MILVUS_RETRY_WAIT_TIME))
+def process_search_text_batch(request: BatchSearchRequest) -> Dict:
+    """
+    Search for similar text of several queries with one embedding call and one database search.
+    """
+    if not request.queries:
+        raise ValueError("queries cannot be empty")
+    if len(request.queries) > SEARCH_BATCH_MAX_QUERIES:
+        raise ValueError(f"Too many queries: {len(request.queries)}, at most {SEARCH_BATCH_MAX_QUERIES} are allowed")
+
+    search_instance = _get_search_instance(request)
+    search_params = {"top_k": request.top_k}
+    if request.filter is not None:
+        search_params.update({"filter": request.filter})
+    if request.search_params:
+        search_params.update({"search_params": request.search_params})
+
+    status = "success"
+    start_time = time.time()
+    try:
+        if isinstance(search_instance, MilvusEmbeddingManager):
+            batch_results = search_instance.search_many(request.queries, **search_params)
+        else:
+            batch_results = [search_instance.search(query, **search_params) for query in request.queries]
+    except Exception as e:
+        logger.error(f"Error occurred during the batch search process: {str(e)}")
+        status = "failed"
+        raise
+    finally:
+        _release_instance(search_instance)
+    end_time = time.time()
+
+    return {
+        "status": status,
+        "results": [
+            {"query": query, "results": results}
+            for query, results in zip(request.queries, batch_results)
+        ],
+        "time_taken": end_time - start_time
+    }
 
-    if rerank_strategy not in RERANK_STRATEGY_MAP:
-        raise ValueError(f"Invalid rerank strategy: '{rerank_strategy}'. "
+
+def process_reindex(request: ReindexRequest) -> Dict:
+    """
+    Rebuild the vector index of an existing collection with another index type.
+    """
+    if request.database_strategy != "milvus":
+        raise ValueError(f"Reindex is only supported for the milvus database strategy, got: '{request.database_strategy}'")
+
+    manager_pool = get_manager_pool()
+    start_time = time.time()
+    with manager_pool.lease(
+        collection_name=request.collection_name,
+        embedding_api=request.embedding_api
+    ) as manager:
+        reindex_return = manager.reindex(
+            index_type=request.index_type,
+            index_params=request.index_params,
+            search_params=request.search_params
+        )
+    end_time = time.time()
+
+    # other pooled managers of this collection still hold the old search params
+    manager_pool.invalidate(request.collection_name)
+
+    return {
+        "status": "success",
+        "message": f"Successfully reindexed collection {request.collection_name} with {request.index_type}",
+        "reindex_return": reindex_return,
+        "time_taken": end_time - start_time
+    }
+
+
+def _get_reranker_instance(request: RerankerRequest) -> Tuple[BaseReranker, List[str]]:
+    """
+    Validate the rerank request and create the reranker instance and candidate sentences.
+    """
+    if request.rerank_strategy not in RERANK_STRATEGY_MAP:
+        raise ValueError(f"Invalid rerank strategy: '{request.rerank_strategy}'. "
                   f"Valid strategies are: {', '.join(RERANK_STRATEGY_MAP.keys())}")
 
-    sentences = [chunk_data.get("chunk", "") for chunk_data in chunks_with_metadata]
+    sentences = [chunk_data.get("chunk", "") for chunk_data in request.chunks_with_metadata or []]
     
     if not sentences:
         raise ValueError("chunks_with_metadata must be provided and non-empty")
 
     # Create and initialize the reranker instance
-    reranker_obj: Type[BaseReranker] = RERANK_STRATEGY_MAP[rerank_strategy]
+    reranker_obj: Type[BaseReranker] = RERANK_STRATEGY_MAP[request.rerank_strategy]
     if issubclass(reranker_obj, BGEM3V2Reranker):
         reranker_instance = BGEM3V2Reranker()
     else:
         logger.error(f"reranker_obj is not one of the reranker subclass")
         raise ValueError("Invalid reranker class")
+    return reranker_instance, sentences
 
-    # Perform re-ranking
-    start_time = time.time()
-    reranked_results = reranker_instance.rerank(query=query, top_k=top_k, sentences=sentences)
-    end_time = time.time()
 
+def _format_rerank_results(reranked_results: Optional[List[Dict]], chunks_with_metadata: Optional[List[Dict]]) -> List[Dict]:
     # Format the results
     if reranked_results:
         formatted_results = []
+        chunk_by_text = None
         for i, result in enumerate(reranked_results):
             formatted_result = {
                 "rank": i + 1, 
@@ -518,22 +863,64 @@ def process_rerank_results(request: RerankerRequest) -> Dict:
                 "score": result.get("score", 0.0)
             }
             
-            # 如果提供了chunks_with_metadata，添加对应的metadata
+            # 如果提供了chunks_with_metadata，按重排序结果中的候选下标取回对应的metadata
             if chunks_with_metadata:
-                # 在chunks_with_metadata中查找匹配的chunk
-                for chunk_data in chunks_with_metadata:
-                    if chunk_data.get("chunk") == result.get("sentence"):
-                        # 将metadata添加到结果中
-                        formatted_result["metadata"] = chunk_data.get("metadata", {})
-                        break
+                index = result.get("index")
+                if index is not None and 0 <= index < len(chunks_with_metadata):
+                    chunk_data = chunks_with_metadata[index]
+                else:
+                    # 结果中没有下标时(旧版重排序服务)按文本匹配，相同文本取第一个
+                    if chunk_by_text is None:
+                        chunk_by_text = {}
+                        for candidate in chunks_with_metadata:
+                            chunk_by_text.setdefault(candidate.get("chunk"), candidate)
+                    chunk_data = chunk_by_text.get(result.get("sentence"))
+                if chunk_data is not None:
+                    # 将metadata以及向量检索的id和分数添加到结果中
+                    formatted_result["metadata"] = chunk_data.get("metadata", {})
+                    if "id" in chunk_data:
+                        formatted_result["id"] = chunk_data["id"]
+                    if "score" in chunk_data:
+                        formatted_result["search_score"] = chunk_data["score"]
                         
             formatted_results.append(formatted_result)
     else:
         formatted_results = []
+    return formatted_results
+
+
+def process_rerank_results(request: RerankerRequest) -> Dict:
+    """
+    Re-rank search results using a specified strategy.
+    """
+    reranker_instance, sentences = _get_reranker_instance(request)
+
+    # Perform re-ranking
+    start_time = time.time()
+    reranked_results = reranker_instance.rerank(query=request.query, top_k=request.top_k, sentences=sentences)
+    end_time = time.time()
 
     return {
         "status": "success",
-        "query": query,
-        "reranked_results": formatted_results,
+        "query": request.query,
+        "reranked_results": _format_rerank_results(reranked_results, request.chunks_with_metadata),
         "time_taken": end_time - start_time
-    }
\ No newline at end of file
+    }
+
+
+async def aprocess_rerank_results(request: RerankerRequest) -> Dict:
+    """
+    Re-rank search results using a specified strategy without blocking the event loop.
+    """
+    reranker_instance, sentences = _get_reranker_instance(request)
+
+    start_time = time.time()
+    reranked_results = await reranker_instance.arerank(query=request.query, top_k=request.top_k, sentences=sentences)
+    end_time = time.time()
+
+    return {
+        "status": "success",
+        "query": request.query,
+        "reranked_results": _format_rerank_results(reranked_results, request.chunks_with_metadata),
+        "time_taken": end_time - start_time
+    }
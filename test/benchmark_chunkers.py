@@ -0,0 +1,92 @@
+"""
+Throughput benchmark (MB/s) of RecursiveChunker on large Chinese/English corpora and of
+MarkdownChunker on MinerU-like markdown with 1000+ pages.
+
+Usage:
+    python test/benchmark_chunkers.py
+    python test/benchmark_chunkers.py --corpus-mb 16 --chunk-sizes 200 1000 --pages 3000
+"""
+import sys
+import time
+import random
+import argparse
+
+sys.path.append(".")
+sys.path.append("..")
+
+from chunking.textChunker import RecursiveChunker
+from chunking.markdownChunker import MarkdownChunker
+
+CHINESE_SENTENCES = [
+    "这是一个较长的测试文本。", "它包含多个段落和句子，每个段落都有不同的内容！",
+    "有些句子很长，有些很短；", "这个文本用于测试分块功能？", "我们希望看到它被正确地分割成多个块、并且速度足够快。"
+]
+ENGLISH_SENTENCES = [
+    "The quick brown fox jumps over the lazy dog.", "Each paragraph has different content, of varying length!",
+    "Some sentences are long; others are short.", "Is the text split into chunks correctly?",
+    "This corpus is used to measure chunking throughput."
+]
+
+
+def build_corpus(sentences, size: int, seed: int = 42) -> str:
+    rng = random.Random(seed)
+    parts, length = [], 0
+    while length < size:
+        part = rng.choice(sentences) + rng.choice(["", "", " ", "\n", "\n\n"])
+        parts.append(part)
+        length += len(part)
+    return "".join(parts)
+
+
+def build_mineru_markdown(num_pages: int) -> str:
+    page = (
+        "## 第{0}章 标题\n\n" + "这是一段正文内容，包含一些数字 123 和英文 words。" * 20 + "\n\n"
+        "### 小节 {0}.1\n\n| 表头 | 值 |\n|---|---|\n| a | 1 |\n\n![](images/{0}.jpg)\n\n"
+        + "Body text of the section. " * 30 + "\n\n"
+    )
+    return "# 报告\n\n" + "".join(page.format(i) for i in range(num_pages))
+
+
+def bench_recursive(name: str, corpus: str, chunk_sizes):
+    size_mb = len(corpus.encode("utf-8")) / 1024 / 1024
+    for chunk_size in chunk_sizes:
+        chunker = RecursiveChunker(chunk_size=chunk_size)
+        start_time = time.perf_counter()
+        documents = chunker.chunk(text=corpus, title=name)
+        elapsed = time.perf_counter() - start_time
+        print(f"{name} chunk_size={chunk_size}: {size_mb:.1f}MB, {len(documents)} chunks, {size_mb / elapsed:.1f} MB/s")
+
+
+def bench_markdown(num_pages: int, chunk_limit: int):
+    markdown_text = build_mineru_markdown(num_pages)
+    size_mb = len(markdown_text.encode("utf-8")) / 1024 / 1024
+    chunker = MarkdownChunker(
+        markdown_headers_to_split_on=[("#", "h1"), ("##", "h2"), ("###", "h3"), ("####", "h4")],
+        markdown_chunk_limit=chunk_limit
+    )
+    start_time = time.perf_counter()
+    sections = chunker.split_text(markdown_text)
+    split_elapsed = time.perf_counter() - start_time
+    start_time = time.perf_counter()
+    documents = chunker.chunk(text=markdown_text, title="MinerU")
+    chunk_elapsed = time.perf_counter() - start_time
+    print(f"MinerU markdown ({num_pages} pages): {size_mb:.1f}MB, {len(sections)} sections, "
+          f"split_text {size_mb / split_elapsed:.1f} MB/s, chunk {size_mb / chunk_elapsed:.1f} MB/s ({len(documents)} chunks)")
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Chunker throughput benchmark")
+    parser.add_argument("--corpus-mb", type=float, default=4, help="Size of each RecursiveChunker corpus in MB of characters")
+    parser.add_argument("--chunk-sizes", nargs="+", type=int, default=[200, 1000])
+    parser.add_argument("--pages", type=int, default=1500, help="Number of MinerU-like markdown pages")
+    parser.add_argument("--markdown-chunk-limit", type=int, default=1000)
+    args = parser.parse_args()
+
+    corpus_size = int(args.corpus_mb * 1024 * 1024)
+    bench_recursive("中文语料", build_corpus(CHINESE_SENTENCES, corpus_size), args.chunk_sizes)
+    bench_recursive("English corpus", build_corpus(ENGLISH_SENTENCES, corpus_size), args.chunk_sizes)
+    bench_markdown(args.pages, args.markdown_chunk_limit)
+
+
+if __name__ == "__main__":
+    main()
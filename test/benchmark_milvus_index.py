@@ -0,0 +1,144 @@
+"""
+Recall-vs-latency benchmark of Milvus vector index types against FLAT on a synthetic corpus.
+
+Usage:
+    python test/benchmark_milvus_index.py --uri http://127.0.0.1:19530 --num-vectors 200000
+    python test/benchmark_milvus_index.py --index-types HNSW IVF_FLAT --ef 32 64 128
+
+Milvus Lite (the default --uri) only builds FLAT indexes, use a remote Milvus server to
+measure the ANN index types.
+"""
+import sys
+import time
+import argparse
+
+sys.path.append(".")
+sys.path.append("..")
+
+import numpy as np
+from loguru import logger
+from pymilvus import MilvusClient, DataType
+
+from database.milvus.config import INDEX_TYPE_DEFAULTS, VECTOR_METRIC_TYPE, VECTOR_INDEX_NAME
+
+
+def make_corpus(num_vectors: int, num_queries: int, dim: int, num_clusters: int = 256, seed: int = 42):
+    """Generate clustered, L2-normalized vectors so that IP search behaves like cosine search."""
+    rng = np.random.default_rng(seed)
+    centers = rng.standard_normal((num_clusters, dim)).astype(np.float32)
+    labels = rng.integers(0, num_clusters, size=num_vectors)
+    corpus = centers[labels] + 0.3 * rng.standard_normal((num_vectors, dim)).astype(np.float32)
+    corpus /= np.linalg.norm(corpus, axis=1, keepdims=True)
+
+    query_labels = rng.integers(0, num_clusters, size=num_queries)
+    queries = centers[query_labels] + 0.3 * rng.standard_normal((num_queries, dim)).astype(np.float32)
+    queries /= np.linalg.norm(queries, axis=1, keepdims=True)
+    return corpus, queries
+
+
+def build_collection(client: MilvusClient, name: str, corpus: np.ndarray, index_type: str, batch_size: int = 5000):
+    if client.has_collection(collection_name=name):
+        client.drop_collection(collection_name=name)
+
+    schema = MilvusClient.create_schema(auto_id=False)
+    schema.add_field(field_name="id", datatype=DataType.INT64, is_primary=True)
+    schema.add_field(field_name="vector", datatype=DataType.FLOAT_VECTOR, dim=corpus.shape[1])
+    client.create_collection(collection_name=name, schema=schema)
+
+    for start in range(0, len(corpus), batch_size):
+        batch = corpus[start:start + batch_size]
+        client.insert(
+            collection_name=name,
+            data=[{"id": start + i, "vector": vector.tolist()} for i, vector in enumerate(batch)]
+        )
+
+    index_params = MilvusClient.prepare_index_params()
+    index_params.add_index(
+        field_name="vector",
+        index_type=index_type,
+        index_name=VECTOR_INDEX_NAME,
+        metric_type=VECTOR_METRIC_TYPE,
+        params=INDEX_TYPE_DEFAULTS[index_type]["build_params"]
+    )
+    start_time = time.perf_counter()
+    client.create_index(collection_name=name, index_params=index_params)
+    client.load_collection(collection_name=name)
+    return time.perf_counter() - start_time
+
+
+def run_queries(client: MilvusClient, name: str, queries: np.ndarray, top_k: int, search_params: dict):
+    latencies, results = [], []
+    for query in queries:
+        start_time = time.perf_counter()
+        hits = client.search(
+            collection_name=name,
+            data=[query.tolist()],
+            limit=top_k,
+            search_params={"metric_type": VECTOR_METRIC_TYPE, "params": search_params}
+        )
+        latencies.append(time.perf_counter() - start_time)
+        results.append([hit["id"] for hit in hits[0]])
+    return np.array(latencies) * 1000, results
+
+
+def recall_at_k(results, ground_truth, top_k: int) -> float:
+    return float(np.mean([len(set(r[:top_k]) & set(g[:top_k])) / top_k for r, g in zip(results, ground_truth)]))
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Milvus index recall vs latency benchmark")
+    parser.add_argument("--uri", type=str, default="./index_benchmark.db", help="Milvus URI or Milvus Lite db file")
+    parser.add_argument("--token", type=str, default="root:Milvus")
+    parser.add_argument("--num-vectors", type=int, default=100000)
+    parser.add_argument("--num-queries", type=int, default=200)
+    parser.add_argument("--dim", type=int, default=1024)
+    parser.add_argument("--top-k", type=int, default=10)
+    parser.add_argument("--index-types", nargs="+", default=["HNSW", "IVF_FLAT", "IVF_PQ", "DISKANN"])
+    parser.add_argument("--ef", nargs="+", type=int, default=[16, 64, 256], help="HNSW ef values to sweep")
+    parser.add_argument("--nprobe", nargs="+", type=int, default=[8, 32, 128], help="IVF nprobe values to sweep")
+    parser.add_argument("--search-list", nargs="+", type=int, default=[50, 100, 200], help="DISKANN search_list values to sweep")
+    args = parser.parse_args()
+
+    if args.uri.startswith("http"):
+        client = MilvusClient(uri=args.uri, token=args.token)
+    else:
+        client = MilvusClient(uri=args.uri)
+
+    logger.info(f"Generating {args.num_vectors} x {args.dim} synthetic vectors and {args.num_queries} queries")
+    corpus, queries = make_corpus(args.num_vectors, args.num_queries, args.dim)
+
+    sweeps = {
+        "HNSW": [{"ef": max(ef, args.top_k)} for ef in args.ef],
+        "IVF_FLAT": [{"nprobe": nprobe} for nprobe in args.nprobe],
+        "IVF_PQ": [{"nprobe": nprobe} for nprobe in args.nprobe],
+        "DISKANN": [{"search_list": max(sl, args.top_k)} for sl in args.search_list]
+    }
+
+    build_time = build_collection(client, "bench_flat", corpus, "FLAT")
+    flat_latencies, ground_truth = run_queries(client, "bench_flat", queries, args.top_k, {})
+    rows = [("FLAT", "{}", build_time, 1.0, np.percentile(flat_latencies, 50), np.percentile(flat_latencies, 95))]
+
+    for index_type in args.index_types:
+        name = f"bench_{index_type.lower()}"
+        try:
+            build_time = build_collection(client, name, corpus, index_type)
+        except Exception as e:
+            logger.warning(f"Skipping {index_type}: {str(e)}")
+            continue
+        for search_params in sweeps.get(index_type, [INDEX_TYPE_DEFAULTS[index_type]["search_params"]]):
+            latencies, results = run_queries(client, name, queries, args.top_k, search_params)
+            rows.append((
+                index_type, str(search_params), build_time,
+                recall_at_k(results, ground_truth, args.top_k),
+                np.percentile(latencies, 50), np.percentile(latencies, 95)
+            ))
+        client.drop_collection(collection_name=name)
+    client.drop_collection(collection_name="bench_flat")
+
+    print(f"\n{'index':<10}{'search_params':<24}{'build(s)':>10}{f'recall@{args.top_k}':>12}{'p50(ms)':>10}{'p95(ms)':>10}")
+    for index_type, params, build, recall, p50, p95 in rows:
+        print(f"{index_type:<10}{params:<24}{build:>10.2f}{recall:>12.4f}{p50:>10.2f}{p95:>10.2f}")
+
+
+if __name__ == "__main__":
+    main()
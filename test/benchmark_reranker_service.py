@@ -0,0 +1,62 @@
+"""
+Throughput benchmark of the reranker service under concurrent clients.
+
+Usage:
+    python test/benchmark_reranker_service.py --url http://127.0.0.1:12212/rerank --concurrency 32
+
+Every client sends its own queries, so no pair is scored twice during a run. The service also
+keeps scores across runs, start it with RERANKER_SCORE_CACHE_SIZE=0 to disable the score cache
+and measure the model rather than cache hits.
+"""
+import sys
+import time
+import asyncio
+import argparse
+
+sys.path.append(".")
+sys.path.append("..")
+
+import httpx
+import numpy as np
+
+from services.config import RERANKER_API_URL
+
+
+async def run_client(
+    client: httpx.AsyncClient, url: str, client_id: int, num_requests: int, num_sentences: int, latencies: list
+):
+    sentences = [f"候选文档 {i}: 检索增强生成系统先召回相关文档，再用重排序模型为每个文档打分。" for i in range(num_sentences)]
+    for i in range(num_requests):
+        # unique per client and request, concurrent clients must not hit each other's cached scores
+        query = f"什么是重排序模型 {client_id}-{i}"
+        start_time = time.perf_counter()
+        response = await client.post(url, json={"query": query, "top_k": 5, "sentences": sentences})
+        response.raise_for_status()
+        latencies.append(time.perf_counter() - start_time)
+
+
+async def main():
+    parser = argparse.ArgumentParser(description="Reranker service throughput benchmark")
+    parser.add_argument("--url", type=str, default=RERANKER_API_URL)
+    parser.add_argument("--concurrency", type=int, default=32)
+    parser.add_argument("--requests-per-client", type=int, default=10)
+    parser.add_argument("--sentences", type=int, default=10, help="Sentences per request")
+    args = parser.parse_args()
+
+    latencies = []
+    async with httpx.AsyncClient(timeout=600) as client:
+        start_time = time.perf_counter()
+        await asyncio.gather(*[
+            run_client(client, args.url, client_id, args.requests_per_client, args.sentences, latencies)
+            for client_id in range(args.concurrency)
+        ])
+        elapsed = time.perf_counter() - start_time
+
+    latencies = np.array(latencies) * 1000
+    print(f"clients={args.concurrency} requests={len(latencies)} pairs/request={args.sentences}")
+    print(f"throughput: {len(latencies) / elapsed:.1f} req/s, {len(latencies) * args.sentences / elapsed:.1f} pairs/s")
+    print(f"latency: p50={np.percentile(latencies, 50):.1f}ms p95={np.percentile(latencies, 95):.1f}ms")
+
+
+if __name__ == "__main__":
+    asyncio.run(main())
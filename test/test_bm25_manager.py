@@ -0,0 +1,65 @@
+import sys
+import unittest
+sys.path.append(".")
+sys.path.append("..")
+
+import os
+import tempfile
+
+from chunking.baseChunker import Document
+from database.bm25.bm25Manager import BM25Manager
+from database.bm25.tokenizer import tokenize
+
+
+class TestBM25Manager(unittest.TestCase):
+    def setUp(self):
+        """建立临时的BM25索引"""
+        self.temp_dir = tempfile.TemporaryDirectory()
+        self.manager = BM25Manager(collection_name="test_collection", db_dir=self.temp_dir.name)
+        self.manager.ingest([
+            Document(chunk="2020年CPI上涨2.5%，涨幅比上年回落0.4个百分点。", metadata={"page": 1}),
+            Document(chunk="贵州茅台(600519.SH)发布2023年年报，营业收入同比增长18%。", metadata={"page": 2}),
+            Document(chunk="The Federal Reserve raised rates while CPI inflation cooled in 2023.", metadata={"page": 3}),
+        ], batch_size_limit=2)
+
+    def tearDown(self):
+        self.manager.close()
+        self.temp_dir.cleanup()
+
+    def test_tokenize(self):
+        """测试中文二元组与英文数字的切分"""
+        self.assertEqual(tokenize("茅台(600519.SH)"), ["茅台", "600519.sh", "600519", "sh"])
+        self.assertEqual(tokenize("CPI上涨"), ["cpi", "上涨"])
+
+    def test_search_exact_terms(self):
+        """测试股票代码、中文短语的精确匹配"""
+        results = self.manager.search("600519", top_k=3)
+        self.assertEqual(len(results), 1)
+        self.assertEqual(results[0]["metadata"], {"page": 2})
+
+        results = self.manager.search("2020年CPI上涨了多少", top_k=3)
+        self.assertEqual(results[0]["metadata"], {"page": 1})
+        self.assertEqual(set(results[0].keys()), {"chunk", "metadata", "score", "id"})
+
+    def test_search_no_match(self):
+        """测试没有匹配词时返回空列表"""
+        self.assertEqual(self.manager.search("无关查询", top_k=3), [])
+        self.assertIsNone(self.manager.search("   ", top_k=3))
+
+    def test_collection_name_and_missing_index(self):
+        """测试非法的collection名称被拒绝，检索未导入的collection不创建索引文件"""
+        with self.assertRaises(ValueError):
+            BM25Manager(collection_name="../../escaped", db_dir=self.temp_dir.name)
+
+        manager = BM25Manager(collection_name="never_ingested", db_dir=self.temp_dir.name)
+        self.assertEqual(manager.search("CPI", top_k=3), [])
+        self.assertEqual(manager.count(), 0)
+        self.assertFalse(os.path.exists(manager.db_path))
+
+        # 关闭后再次使用时重新打开索引
+        self.manager.close()
+        self.assertEqual(self.manager.count(), 3)
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -3,7 +3,11 @@ import unittest
 sys.path.append(".")
 sys.path.append("..")
 
+import io
+
 from chunking.textChunker import PunctuationChunker, RecursiveChunker
+from chunking.markdownChunker import MarkdownChunker
+from chunking.htmlChunker import HTMLChunker
 
 class TestChunkers(unittest.TestCase):
     def setUp(self):
@@ -73,6 +77,33 @@ class TestChunkers(unittest.TestCase):
         self.assertEqual(len(document.chunks), 1)
         self.assertEqual(document.chunks[0], short_text)
 
+    def test_punctuation_chunker_boundaries(self):
+        """测试 PunctuationChunker 在开头/结尾标点、连续标点、无标点时的切分结果"""
+        chunker = PunctuationChunker()
+        cases = [
+            # 文本以标点开头
+            ("。开头就是标点，然后是正文内容。再来一句话！", 5, 10, 2,
+             ["。开头就是标点，", "点，然后是正文内容。", "容。再来一句话！"]),
+            # 唯一的标点在文本末尾
+            ("正文内容一二三四五六七八九十。", 5, 10, 2, ["正文内容一二三四五六七八九十。"]),
+            # 连续的标点
+            ("第一句。。。第二句！！？第三句，，结尾。", 3, 6, 1, ["第一句。", "。。。第二句！！？第三句，", "，，结尾。"]),
+            # 没有标点，整个文本作为一个块
+            ("没有任何标点符号的一段很长很长的文本内容", 5, 10, 2, ["没有任何标点符号的一段很长很长的文本内容"]),
+            # 重叠不小于块长度时仍然向前推进
+            ("ab。cd。ef。gh。", 1, 5, 4, ["ab。", "b。", "。cd。", "cd。", "d。", "。ef。", "ef。", "f。", "。gh。"]),
+        ]
+        for text, min_chunk_size, max_chunk_size, overlap_chunk_size, expected in cases:
+            documents = chunker.chunk(
+                text=text,
+                title="边界测试",
+                min_chunk_size=min_chunk_size,
+                max_chunk_size=max_chunk_size,
+                overlap_chunk_size=overlap_chunk_size
+            )
+            self.assertEqual([doc.chunk for doc in documents], expected, text)
+            self.assertTrue(all(doc.metadata == {"title": "边界测试"} for doc in documents))
+
     def test_recursive_chunker_basic(self):
         """测试 RecursiveChunker 的基本功能"""
         chunker = RecursiveChunker(chunk_size=50)
@@ -140,5 +171,92 @@ class TestChunkers(unittest.TestCase):
         for chunk in document.chunks:
             self.assertFalse(any(sep in chunk for sep in ["。", "！", "？"]))
 
+    def test_recursive_chunker_known_outputs(self):
+        """测试 RecursiveChunker 在各 keep_separator 模式下带重叠的切分结果与已知结果一致"""
+        text = "第一段第一句。第一段第二句！\n\n第二段很长很长的一句话，需要继续切分。结尾\n第三行"
+        expected = {
+            True: ["第一段第一句。第一段第", "第一段第二句！\n第二段很", "第二段很长很长的一句话", "的一句话，需要继续",
+                   "需要继续切分。结尾", "结尾\n第三行", "第三行"],
+            False: ["第一段第一句第一段第", "段第一句第一段第二句！第二段很", "第二句！第二段很长很长的一句话需要继续",
+                    "的一句话需要继续切分结尾", "继续切分结尾第三行", "结尾第三行"],
+            "start": ["第一段第一句", "段第一句。第一段第二句！", "第二句！\n第二段很长很长的一句话", "长的一句话",
+                      "话，需要继续切分", "继续切分。结尾", "结尾\n第三行"],
+            "end": ["第一段第一句。第一段第", "第一段第二句！\n第二段很", "第二段很长很长的一句话", "的一句话，需要继续",
+                    "需要继续切分。结尾", "结尾\n第三行", "第三行"],
+        }
+        for keep_separator, chunks in expected.items():
+            chunker = RecursiveChunker(
+                chunk_size=12,
+                overlap_chunk_size=4,
+                separators=["\n\n", "\n", "。", "，", ""],
+                keep_separator=keep_separator
+            )
+            documents = chunker.chunk(text=text, title="已知结果")
+            self.assertEqual([doc.chunk for doc in documents], chunks, keep_separator)
+            self.assertTrue(all(doc.metadata == {"title": "已知结果"} for doc in documents))
+
+        # 自定义长度函数走子串切分，结果与按偏移量切分一致
+        chunker = RecursiveChunker(chunk_size=12, overlap_chunk_size=4, separators=["\n\n", "\n", "。", "，", ""],
+                                   length_function=lambda s: len(s))
+        self.assertEqual([doc.chunk for doc in chunker.chunk(text=text)], expected[True])
+
+    def test_markdown_chunker_iter_chunks(self):
+        """测试 MarkdownChunker 的流式分块结果与 chunk 一致"""
+        markdown_text = "# 标题一\n\n" + self.long_text + "\n## 标题二\n\n" + self.sample_text
+        chunker = MarkdownChunker(
+            markdown_headers_to_split_on=[("#", "h1"), ("##", "h2")],
+            markdown_chunk_limit=50
+        )
+        documents = chunker.chunk(text=markdown_text, title="流式测试")
+
+        # 以文件句柄和任意切开的文本片段两种方式输入
+        pieces = [markdown_text[i:i + 7] for i in range(0, len(markdown_text), 7)]
+        for source in (io.StringIO(markdown_text), iter(pieces)):
+            streamed = list(chunker.iter_chunks(source, title="流式测试"))
+            self.assertEqual([doc.chunk for doc in streamed], [doc.chunk for doc in documents])
+            self.assertEqual([doc.metadata for doc in streamed], [doc.metadata for doc in documents])
+
+    def test_html_chunker_lxml_backend(self):
+        """测试 lxml 后端：规范的 HTML 和散落文本与 html.parser 结果一致，不规范的 HTML 下 chunk 与 iter_chunks 一致"""
+        headers = [("h1", "Chapter"), ("h2", "Section")]
+        well_formed = ("<html><head><title>t</title></head><body><h1>A</h1><p>a</p>"
+                       "<div><h2>B</h2><p>b</p></div><p>c</p></body></html>")
+        self.assertEqual(HTMLChunker(headers).parser_backend, "html.parser")
+        for return_each_element in (False, True):
+            reference = HTMLChunker(headers, return_each_element).chunk(well_formed)
+            documents = HTMLChunker(headers, return_each_element, parser_backend="lxml").chunk(well_formed)
+            self.assertEqual([(d.chunk, d.metadata) for d in documents], [(d.chunk, d.metadata) for d in reference])
+
+        malformed = [
+            "<html><body><p>x<h2>H</h2>y</p><p>after</p></body></html>",
+            "<html><body>intro<h1>T</h1>mid<p>para</p>end</body></html>",
+            "<body><h1>T</h1><!-- c -->after comment<p>p</p></body>",
+        ]
+        for html in malformed:
+            for return_each_element in (False, True):
+                chunker = HTMLChunker(headers, return_each_element, parser_backend="lxml")
+                documents = chunker.chunk(html)
+                pieces = [html[i:i + 5] for i in range(0, len(html), 5)]
+                streamed = list(chunker.iter_chunks(iter(pieces)))
+                self.assertEqual([(d.chunk, d.metadata) for d in streamed], [(d.chunk, d.metadata) for d in documents])
+
+        # <body> 中散落的文本与 html.parser 一样合并为最前面的一个节点，不会丢失
+        loose_text = [
+            "<body>Intro text<h1>T</h1>Body text after header<p>para</p>",
+            malformed[1],
+            "<html><head><title>x</title></head><body><h1>A</h1><p>a</p><!-- note -->tail"
+            "<div><h2>B</h2>d<p>b</p></div>last</body></html>",
+        ]
+        for html in loose_text:
+            for return_each_element in (False, True):
+                reference = HTMLChunker(headers, return_each_element).chunk(html, title="t")
+                chunker = HTMLChunker(headers, return_each_element, parser_backend="lxml")
+                pieces = [html[i:i + 3] for i in range(0, len(html), 3)]
+                for documents in (chunker.chunk(html, title="t"), list(chunker.iter_chunks(iter(pieces), title="t"))):
+                    self.assertEqual([(d.chunk, d.metadata) for d in documents],
+                                     [(d.chunk, d.metadata) for d in reference])
+        documents = HTMLChunker(headers, parser_backend="lxml").chunk(loose_text[0])
+        self.assertEqual((documents[0].chunk, documents[0].metadata), ("Intro text Body text after header", {}))
+
 if __name__ == '__main__':
     unittest.main() 
\ No newline at end of file
@@ -0,0 +1,143 @@
+import sys
+import unittest
+from unittest import mock
+sys.path.append(".")
+sys.path.append("..")
+
+import hashlib
+import numpy as np
+
+from chunking.baseChunker import Document
+from database.es import esManager
+from database.es.config import VECTOR_DIM
+from database.es.esManager import ESManager
+
+
+def fake_embedding(texts):
+    """按词的哈希生成确定性的词袋向量，含相同词的文本余弦相似度更高"""
+    vectors = []
+    for text in texts:
+        vector = np.zeros(VECTOR_DIM, dtype=np.float32)
+        for word in text.lower().split():
+            vector[int(hashlib.md5(word.encode("utf-8")).hexdigest(), 16) % VECTOR_DIM] += 1.0
+        vectors.append(vector.tolist())
+    return vectors
+
+
+class FakeIndices:
+    def __init__(self, es):
+        self.es = es
+
+    def exists(self, index):
+        return index in self.es.docs
+
+    def create(self, index, mappings=None, **kwargs):
+        self.es.docs[index] = {}
+        self.es.mappings[index] = mappings
+
+    def refresh(self, index):
+        self.es.refreshes += 1
+
+
+class FakeElasticsearch:
+    """本地的 Elasticsearch 替身：内存中保存文档，knn 搜索用暴力余弦相似度实现"""
+    def __init__(self):
+        self.docs = {}
+        self.mappings = {}
+        self.refreshes = 0
+        self.search_requests = []
+        self.indices = FakeIndices(self)
+
+    def search(self, index, knn, size, source=None, **kwargs):
+        self.search_requests.append(knn)
+        query = np.asarray(knn["query_vector"])
+        term_filter = knn.get("filter", {}).get("term", {})
+        hits = []
+        for doc_id, doc in self.docs[index].items():
+            if any(doc.get(field) != value for field, value in term_filter.items()):
+                continue
+            vector = np.asarray(doc["vector"])
+            norm = np.linalg.norm(query) * np.linalg.norm(vector)
+            cosine = float(query @ vector / norm) if norm else 0.0
+            hits.append({"_id": doc_id, "_score": (1 + cosine) / 2, "_source": {key: doc[key] for key in source}})
+        hits.sort(key=lambda hit: hit["_score"], reverse=True)
+        return {"hits": {"hits": hits[:min(size, knn["k"])]}}
+
+
+def fake_streaming_bulk(client, actions, chunk_size=500, raise_on_error=True, **kwargs):
+    """按 streaming_bulk 的返回格式逐条写入文档"""
+    for action in actions:
+        index = client.docs[action["_index"]]
+        doc_id = str(len(index))
+        index[doc_id] = action["_source"]
+        yield True, {"index": {"_index": action["_index"], "_id": doc_id, "status": 201}}
+
+
+class TestESManager(unittest.TestCase):
+    def setUp(self):
+        """使用本地替身建立索引并写入文档"""
+        patchers = [
+            mock.patch.dict(esManager.EMBEDDING_API_MAP, {"fake_embedding_api": fake_embedding}),
+            mock.patch.object(esManager, "streaming_bulk", fake_streaming_bulk)
+        ]
+        for patcher in patchers:
+            patcher.start()
+            self.addCleanup(patcher.stop)
+
+        self.client = FakeElasticsearch()
+        self.manager = ESManager(collection_name="test_collection", embedding_api="fake_embedding_api", client=self.client)
+        self.result = self.manager.ingest((
+            Document(chunk=text, metadata={"page": page})
+            for page, text in enumerate([
+                "cpi inflation rose in march",
+                "the central bank raised interest rates",
+                "quarterly revenue of the company grew",
+                "unemployment fell to a record low"
+            ], start=1)
+        ), batch_size_limit=3, source="report")
+
+    def test_create_index(self):
+        """测试索引映射使用 dense_vector 并开启 knn 索引"""
+        vector_mapping = self.client.mappings["test_collection"]["properties"]["vector"]
+        self.assertEqual(vector_mapping["type"], "dense_vector")
+        self.assertEqual(vector_mapping["dims"], VECTOR_DIM)
+        self.assertTrue(vector_mapping["index"])
+
+    def test_ingest(self):
+        """测试流式写入返回插入数量与 id，并刷新索引"""
+        self.assertEqual(self.result[0]["insert_count"], 4)
+        self.assertEqual(len(self.result[0]["ids"]), 4)
+        self.assertEqual(self.client.refreshes, 1)
+        self.assertEqual(self.client.docs["test_collection"]["0"]["source"], "report")
+
+    def test_ingest_failed_embedding(self):
+        """测试嵌入失败的批次被跳过并计入 failed_count 与 failed_batches"""
+        def flaky_embedding(texts):
+            return None if any("broken" in text for text in texts) else fake_embedding(texts)
+
+        with mock.patch.object(self.manager, "embedding", flaky_embedding):
+            result, stats = self.manager.ingest_with_stats(
+                [Document(chunk=text, metadata={}) for text in ["ok one", "broken two", "ok three"]],
+                batch_size_limit=2
+            )
+        self.assertEqual(result[0]["insert_count"], 1)
+        self.assertEqual(result[0]["failed_count"], 2)
+        self.assertEqual(stats["records"], 1)
+        self.assertEqual([(batch["batch_index"], batch["size"]) for batch in stats["failed_batches"]], [(0, 2)])
+
+    def test_search(self):
+        """测试 knn 搜索返回与 Milvus 一致的结果格式"""
+        results = self.manager.search("interest rates", top_k=2)
+        self.assertEqual(len(results), 2)
+        self.assertEqual(results[0]["metadata"], {"page": 2})
+        self.assertEqual(set(results[0].keys()), {"chunk", "metadata", "score", "id"})
+        self.assertGreaterEqual(self.client.search_requests[-1]["num_candidates"], 2)
+
+        results = self.manager.search("interest rates", top_k=2, filter={"term": {"source": "other"}})
+        self.assertEqual(results, [])
+        with self.assertRaises(ValueError):
+            self.manager.search("interest rates", top_k=2, filter="source == 'report'")
+
+
+if __name__ == "__main__":
+    unittest.main()
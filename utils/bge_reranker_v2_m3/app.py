@@ -1,18 +1,34 @@
 # -*- coding: utf-8 -*-
 # Created on 2025/4/8
 from fastapi import FastAPI, HTTPException
+from fastapi.responses import JSONResponse
 from pydantic import BaseModel
 from sentence_transformers import CrossEncoder
 import uvicorn
 from loguru import logger
 import sys
 import os
+import time
+import queue
+import hashlib
+import asyncio
+import threading
+from collections import OrderedDict
+from typing import Dict, List, Tuple
 
 
 # Configure loguru logging
 logger.remove()  # Remove default log handler
 logger.add(sys.stdout, level="INFO")  # Output to console
 
+# Micro-batching: pairs of concurrent requests are scored together in one forward pass
+MAX_BATCH_SIZE = int(os.getenv("RERANKER_MAX_BATCH_SIZE", 64))  # max pairs per model.predict call
+MAX_WAIT_MS = float(os.getenv("RERANKER_MAX_WAIT_MS", 5))       # max time to wait for more pairs
+# LRU cache of scores keyed by (query, sentence) hash, bounded by entry count and estimated
+# memory; either limit set to 0 disables it
+SCORE_CACHE_SIZE = int(os.getenv("RERANKER_SCORE_CACHE_SIZE", 200000))
+SCORE_CACHE_MAX_BYTES = int(os.getenv("RERANKER_SCORE_CACHE_MAX_BYTES", 64 * 1024 ** 2))
+
 # Initialize FastAPI application
 app = FastAPI(title="BGE Reranker Service")
 # Load BGE-Reranker-v2-m3 model
@@ -27,6 +43,187 @@ except Exception as e:
     raise
 
 
+class MicroBatcher:
+    """
+    Collects query-sentence pairs of in-flight requests and scores them in a dedicated
+    inference thread, so that concurrent requests share forward passes and the event loop
+    is never blocked by the model.
+
+    A batch is run once `max_batch_size` pairs are waiting or `max_wait_ms` has passed since
+    the first waiting pair. Requests larger than `max_batch_size` are split into segments,
+    so a big request is scored across several batches instead of in one long call.
+    """
+    def __init__(self, model: CrossEncoder, max_batch_size: int = MAX_BATCH_SIZE, max_wait_ms: float = MAX_WAIT_MS):
+        self.model = model
+        self.max_batch_size = max_batch_size
+        self.max_wait = max_wait_ms / 1000
+        self._queue: "queue.Queue[Tuple[List[List[str]], asyncio.Future]]" = queue.Queue()
+        # a segment taken from the queue that did not fit into the previous batch
+        self._carry = None
+        self.batches = 0
+        self.pairs = 0
+        self._thread = threading.Thread(target=self._run, name="reranker-batcher", daemon=True)
+        self._thread.start()
+
+    def is_alive(self) -> bool:
+        return self._thread.is_alive()
+
+    async def predict(self, pairs: List[List[str]]) -> List[float]:
+        if not self.is_alive():
+            # nothing would ever resolve the futures
+            raise RuntimeError("The reranker batching thread is not running.")
+        loop = asyncio.get_running_loop()
+        futures = []
+        for start in range(0, len(pairs), self.max_batch_size):
+            future = loop.create_future()
+            self._queue.put((pairs[start:start + self.max_batch_size], future))
+            futures.append(future)
+        scores = []
+        for segment_scores in await asyncio.gather(*futures):
+            scores.extend(segment_scores)
+        return scores
+
+    def _collect(self) -> List[Tuple[List[List[str]], asyncio.Future]]:
+        items = [self._carry if self._carry is not None else self._queue.get()]
+        self._carry = None
+        size = len(items[0][0])
+        deadline = time.monotonic() + self.max_wait
+        while size < self.max_batch_size:
+            timeout = deadline - time.monotonic()
+            if timeout <= 0:
+                break
+            try:
+                item = self._queue.get(timeout=timeout)
+            except queue.Empty:
+                break
+            if size + len(item[0]) > self.max_batch_size:
+                self._carry = item
+                break
+            items.append(item)
+            size += len(item[0])
+        return items
+
+    def _run(self):
+        while True:
+            items = []
+            # any failure of a batch fails its requests but must not kill the thread,
+            # otherwise every later request would wait forever
+            try:
+                items = self._collect()
+                batch = [pair for pairs, _ in items for pair in pairs]
+                scores = self.model.predict(batch, batch_size=len(batch))
+                if len(scores) != len(batch):
+                    raise ValueError(f"Expected {len(batch)} scores, got {len(scores)}")
+                self.batches += 1
+                self.pairs += len(batch)
+
+                # scatter the scores back to the waiting requests
+                results = []
+                offset = 0
+                for pairs, future in items:
+                    results.append((future, future.set_result, [float(score) for score in scores[offset:offset + len(pairs)]]))
+                    offset += len(pairs)
+            except Exception as e:
+                logger.error(f"Batch inference failed: {str(e)}")
+                results = [(future, future.set_exception, e) for _, future in items]
+            for future, setter, value in results:
+                self._dispatch(future, setter, value)
+
+    def _dispatch(self, future: asyncio.Future, setter, value):
+        try:
+            future.get_loop().call_soon_threadsafe(self._resolve, future, setter, value)
+        except RuntimeError:
+            # the event loop of the request is closed (e.g. during shutdown)
+            pass
+
+    @staticmethod
+    def _resolve(future: asyncio.Future, setter, value):
+        # the request may have been cancelled (client disconnected) while it was waiting
+        if not future.done():
+            setter(value)
+
+    def stats(self) -> dict:
+        return {
+            "alive": self.is_alive(),
+            "max_batch_size": self.max_batch_size,
+            "max_wait_ms": self.max_wait * 1000,
+            "queue_depth": self._queue.qsize(),
+            "batches": self.batches,
+            "pairs": self.pairs,
+            "avg_batch_size": self.pairs / self.batches if self.batches else 0.0
+        }
+
+
+batcher = MicroBatcher(model)
+
+
+# estimated memory of one entry: the 64-char key string, the float and the OrderedDict node
+_ENTRY_BYTES = sys.getsizeof("0" * 64) + sys.getsizeof(0.0) + 100
+
+
+class ScoreLRU:
+    """LRU cache of pair scores keyed by sha256(query, sentence), bounded by entry count and estimated bytes."""
+    def __init__(self, max_entries: int = SCORE_CACHE_SIZE, max_bytes: int = SCORE_CACHE_MAX_BYTES):
+        self.max_entries = min(max_entries, max_bytes // _ENTRY_BYTES)
+        self.max_bytes = max_bytes
+        self._scores: "OrderedDict[str, float]" = OrderedDict()
+        self.hits = 0
+        self.misses = 0
+
+    @staticmethod
+    def make_key(query: str, sentence: str) -> str:
+        return hashlib.sha256(f"{query}\0{sentence}".encode("utf-8")).hexdigest()
+
+    def get_many(self, keys: List[str]) -> Dict[str, float]:
+        found = {}
+        for key in keys:
+            score = self._scores.get(key)
+            if score is not None:
+                self._scores.move_to_end(key)
+                found[key] = score
+        self.hits += len(found)
+        self.misses += len(keys) - len(found)
+        return found
+
+    def put_many(self, scores: Dict[str, float]):
+        if self.max_entries <= 0:
+            return
+        for key, score in scores.items():
+            self._scores[key] = score
+            self._scores.move_to_end(key)
+        while len(self._scores) > self.max_entries:
+            self._scores.popitem(last=False)
+
+    def stats(self) -> dict:
+        total = self.hits + self.misses
+        return {
+            "entries": len(self._scores),
+            "max_entries": self.max_entries,
+            "bytes": len(self._scores) * _ENTRY_BYTES,
+            "max_bytes": self.max_bytes,
+            "hits": self.hits,
+            "misses": self.misses,
+            "hit_rate": self.hits / total if total else 0.0
+        }
+
+
+score_cache = ScoreLRU()
+
+
+async def score_pairs(query: str, sentences: List[str]) -> List[float]:
+    """Score (query, sentence) pairs, only the sentences missing from the score cache go to the model."""
+    keys = [score_cache.make_key(query, sentence) for sentence in sentences]
+    found = score_cache.get_many(keys)
+    missing = list(dict.fromkeys(key for key in keys if key not in found))
+    if missing:
+        sentence_by_key = dict(zip(keys, sentences))
+        missing_scores = await batcher.predict([[query, sentence_by_key[key]] for key in missing])
+        computed = dict(zip(missing, missing_scores))
+        score_cache.put_many(computed)
+        found = {**found, **computed}
+    return [found[key] for key in keys]
+
+
 # Define request body data model
 class RerankRequest(BaseModel):
     query: str
@@ -49,19 +246,16 @@ async def rerank(request: RerankRequest):
             logger.warning("Empty query or sentences received.")
             raise HTTPException(status_code=400, detail="Query and sentences must not be empty")
 
-        # Construct query-sentence pairs
-        pairs = [[query, sentence] for sentence in sentences]
-        logger.debug(f"Constructed {len(pairs)} query-sentence pairs.")
-
-        # Compute scores using the model
-        logger.info("Computing scores...")
-        scores = model.predict(pairs)
+        # Compute scores using the model, pairs found in the score cache are not scored again
+        logger.info(f"Computing scores of {len(sentences)} query-sentence pairs...")
+        scores = await score_pairs(query, sentences)
         logger.info("Scores computed successfully.")
 
-        # Prepare results, sorted by score in descending order
+        # Prepare results, sorted by score in descending order; index is the position of the
+        # sentence in the request, so callers can re-attach their data without matching texts
         results = [
-            {"sentence": sentence, "score": float(score)}
-            for sentence, score in zip(sentences, scores)
+            {"index": index, "sentence": sentence, "score": float(score)}
+            for index, (sentence, score) in enumerate(zip(sentences, scores))
         ]
         results = sorted(results, key=lambda x: x["score"], reverse=True)[:top_k]
         # Log response details
@@ -73,9 +267,14 @@ async def rerank(request: RerankRequest):
 
 
 @app.get("/health")
-async def check_health() -> dict:
-    """Check the health of the service"""
-    return {"status": "ok"}
+async def check_health():
+    """Check the health of the service, unhealthy (503) once the batching thread has died"""
+    if not batcher.is_alive():
+        return JSONResponse(
+            status_code=503,
+            content={"status": "unhealthy", "batcher": batcher.stats(), "score_cache": score_cache.stats()}
+        )
+    return {"status": "ok", "batcher": batcher.stats(), "score_cache": score_cache.stats()}
 
 
 # Run the service
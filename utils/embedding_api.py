@@ -6,13 +6,15 @@
 """
 import sys
 import json
+import asyncio
 from typing import List, Optional
+import httpx
 import requests
 from loguru import logger
 from tenacity import retry, stop_after_attempt, wait_exponential
 from pymilvus.model import DefaultEmbeddingFunction
 import numpy as np
-from openai import OpenAI
+from openai import OpenAI, AsyncOpenAI
 
 sys.path.append("..")
 
@@ -20,8 +22,10 @@ from eval.utilities import cosine_similarity
 from database.milvus.config import REQUEST_TIMEOUT, MAX_RETRIES
 from services.config import EMBEDDING_API_URL, OPENAI_API_KEY
 from database.milvus.config import VECTOR_DIM
+from utils.embedding_cache import cached_embedding
 
 
+@cached_embedding(model="bge-m3", dimension=VECTOR_DIM)
 @retry(stop=stop_after_attempt(MAX_RETRIES), wait=wait_exponential(multiplier=1, min=4, max=10))
 def bge_m3_embedding_api(texts: List[str]) -> Optional[List[List[float]]]:
     """
@@ -66,6 +70,7 @@ def bge_m3_embedding_api(texts: List[str]) -> Optional[List[List[float]]]:
         return None
 
 
+@cached_embedding(model="text-embedding-3-large", dimension=VECTOR_DIM)
 @retry(stop=stop_after_attempt(MAX_RETRIES), wait=wait_exponential(multiplier=1, min=4, max=10))
 def openai_embedding_api(texts: List[str], model: str = "text-embedding-3-large") -> Optional[List[List[float]]]:
     """
@@ -106,6 +111,7 @@ def openai_embedding_api(texts: List[str], model: str = "text-embedding-3-large"
         return None
 
 
+@cached_embedding(model="milvus-default-embedding")
 @retry(stop=stop_after_attempt(MAX_RETRIES), wait=wait_exponential(multiplier=1, min=4, max=10))
 def milvus_model_embedding(texts: List[str]) -> Optional[List[List[float]]]:
     """
@@ -132,6 +138,103 @@ def milvus_model_embedding(texts: List[str]) -> Optional[List[List[float]]]:
         return None
 
 
+@cached_embedding(model="bge-m3", dimension=VECTOR_DIM)
+@retry(stop=stop_after_attempt(MAX_RETRIES), wait=wait_exponential(multiplier=1, min=4, max=10))
+async def async_bge_m3_embedding_api(texts: List[str]) -> Optional[List[List[float]]]:
+    """
+    异步调用BGE-M3 API生成文本嵌入向量，不阻塞事件循环
+    
+    Args:
+        texts: 需要生成嵌入向量的文本列表
+        
+    Returns:
+        嵌入向量列表，如果请求失败则返回None
+    """
+    if not texts or not all(isinstance(text, str) and text.strip() for text in texts):
+        logger.error("输入文本无效")
+        return None
+
+    headers = {"content-type": "application/json;charset=utf-8"}
+    body = {"texts": texts}
+
+    try:
+        async with httpx.AsyncClient(timeout=REQUEST_TIMEOUT) as client:
+            response = await client.post(
+                url=EMBEDDING_API_URL,
+                content=json.dumps(body),
+                headers=headers
+            )
+
+        if response.status_code != 200:
+            logger.error(f"API请求失败: {response.status_code}\n响应数据: {response.text}")
+            return None
+
+        response_data = response.json()
+        return response_data.get("data")
+
+    except httpx.TimeoutException:
+        logger.error("API请求超时")
+        return None
+    except httpx.HTTPError as e:
+        logger.error(f"API请求异常: {str(e)}")
+        return None
+    except Exception as e:
+        logger.error(f"处理响应时发生错误: {str(e)}")
+        return None
+
+
+@cached_embedding(model="text-embedding-3-large", dimension=VECTOR_DIM)
+@retry(stop=stop_after_attempt(MAX_RETRIES), wait=wait_exponential(multiplier=1, min=4, max=10))
+async def async_openai_embedding_api(texts: List[str], model: str = "text-embedding-3-large") -> Optional[List[List[float]]]:
+    """
+    异步调用OpenAI API生成文本嵌入向量，不阻塞事件循环
+    
+    Args:
+        texts: 需要生成嵌入向量的文本列表
+        model: OpenAI嵌入模型名称，默认使用text-embedding-3-large
+        
+    Returns:
+        嵌入向量列表，如果请求失败则返回None
+    """
+    if not texts or not all(isinstance(text, str) and text.strip() for text in texts):
+        logger.error("输入文本无效")
+        return None
+
+    try:
+        client = AsyncOpenAI(api_key=OPENAI_API_KEY)
+        response = await client.embeddings.create(
+            model=model,
+            input=texts,
+            dimensions=VECTOR_DIM
+        )
+        return [data.embedding for data in response.data]
+
+    except Exception as e:
+        logger.error(f"OpenAI API请求异常: {str(e)}")
+        return None
+
+
+async def async_milvus_model_embedding(texts: List[str]) -> Optional[List[List[float]]]:
+    """
+    Milvus内置嵌入模型在本地CPU上推理，放到线程中执行以避免阻塞事件循环
+    """
+    return await asyncio.to_thread(milvus_model_embedding, texts)
+
+
+# embedding_api 名称 -> 同步/异步实现
+EMBEDDING_API_MAP = {
+    "bge_m3_embedding_api": bge_m3_embedding_api,
+    "openai_embedding_api": openai_embedding_api,
+    "milvus_model_embedding": milvus_model_embedding
+}
+
+ASYNC_EMBEDDING_API_MAP = {
+    "bge_m3_embedding_api": async_bge_m3_embedding_api,
+    "openai_embedding_api": async_openai_embedding_api,
+    "milvus_model_embedding": async_milvus_model_embedding
+}
+
+
 if __name__ == "__main__":
     # 测试两个句子的相似度
     test_texts = ["我想吃饭", "我不想吃什么"]
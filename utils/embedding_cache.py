@@ -0,0 +1,152 @@
+"""
+@File   : embedding_cache.py
+@Desc   : 嵌入向量的内容寻址持久化缓存，按(模型, 维度, 规范化文本哈希)缓存float32向量
+"""
+import sys
+import hashlib
+import inspect
+import functools
+import threading
+import unicodedata
+import asyncio
+from typing import List, Optional, Callable
+
+import numpy as np
+from loguru import logger
+
+sys.path.append("..")
+
+from utils.sqlite_cache import SQLiteCache
+from database.milvus.config import (
+    EMBEDDING_CACHE_ENABLED,
+    EMBEDDING_CACHE_PATH,
+    EMBEDDING_CACHE_MAX_BYTES
+)
+
+
+def normalize_text(text: str) -> str:
+    """缓存键只依赖文本内容本身：统一Unicode表示并去掉首尾空白"""
+    return unicodedata.normalize("NFC", text).strip()
+
+
+class EmbeddingCache(SQLiteCache):
+    """
+    Disk-backed embedding cache keyed by (model, dimension, normalized text hash).
+    Vectors are stored as float32 blobs.
+    """
+    @staticmethod
+    def make_key(model: str, dimension: Optional[int], text: str) -> str:
+        digest = hashlib.sha256(normalize_text(text).encode("utf-8")).hexdigest()
+        return f"{model}:{dimension or 'native'}:{digest}"
+
+    @staticmethod
+    def encode(vector) -> bytes:
+        return np.asarray(vector, dtype=np.float32).tobytes()
+
+    @staticmethod
+    def decode(blob: bytes) -> List[float]:
+        return np.frombuffer(blob, dtype=np.float32).tolist()
+
+
+_embedding_cache: Optional[EmbeddingCache] = None
+_embedding_cache_lock = threading.Lock()
+
+
+def get_embedding_cache() -> Optional[EmbeddingCache]:
+    """Return the process-wide embedding cache, or None if it is disabled or unavailable."""
+    global _embedding_cache
+    if not EMBEDDING_CACHE_ENABLED:
+        return None
+    if _embedding_cache is None:
+        with _embedding_cache_lock:
+            if _embedding_cache is None:
+                try:
+                    _embedding_cache = EmbeddingCache(EMBEDDING_CACHE_PATH, EMBEDDING_CACHE_MAX_BYTES)
+                except Exception as e:
+                    logger.error(f"嵌入缓存初始化失败，将不使用缓存: {str(e)}")
+                    return None
+    return _embedding_cache
+
+
+def cached_embedding(model: str, dimension: Optional[int] = None):
+    """
+    为嵌入函数加上持久化缓存：命中的文本不再请求嵌入服务，只把未命中的文本(去重后)批量发送。
+
+    被装饰函数的第一个参数必须是文本列表；调用时可传入 `use_cache=False` 跳过缓存，
+    若调用时传入 `model` 参数(位置参数或关键字参数)，则以该值作为缓存键中的模型名。
+    异步函数的缓存读写在线程中执行，不阻塞事件循环。
+
+    Args:
+        model: 默认模型名，用于区分不同嵌入模型的向量
+        dimension: 向量维度，None 表示模型原生维度
+    """
+    def resolve_model(signature, texts, args, kwargs):
+        if signature is None:
+            return kwargs.get("model", model)
+        try:
+            bound = signature.bind_partial(texts, *args, **kwargs)
+        except TypeError:
+            return kwargs.get("model", model)
+        return bound.arguments.get("model", model)
+
+    def prepare(signature, texts, args, kwargs):
+        cache = get_embedding_cache()
+        if cache is None or not texts or not all(isinstance(text, str) and text.strip() for text in texts):
+            # 无效输入交给原函数处理，保持原有的报错行为
+            return None, None, None
+        model_name = resolve_model(signature, texts, args, kwargs)
+        keys = [cache.make_key(model_name, dimension, text) for text in texts]
+        found = cache.get_many(keys)
+        missing = {}
+        for key, text in zip(keys, texts):
+            if key not in found and key not in missing:
+                missing[key] = text
+        return cache, keys, (found, missing)
+
+    def merge(cache, keys, found, missing, missing_embeddings):
+        if missing:
+            if not missing_embeddings or len(missing_embeddings) != len(missing):
+                return None
+            computed = dict(zip(missing.keys(), missing_embeddings))
+            cache.put_many({key: cache.encode(vector) for key, vector in computed.items()})
+        else:
+            computed = {}
+        return [computed[key] if key in computed else cache.decode(found[key]) for key in keys]
+
+    def decorator(func: Callable):
+        try:
+            signature = inspect.signature(func)
+        except (TypeError, ValueError):
+            signature = None
+
+        if asyncio.iscoroutinefunction(func):
+            @functools.wraps(func)
+            async def async_wrapper(texts: List[str], *args, use_cache: bool = True, **kwargs):
+                if not use_cache:
+                    return await func(texts, *args, **kwargs)
+                # SQLite 读写会阻塞，放到线程中执行
+                cache, keys, lookup = await asyncio.to_thread(prepare, signature, texts, args, kwargs)
+                if cache is None:
+                    return await func(texts, *args, **kwargs)
+                found, missing = lookup
+                missing_embeddings = await func(list(missing.values()), *args, **kwargs) if missing else None
+                return await asyncio.to_thread(merge, cache, keys, found, missing, missing_embeddings)
+            return async_wrapper
+
+        @functools.wraps(func)
+        def wrapper(texts: List[str], *args, use_cache: bool = True, **kwargs):
+            if not use_cache:
+                return func(texts, *args, **kwargs)
+            cache, keys, lookup = prepare(signature, texts, args, kwargs)
+            if cache is None:
+                return func(texts, *args, **kwargs)
+            found, missing = lookup
+            missing_embeddings = func(list(missing.values()), *args, **kwargs) if missing else None
+            return merge(cache, keys, found, missing, missing_embeddings)
+        return wrapper
+    return decorator
+
+
+def embedding_cache_stats() -> dict:
+    cache = get_embedding_cache()
+    return cache.stats() if cache is not None else {"enabled": False}
@@ -4,51 +4,51 @@
 @Author : yfzuo
 @Desc   : MinerU 文件解析API调用
 """
+import io
 import sys
 import json
-from typing import Optional, Dict
+import time
+from concurrent.futures import ThreadPoolExecutor
+from typing import Optional, Dict, Union, List, Tuple
 import requests
+from PyPDF2 import PdfReader, PdfWriter
 from loguru import logger
 from tenacity import retry, stop_after_attempt, wait_exponential
 
 sys.path.append("..")
 
-from parser.config import REQUEST_TIMEOUT, MAX_RETRIES
-from services.config import MINERU_API_URL
+from parser.config import (
+    REQUEST_TIMEOUT,
+    MINERU_POLL_INTERVAL,
+    MINERU_POLL_TIMEOUT,
+    MINERU_UPLOAD_TIMEOUT,
+    MINERU_PAGES_PER_SHARD,
+    MINERU_SHARD_CONCURRENCY,
+    MINERU_SHARD_RETRIES,
+    MINERU_JOBS_URL
+)
 
 
-# @retry(stop=stop_after_attempt(MAX_RETRIES), wait=wait_exponential(multiplier=1, min=4, max=10))
-def mineru_file_parse_api(file_path: str) -> Optional[Dict]:
+def mineru_file_parse_api(file_path: Union[str, bytes], filename: str = "upload.pdf") -> Optional[Dict]:
     """
-    调用MinerU文件解析API解析PDF文件
+    调用MinerU文件解析API解析PDF文件：提交异步解析任务后轮询结果，不必在一个HTTP请求上等待整个解析过程
     
     Args:
-        file_path: 文件路径
-        additional_params: 附加参数字典，可选
+        file_path: 文件路径，或内存中的文件内容(bytes)，后者无需先写入磁盘
+        filename: 以bytes上传时使用的文件名
         
     Returns:
         返回的JSON数据字典，如果请求失败则返回None
     """
-    if not file_path or not isinstance(file_path, str):
+    if not file_path or not isinstance(file_path, (str, bytes)):
         logger.error("文件路径无效")
         return None
     
     try:
+        if isinstance(file_path, bytes):
+            return _post_mineru_file({"file": (filename, file_path)})
         with open(file_path, "rb") as file:
-            files = {"file": file}
-            
-            response = requests.post(
-                url=MINERU_API_URL,
-                files=files,
-                timeout=REQUEST_TIMEOUT
-            )
-            
-            if response.status_code != 200:
-                logger.error(f"API请求失败: {response.status_code}\n响应数据: {response.text}")
-                return None
-            
-            response_data = response.json()
-            return response_data
+            return _post_mineru_file({"file": file})
     except FileNotFoundError:
         logger.error(f"文件未找到: {file_path}")
         return None
@@ -63,6 +63,114 @@ def mineru_file_parse_api(file_path: str) -> Optional[Dict]:
         return None
 
 
+
+def _post_mineru_file(files: Dict) -> Optional[Dict]:
+    response = requests.post(
+        url=MINERU_JOBS_URL,
+        files=files,
+        timeout=MINERU_UPLOAD_TIMEOUT
+    )
+    
+    if response.status_code != 202:
+        logger.error(f"API请求失败: {response.status_code}\n响应数据: {response.text}")
+        return None
+    
+    job_id = response.json()["job_id"]
+    return _wait_mineru_job(job_id)
+
+
+def _wait_mineru_job(job_id: str) -> Optional[Dict]:
+    """轮询解析任务直到完成，总等待时间不超过REQUEST_TIMEOUT"""
+    deadline = time.monotonic() + REQUEST_TIMEOUT
+    while time.monotonic() < deadline:
+        response = requests.get(
+            url=f"{MINERU_JOBS_URL}/{job_id}/result",
+            timeout=MINERU_POLL_TIMEOUT
+        )
+        if response.status_code == 200:
+            return response.json()
+        if response.status_code != 202:
+            logger.error(f"解析任务{job_id}失败: {response.status_code}\n响应数据: {response.text}")
+            return None
+        time.sleep(MINERU_POLL_INTERVAL)
+    
+    logger.error(f"解析任务{job_id}等待超时")
+    return None
+
+
+class MinerUShardError(Exception):
+    pass
+
+
+def split_pdf_pages(file_content: bytes, pages_per_shard: int = MINERU_PAGES_PER_SHARD) -> List[Tuple[int, bytes]]:
+    """
+    按页切分PDF，返回[(起始页号, 分片PDF内容)]；页数不超过pages_per_shard时原样返回整个文件
+    """
+    reader = PdfReader(io.BytesIO(file_content))
+    num_pages = len(reader.pages)
+    if num_pages <= pages_per_shard:
+        return [(0, file_content)]
+
+    shards = []
+    for start in range(0, num_pages, pages_per_shard):
+        writer = PdfWriter()
+        for page_index in range(start, min(start + pages_per_shard, num_pages)):
+            writer.add_page(reader.pages[page_index])
+        buffer = io.BytesIO()
+        writer.write(buffer)
+        shards.append((start, buffer.getvalue()))
+    return shards
+
+
+def mineru_sharded_parse_api(
+    file_content: bytes,
+    filename: str = "upload.pdf",
+    pages_per_shard: int = MINERU_PAGES_PER_SHARD,
+    max_concurrency: int = MINERU_SHARD_CONCURRENCY,
+    max_retries: int = MINERU_SHARD_RETRIES
+) -> Optional[Dict]:
+    """
+    将PDF按页切分为多个分片并发提交MinerU解析，每个分片单独重试，按页序拼接各分片的markdown
+    
+    Args:
+        file_content: PDF文件内容
+        filename: 上传时使用的文件名
+        pages_per_shard: 每个分片的页数
+        max_concurrency: 同时解析的分片数
+        max_retries: 单个分片的最大尝试次数
+        
+    Returns:
+        {"md_content": 拼接后的markdown}，任一分片重试后仍失败则返回None；
+        无法切分的PDF(如加密或轻微损坏的文件)整体提交解析
+    """
+    try:
+        shards = split_pdf_pages(file_content, pages_per_shard)
+    except Exception as e:
+        logger.warning(f"PDF分片失败，改为整体解析: {str(e)}")
+        return mineru_file_parse_api(file_content, filename)
+    if len(shards) == 1:
+        return mineru_file_parse_api(file_content, filename)
+
+    @retry(stop=stop_after_attempt(max_retries), wait=wait_exponential(multiplier=1, min=4, max=10), reraise=True)
+    def parse_shard(shard: Tuple[int, bytes]) -> str:
+        start_page, shard_content = shard
+        result = mineru_file_parse_api(shard_content, f"{filename.rsplit('.', 1)[0]}_p{start_page}.pdf")
+        if result is None:
+            logger.warning(f"分片(起始页{start_page})解析失败，准备重试")
+            raise MinerUShardError(f"Failed to parse the shard starting at page {start_page}")
+        return result.get("md_content", "")
+
+    logger.info(f"PDF切分为{len(shards)}个分片并发解析")
+    try:
+        with ThreadPoolExecutor(max_workers=min(max_concurrency, len(shards))) as executor:
+            # map keeps the shard order, so the markdown is stitched in page order
+            md_contents = list(executor.map(parse_shard, shards))
+    except MinerUShardError as e:
+        logger.error(str(e))
+        return None
+    return {"md_content": "\n\n".join(md_contents)}
+
+
 if __name__ == "__main__":
     # 测试代码
     test_file_path = "../test/dummy_file/rag_and_broswer_use.pdf"
@@ -1,14 +1,25 @@
 import json
 import os
+import re
+import time
+import hashlib
+import uuid
+import asyncio
+import functools
+import multiprocessing
+from collections import OrderedDict, deque
+from contextlib import asynccontextmanager
+from concurrent.futures import ProcessPoolExecutor
+from concurrent.futures.process import BrokenProcessPool
 from base64 import b64encode
 from glob import glob
 from io import StringIO
 import tempfile
-from typing import Tuple, Union
+from typing import Dict, Optional, Tuple, Union
 
 import uvicorn
-from fastapi import FastAPI, HTTPException, UploadFile
-from fastapi.responses import JSONResponse
+from fastapi import Depends, FastAPI, HTTPException, UploadFile
+from fastapi.responses import FileResponse, JSONResponse
 from loguru import logger
 
 from magic_pdf.data.read_api import read_local_images, read_local_office
@@ -24,7 +35,32 @@ from magic_pdf.operators.pipes import PipeResult
 
 model_config.__use_inside_model__ = True
 
-app = FastAPI()
+
+@asynccontextmanager
+async def lifespan(app: FastAPI):
+    job_queue.start()
+    yield
+    job_queue.shutdown()
+
+
+app = FastAPI(lifespan=lifespan)
+
+# 解析进程数，每个进程各自预加载一份模型；CPU推理时按核数与内存调整
+MINERU_WORKERS = int(os.getenv("MINERU_WORKERS", "1"))
+# 等待中的解析任务上限，超出后新的请求返回503
+MINERU_QUEUE_SIZE = int(os.getenv("MINERU_QUEUE_SIZE", "16"))
+# 已完成任务的结果保留时间(秒)与条数
+MINERU_JOB_RESULT_TTL = float(os.getenv("MINERU_JOB_RESULT_TTL", "3600"))
+MINERU_MAX_FINISHED_JOBS = int(os.getenv("MINERU_MAX_FINISHED_JOBS", "256"))
+# 后台清理过期任务结果的间隔(秒)，服务空闲时过期数据也会被清理
+MINERU_PRUNE_INTERVAL = float(os.getenv("MINERU_PRUNE_INTERVAL", "60"))
+# 各阶段耗时统计的滑动窗口大小
+STAGE_LATENCY_WINDOW = 500
+# image_mode=reference 时图片按内容哈希存放的目录，及未被再次引用的图片的保留时间(秒)
+MINERU_BLOB_DIR = os.getenv("MINERU_BLOB_DIR", "blobs")
+MINERU_BLOB_TTL = float(os.getenv("MINERU_BLOB_TTL", "86400"))
+IMAGE_MODES = ("base64", "reference")
+BLOB_ID_PATTERN = re.compile(r"^[0-9a-f]{64}\.[a-z]+$")
 
 pdf_extensions = [".pdf"]
 office_extensions = [".ppt", ".pptx", ".doc", ".docx"]
@@ -52,7 +88,8 @@ class MemoryDataWriter(DataWriter):
 
 def init_writers(
     file_path: str = None,
-    file: UploadFile = None,
+    file_bytes: bytes = None,
+    file_name: str = None,
     output_path: str = None,
     output_image_path: str = None,
 ) -> Tuple[
@@ -65,7 +102,8 @@ def init_writers(
 
     Args:
         file_path: file path (local path or S3 path)
-        file: Uploaded file object
+        file_bytes: Content of the uploaded file
+        file_name: Name of the uploaded file
         output_path: Output directory path
         output_image_path: Image output directory path
 
@@ -100,8 +138,7 @@ def init_writers(
             file_extension = os.path.splitext(file_path)[1]
     else:
         # 处理上传的文件
-        file_bytes = file.file.read()
-        file_extension = os.path.splitext(file.filename)[1]
+        file_extension = os.path.splitext(file_name)[1]
         writer = FileBasedDataWriter(output_path)
         image_writer = FileBasedDataWriter(output_image_path)
         os.makedirs(output_image_path, exist_ok=True)
@@ -114,6 +151,8 @@ def process_file(
     file_extension: str,
     parse_method: str,
     image_writer: Union[S3DataWriter, FileBasedDataWriter],
+    start_page_id: int = 0,
+    end_page_id: Optional[int] = None,
 ) -> Tuple[InferenceResult, PipeResult]:
     """
     Process PDF file content
@@ -123,6 +162,8 @@ def process_file(
         file_extension: file extension
         parse_method: Parse method ('ocr', 'txt', 'auto')
         image_writer: Image writer
+        start_page_id: First page to parse (0-based, PDF only)
+        end_page_id: Last page to parse (inclusive), None for the last page of the file
 
     Returns:
         Tuple[InferenceResult, PipeResult]: Returns inference result and pipeline result
@@ -132,33 +173,34 @@ def process_file(
     if file_extension in pdf_extensions:
         ds = PymuDocDataset(file_bytes)
     elif file_extension in office_extensions:
-        # 需要使用office解析
-        temp_dir = tempfile.mkdtemp()
-        with open(os.path.join(temp_dir, f"temp_file.{file_extension}"), "wb") as f:
-            f.write(file_bytes)
-        ds = read_local_office(temp_dir)[0]
+        # 需要使用office解析，数据集读入内存后临时目录即被删除
+        with tempfile.TemporaryDirectory() as temp_dir:
+            with open(os.path.join(temp_dir, f"temp_file{file_extension}"), "wb") as f:
+                f.write(file_bytes)
+            ds = read_local_office(temp_dir)[0]
     elif file_extension in image_extensions:
         # 需要使用ocr解析
-        temp_dir = tempfile.mkdtemp()
-        with open(os.path.join(temp_dir, f"temp_file.{file_extension}"), "wb") as f:
-            f.write(file_bytes)
-        ds = read_local_images(temp_dir)[0]
+        with tempfile.TemporaryDirectory() as temp_dir:
+            with open(os.path.join(temp_dir, f"temp_file{file_extension}"), "wb") as f:
+                f.write(file_bytes)
+            ds = read_local_images(temp_dir)[0]
     infer_result: InferenceResult = None
     pipe_result: PipeResult = None
 
+    page_range = {"start_page_id": start_page_id, "end_page_id": end_page_id}
     if parse_method == "ocr":
-        infer_result = ds.apply(doc_analyze, ocr=True)
-        pipe_result = infer_result.pipe_ocr_mode(image_writer)
+        infer_result = ds.apply(doc_analyze, ocr=True, **page_range)
+        pipe_result = infer_result.pipe_ocr_mode(image_writer, **page_range)
     elif parse_method == "txt":
-        infer_result = ds.apply(doc_analyze, ocr=False)
-        pipe_result = infer_result.pipe_txt_mode(image_writer)
+        infer_result = ds.apply(doc_analyze, ocr=False, **page_range)
+        pipe_result = infer_result.pipe_txt_mode(image_writer, **page_range)
     else:  # auto
         if ds.classify() == SupportedPdfParseMethod.OCR:
-            infer_result = ds.apply(doc_analyze, ocr=True)
-            pipe_result = infer_result.pipe_ocr_mode(image_writer)
+            infer_result = ds.apply(doc_analyze, ocr=True, **page_range)
+            pipe_result = infer_result.pipe_ocr_mode(image_writer, **page_range)
         else:
-            infer_result = ds.apply(doc_analyze, ocr=False)
-            pipe_result = infer_result.pipe_txt_mode(image_writer)
+            infer_result = ds.apply(doc_analyze, ocr=False, **page_range)
+            pipe_result = infer_result.pipe_txt_mode(image_writer, **page_range)
 
     return infer_result, pipe_result
 
@@ -169,12 +211,361 @@ def encode_image(image_path: str) -> str:
         return b64encode(f.read()).decode()
 
 
-@app.post(
-    "/file_parse",
-    tags=["projects"],
-    summary="Parse files (supports local files and S3)",
-)
-async def file_parse(
+def store_blob(image_path: str) -> str:
+    """
+    Copy an image into the content-addressed blob store and return its blob id
+    (sha256 of the content + extension). Identical images are stored once.
+    """
+    with open(image_path, "rb") as f:
+        content = f.read()
+    blob_id = f"{hashlib.sha256(content).hexdigest()}{os.path.splitext(image_path)[1].lower()}"
+    blob_path = os.path.join(MINERU_BLOB_DIR, blob_id)
+    if os.path.exists(blob_path):
+        # refresh the modification time so that a referenced blob is not pruned
+        os.utime(blob_path)
+    else:
+        os.makedirs(MINERU_BLOB_DIR, exist_ok=True)
+        temp_path = f"{blob_path}.{os.getpid()}.tmp"
+        with open(temp_path, "wb") as f:
+            f.write(content)
+        os.replace(temp_path, blob_path)
+    return blob_id
+
+
+def prune_blobs():
+    """Remove blobs that have not been stored or referenced for MINERU_BLOB_TTL seconds."""
+    if not os.path.isdir(MINERU_BLOB_DIR):
+        return
+    expire_before = time.time() - MINERU_BLOB_TTL
+    for entry in os.scandir(MINERU_BLOB_DIR):
+        try:
+            if entry.stat().st_mtime < expire_before:
+                os.remove(entry.path)
+        except FileNotFoundError:
+            pass
+
+
+
+
+def init_worker():
+    """Load the models once per worker process, so that jobs do not pay the model loading time."""
+    model_config.__use_inside_model__ = True
+    try:
+        from magic_pdf.model.doc_analyze_by_custom_model import ModelSingleton
+        model_manager = ModelSingleton()
+        model_manager.get_model(False, False)
+        model_manager.get_model(True, False)
+        logger.info(f"Worker {os.getpid()} preloaded models")
+    except Exception as e:
+        logger.warning(f"Worker {os.getpid()} failed to preload models, the first job will load them: {str(e)}")
+
+
+def run_parse_job(
+    file_path: str = None,
+    is_json_md_dump: bool = False,
+    output_dir: str = "output",
+    **job_kwargs
+) -> Tuple[Dict, Dict[str, float]]:
+    """
+    Parse one file in a worker process. Unless the results are dumped (or written to S3),
+    the images are written to a temporary output directory that is removed with the job.
+    """
+    if is_json_md_dump or (file_path and file_path.startswith("s3://")):
+        return parse_to_output(file_path=file_path, is_json_md_dump=is_json_md_dump, output_dir=output_dir, **job_kwargs)
+    with tempfile.TemporaryDirectory(prefix="mineru_") as temp_output_dir:
+        return parse_to_output(file_path=file_path, is_json_md_dump=False, output_dir=temp_output_dir, **job_kwargs)
+
+
+def parse_to_output(
+    file_bytes: bytes = None,
+    file_path: str = None,
+    file_name: str = None,
+    parse_method: str = "auto",
+    is_json_md_dump: bool = False,
+    output_dir: str = "output",
+    return_layout: bool = False,
+    return_info: bool = False,
+    return_content_list: bool = False,
+    return_images: bool = False,
+    image_mode: str = "base64",
+    start_page_id: int = 0,
+    end_page_id: Optional[int] = None,
+) -> Tuple[Dict, Dict[str, float]]:
+    """
+    Parse one file and write its images and dumped files under `output_dir`.
+
+    Returns:
+        Tuple[data, stages]: The response data and the seconds spent in each stage
+    """
+    stages = {}
+    start_time = time.perf_counter()
+
+    # Get PDF filename
+    base_name = os.path.basename(file_path if file_path else file_name).split(".")[0]
+    output_path = f"{output_dir}/{base_name}"
+    output_image_path = f"{output_path}/images"
+
+    # Initialize readers/writers and get PDF content
+    writer, image_writer, file_bytes, file_extension = init_writers(
+        file_path=file_path,
+        file_bytes=file_bytes,
+        file_name=file_name,
+        output_path=output_path,
+        output_image_path=output_image_path,
+    )
+    stages["read"] = time.perf_counter() - start_time
+
+    # Process PDF
+    start_time = time.perf_counter()
+    infer_result, pipe_result = process_file(
+        file_bytes, file_extension, parse_method, image_writer, start_page_id, end_page_id
+    )
+    stages["analyze"] = time.perf_counter() - start_time
+
+    start_time = time.perf_counter()
+    # Use MemoryDataWriter to get results
+    content_list_writer = MemoryDataWriter()
+    md_content_writer = MemoryDataWriter()
+    middle_json_writer = MemoryDataWriter()
+
+    # Use PipeResult's dump method to get data
+    pipe_result.dump_content_list(content_list_writer, "", "images")
+    pipe_result.dump_md(md_content_writer, "", "images")
+    pipe_result.dump_middle_json(middle_json_writer, "")
+
+    # Get content
+    content_list = json.loads(content_list_writer.get_value())
+    md_content = md_content_writer.get_value()
+    middle_json = json.loads(middle_json_writer.get_value())
+    model_json = infer_result.get_infer_res()
+
+    # If results need to be saved
+    if is_json_md_dump:
+        writer.write_string(
+            f"{base_name}_content_list.json", content_list_writer.get_value()
+        )
+        writer.write_string(f"{base_name}.md", md_content)
+        writer.write_string(
+            f"{base_name}_middle.json", middle_json_writer.get_value()
+        )
+        writer.write_string(
+            f"{base_name}_model.json",
+            json.dumps(model_json, indent=4, ensure_ascii=False),
+        )
+        # Save visualization results
+        pipe_result.draw_layout(os.path.join(output_path, f"{base_name}_layout.pdf"))
+        pipe_result.draw_span(os.path.join(output_path, f"{base_name}_spans.pdf"))
+        pipe_result.draw_line_sort(
+            os.path.join(output_path, f"{base_name}_line_sort.pdf")
+        )
+        infer_result.draw_model(os.path.join(output_path, f"{base_name}_model.pdf"))
+
+    # Build return data
+    data = {}
+    if return_layout:
+        data["layout"] = model_json
+    if return_info:
+        data["info"] = middle_json
+    if return_content_list:
+        data["content_list"] = content_list
+    if return_images:
+        image_paths = glob(f"{output_image_path}/*.jpg")
+        if image_mode == "reference":
+            # only the blob urls are returned, the images are fetched from /blobs/{blob_id}
+            data["images"] = {
+                os.path.basename(image_path): f"/blobs/{store_blob(image_path)}"
+                for image_path in image_paths
+            }
+        else:
+            data["images"] = {
+                os.path.basename(
+                    image_path
+                ): f"data:image/jpeg;base64,{encode_image(image_path)}"
+                for image_path in image_paths
+            }
+    data["md_content"] = md_content  # md_content is always returned
+
+    # Clean up memory writers
+    content_list_writer.close()
+    md_content_writer.close()
+    middle_json_writer.close()
+    stages["dump"] = time.perf_counter() - start_time
+
+    return data, stages
+
+
+class QueueFullError(Exception):
+    pass
+
+
+class ParseJob:
+    def __init__(self, job_kwargs: Dict):
+        self.job_id = uuid.uuid4().hex
+        self.job_kwargs = job_kwargs
+        self.status = "queued"
+        self.submitted_at = time.time()
+        self.started_at: Optional[float] = None
+        self.finished_at: Optional[float] = None
+        self.stages: Dict[str, float] = {}
+        self.result: Optional[Dict] = None
+        self.error: Optional[str] = None
+        self.done = asyncio.Event()
+
+    def info(self) -> Dict:
+        return {
+            "job_id": self.job_id,
+            "status": self.status,
+            "submitted_at": self.submitted_at,
+            "started_at": self.started_at,
+            "finished_at": self.finished_at,
+            "stages": self.stages,
+            "error": self.error
+        }
+
+
+class ParseJobQueue:
+    """
+    A bounded queue of parse jobs served by a fixed pool of worker processes.
+
+    Every worker process preloads the models once. Parsing runs outside of the event loop,
+    so the server keeps answering health checks and polls while documents are parsed, and
+    a crashed worker only fails its own job: the pool is rebuilt for the next one.
+    """
+    def __init__(self, workers: int = MINERU_WORKERS, queue_size: int = MINERU_QUEUE_SIZE):
+        self.workers = workers
+        self.queue_size = queue_size
+        self.jobs: "OrderedDict[str, ParseJob]" = OrderedDict()
+        self.running = 0
+        self.completed = 0
+        self.failed = 0
+        self.stage_latency: Dict[str, deque] = {}
+        self._queue: Optional[asyncio.Queue] = None
+        self._pool: Optional[ProcessPoolExecutor] = None
+        self._dispatchers = []
+        self._pruner: Optional[asyncio.Task] = None
+
+    def _create_pool(self) -> ProcessPoolExecutor:
+        # spawn: forking a process that already holds model/CUDA state is unsafe
+        return ProcessPoolExecutor(
+            max_workers=self.workers,
+            mp_context=multiprocessing.get_context("spawn"),
+            initializer=init_worker
+        )
+
+    def start(self):
+        self._queue = asyncio.Queue(maxsize=self.queue_size)
+        self._pool = self._create_pool()
+        # warm the workers up now instead of on the first job
+        for _ in range(self.workers):
+            self._pool.submit(time.sleep, 0)
+        self._dispatchers = [asyncio.create_task(self._dispatch()) for _ in range(self.workers)]
+        self._pruner = asyncio.create_task(self._prune_periodically())
+
+    def shutdown(self):
+        for dispatcher in self._dispatchers:
+            dispatcher.cancel()
+        if self._pruner is not None:
+            self._pruner.cancel()
+        if self._pool is not None:
+            self._pool.shutdown(wait=False, cancel_futures=True)
+
+    def submit(self, **job_kwargs) -> ParseJob:
+        self._prune()
+        job = ParseJob(job_kwargs)
+        try:
+            self._queue.put_nowait(job)
+        except asyncio.QueueFull:
+            raise QueueFullError(f"Parse queue is full ({self.queue_size} jobs waiting)")
+        self.jobs[job.job_id] = job
+        return job
+
+    def get(self, job_id: str) -> Optional[ParseJob]:
+        return self.jobs.get(job_id)
+
+    async def _dispatch(self):
+        loop = asyncio.get_running_loop()
+        while True:
+            job = await self._queue.get()
+            job.status = "running"
+            job.started_at = time.time()
+            self.running += 1
+            pool = self._pool
+            try:
+                job.result, stages = await loop.run_in_executor(
+                    pool, functools.partial(run_parse_job, **job.job_kwargs)
+                )
+                job.status = "done"
+                job.stages.update(stages)
+                self.completed += 1
+            except BrokenProcessPool as e:
+                logger.error(f"Parse worker died while running job {job.job_id}, restarting the pool")
+                job.status, job.error = "failed", f"Parse worker died: {str(e)}"
+                self.failed += 1
+                # the other dispatchers see the same broken pool, only the first one replaces it
+                if self._pool is pool:
+                    pool.shutdown(wait=False)
+                    self._pool = self._create_pool()
+            except Exception as e:
+                logger.exception(e)
+                job.status, job.error = "failed", str(e)
+                self.failed += 1
+            finally:
+                self.running -= 1
+                job.finished_at = time.time()
+                job.stages["queue_wait"] = job.started_at - job.submitted_at
+                job.stages["total"] = job.finished_at - job.submitted_at
+                for stage, seconds in job.stages.items():
+                    self.stage_latency.setdefault(stage, deque(maxlen=STAGE_LATENCY_WINDOW)).append(seconds)
+                # the uploaded bytes are no longer needed once the job has run
+                job.job_kwargs = None
+                job.done.set()
+                self._queue.task_done()
+
+    def _prune(self):
+        """Forget finished jobs that are expired or beyond MINERU_MAX_FINISHED_JOBS."""
+        now = time.time()
+        finished = [job for job in self.jobs.values() if job.done.is_set()]
+        excess = len(finished) - MINERU_MAX_FINISHED_JOBS
+        for index, job in enumerate(finished):
+            if index < excess or now - job.finished_at > MINERU_JOB_RESULT_TTL:
+                del self.jobs[job.job_id]
+
+    async def _prune_periodically(self):
+        """Prune expired results and blobs every MINERU_PRUNE_INTERVAL seconds, also while no job is submitted."""
+        while True:
+            await asyncio.sleep(MINERU_PRUNE_INTERVAL)
+            try:
+                self._prune()
+                # scanning the blob directory is blocking disk I/O, keep it off the event loop
+                await asyncio.to_thread(prune_blobs)
+            except Exception as e:
+                logger.error(f"Failed to prune finished jobs and blobs: {str(e)}")
+
+    def stats(self) -> Dict:
+        stage_latency_ms = {}
+        for stage, samples in self.stage_latency.items():
+            ordered = sorted(samples)
+            stage_latency_ms[stage] = {
+                "count": len(ordered),
+                "avg": 1000 * sum(ordered) / len(ordered),
+                "p50": 1000 * ordered[len(ordered) // 2],
+                "p95": 1000 * ordered[min(len(ordered) - 1, int(len(ordered) * 0.95))]
+            }
+        return {
+            "workers": self.workers,
+            "queue_size": self.queue_size,
+            "queue_depth": self._queue.qsize() if self._queue is not None else 0,
+            "running": self.running,
+            "completed": self.completed,
+            "failed": self.failed,
+            "stage_latency_ms": stage_latency_ms
+        }
+
+
+job_queue = ParseJobQueue()
+
+
+async def submit_parse_job(
     file: UploadFile = None,
     file_path: str = None,
     parse_method: str = "auto",
@@ -184,10 +575,49 @@ async def file_parse(
     return_info: bool = False,
     return_content_list: bool = False,
     return_images: bool = False,
-):
+    image_mode: str = "base64",
+    start_page_id: int = 0,
+    end_page_id: Optional[int] = None,
+) -> ParseJob:
+    """
+    Queue a parse job, arguments are the same as the ones of /file_parse.
+    """
+    if (file is None and file_path is None) or (
+        file is not None and file_path is not None
+    ):
+        raise HTTPException(status_code=400, detail="Must provide either file or file_path")
+    if image_mode not in IMAGE_MODES:
+        raise HTTPException(status_code=400, detail=f"image_mode must be one of: {', '.join(IMAGE_MODES)}")
+
+    try:
+        return job_queue.submit(
+            file_bytes=await file.read() if file is not None else None,
+            file_path=file_path,
+            file_name=file.filename if file is not None else None,
+            parse_method=parse_method,
+            is_json_md_dump=is_json_md_dump,
+            output_dir=output_dir,
+            return_layout=return_layout,
+            return_info=return_info,
+            return_content_list=return_content_list,
+            return_images=return_images,
+            image_mode=image_mode,
+            start_page_id=start_page_id,
+            end_page_id=end_page_id,
+        )
+    except QueueFullError as e:
+        raise HTTPException(status_code=503, detail=str(e))
+
+
+@app.post(
+    "/file_parse",
+    tags=["projects"],
+    summary="Parse files (supports local files and S3)",
+)
+async def file_parse(job: ParseJob = Depends(submit_parse_job)):
     """
     Execute the process of converting PDF to JSON and MD, outputting MD and JSON files
-    to the specified directory.
+    to the specified directory, and wait for the result.
 
     Args:
         file: The PDF file to be parsed. Must not be specified together with
@@ -204,105 +634,58 @@ async def file_parse(
         return_layout: Whether to return parsed PDF layout. Default to False
         return_info: Whether to return parsed PDF info. Default to False
         return_content_list: Whether to return parsed PDF content list. Default to False
+        return_images: Whether to return the extracted images. Default to False
+        image_mode: How images are returned, "base64" inlines them as data urls, "reference"
+            returns `/blobs/{blob_id}` urls of a content-addressed store instead. Default to base64
+        start_page_id: First page to parse (0-based). Default to 0
+        end_page_id: Last page to parse (inclusive). Default to the last page
     """
-    try:
-        if (file is None and file_path is None) or (
-            file is not None and file_path is not None
-        ):
-            return JSONResponse(
-                content={"error": "Must provide either file or file_path"},
-                status_code=400,
-            )
+    await job.done.wait()
+    if job.status != "done":
+        return JSONResponse(content={"error": job.error}, status_code=500)
+    return JSONResponse(job.result, status_code=200)
 
-        # Get PDF filename
-        file_name = os.path.basename(file_path if file_path else file.filename).split(
-            "."
-        )[0]
-        output_path = f"{output_dir}/{file_name}"
-        output_image_path = f"{output_path}/images"
 
-        # Initialize readers/writers and get PDF content
-        writer, image_writer, file_bytes, file_extension = init_writers(
-            file_path=file_path,
-            file=file,
-            output_path=output_path,
-            output_image_path=output_image_path,
-        )
+@app.post("/jobs", tags=["jobs"], summary="Queue a parse job and return its id")
+async def create_job(job: ParseJob = Depends(submit_parse_job)):
+    """Same arguments as /file_parse, poll `/jobs/{job_id}` and fetch `/jobs/{job_id}/result`."""
+    return JSONResponse({"job_id": job.job_id, "status": job.status}, status_code=202)
 
-        # Process PDF
-        infer_result, pipe_result = process_file(file_bytes, file_extension, parse_method, image_writer)
-
-        # Use MemoryDataWriter to get results
-        content_list_writer = MemoryDataWriter()
-        md_content_writer = MemoryDataWriter()
-        middle_json_writer = MemoryDataWriter()
-
-        # Use PipeResult's dump method to get data
-        pipe_result.dump_content_list(content_list_writer, "", "images")
-        pipe_result.dump_md(md_content_writer, "", "images")
-        pipe_result.dump_middle_json(middle_json_writer, "")
-
-        # Get content
-        content_list = json.loads(content_list_writer.get_value())
-        md_content = md_content_writer.get_value()
-        middle_json = json.loads(middle_json_writer.get_value())
-        model_json = infer_result.get_infer_res()
-
-        # If results need to be saved
-        if is_json_md_dump:
-            writer.write_string(
-                f"{file_name}_content_list.json", content_list_writer.get_value()
-            )
-            writer.write_string(f"{file_name}.md", md_content)
-            writer.write_string(
-                f"{file_name}_middle.json", middle_json_writer.get_value()
-            )
-            writer.write_string(
-                f"{file_name}_model.json",
-                json.dumps(model_json, indent=4, ensure_ascii=False),
-            )
-            # Save visualization results
-            pipe_result.draw_layout(os.path.join(output_path, f"{file_name}_layout.pdf"))
-            pipe_result.draw_span(os.path.join(output_path, f"{file_name}_spans.pdf"))
-            pipe_result.draw_line_sort(
-                os.path.join(output_path, f"{file_name}_line_sort.pdf")
-            )
-            infer_result.draw_model(os.path.join(output_path, f"{file_name}_model.pdf"))
-
-        # Build return data
-        data = {}
-        if return_layout:
-            data["layout"] = model_json
-        if return_info:
-            data["info"] = middle_json
-        if return_content_list:
-            data["content_list"] = content_list
-        if return_images:
-            image_paths = glob(f"{output_image_path}/*.jpg")
-            data["images"] = {
-                os.path.basename(
-                    image_path
-                ): f"data:image/jpeg;base64,{encode_image(image_path)}"
-                for image_path in image_paths
-            }
-        data["md_content"] = md_content  # md_content is always returned
 
-        # Clean up memory writers
-        content_list_writer.close()
-        md_content_writer.close()
-        middle_json_writer.close()
+@app.get("/jobs/{job_id}", tags=["jobs"], summary="Get the status of a parse job")
+async def get_job(job_id: str):
+    job = job_queue.get(job_id)
+    if job is None:
+        raise HTTPException(status_code=404, detail=f"Unknown job: {job_id}")
+    return job.info()
 
-        return JSONResponse(data, status_code=200)
 
-    except Exception as e:
-        logger.exception(e)
-        return JSONResponse(content={"error": str(e)}, status_code=500)
-    
+@app.get("/jobs/{job_id}/result", tags=["jobs"], summary="Get the result of a finished parse job")
+async def get_job_result(job_id: str):
+    job = job_queue.get(job_id)
+    if job is None:
+        raise HTTPException(status_code=404, detail=f"Unknown job: {job_id}")
+    if not job.done.is_set():
+        return JSONResponse(job.info(), status_code=202)
+    if job.status != "done":
+        return JSONResponse(content={"error": job.error}, status_code=500)
+    return JSONResponse(job.result, status_code=200)
+
+
+@app.get("/blobs/{blob_id}", tags=["jobs"], summary="Download an image returned with image_mode=reference")
+async def get_blob(blob_id: str):
+    if not BLOB_ID_PATTERN.match(blob_id):
+        raise HTTPException(status_code=400, detail=f"Invalid blob id: {blob_id}")
+    blob_path = os.path.join(MINERU_BLOB_DIR, blob_id)
+    if not os.path.isfile(blob_path):
+        raise HTTPException(status_code=404, detail=f"Unknown blob: {blob_id}")
+    return FileResponse(blob_path, media_type="image/jpeg" if blob_id.endswith(".jpg") else None)
+
 
 @app.get("/health")
 async def check_health() -> dict:
     """Check the health of the service"""
-    return {"status": "ok"}
+    return {"status": "ok", **job_queue.stats()}
 
 
 if __name__ == "__main__":
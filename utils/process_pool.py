@@ -0,0 +1,45 @@
+"""
+@File   : process_pool.py
+@Desc   : 进程内共享的具名进程池，供解析、切分等CPU密集型任务使用
+"""
+import threading
+import multiprocessing
+from concurrent.futures import ProcessPoolExecutor
+from typing import Dict
+
+_process_pools: Dict[str, ProcessPoolExecutor] = {}
+_process_pool_sizes: Dict[str, int] = {}
+_process_pools_lock = threading.Lock()
+
+
+def get_process_pool(pool_name: str, max_workers: int) -> ProcessPoolExecutor:
+    """
+    Return the process pool registered under `pool_name`, creating it with `max_workers`
+    processes on first use; later calls share the same pool. Submitted functions and
+    arguments must be picklable.
+
+    Workers are started with the "spawn" method: forking a multithreaded process would copy
+    held locks and the state of gRPC/Milvus clients and SQLite connections into the children.
+    """
+    if pool_name not in _process_pools:
+        with _process_pools_lock:
+            if pool_name not in _process_pools:
+                _process_pools[pool_name] = ProcessPoolExecutor(
+                    max_workers=max_workers,
+                    mp_context=multiprocessing.get_context("spawn")
+                )
+                _process_pool_sizes[pool_name] = max_workers
+    return _process_pools[pool_name]
+
+
+def shutdown_process_pools():
+    """Shut down every process pool, cancelling the tasks that have not started yet."""
+    with _process_pools_lock:
+        for process_pool in _process_pools.values():
+            process_pool.shutdown(wait=False, cancel_futures=True)
+        _process_pools.clear()
+        _process_pool_sizes.clear()
+
+
+def process_pool_stats() -> Dict[str, Dict[str, int]]:
+    return {name: {"max_workers": max_workers} for name, max_workers in _process_pool_sizes.items()}
@@ -11,13 +11,16 @@ sys.path.append("..")
 
 import json
 from typing import List, Optional, Dict
+import httpx
 import requests
 from loguru import logger
 from tenacity import retry, stop_after_attempt, wait_exponential
 from rerank.config import REQUEST_TIMEOUT, MAX_RETRIES
 from services.config import RERANKER_API_URL
+from rerank.scoreCache import cached_rerank
 
 
+@cached_rerank()
 @retry(stop=stop_after_attempt(MAX_RETRIES), wait=wait_exponential(multiplier=1, min=4, max=10))
 def reranker_api(query: str, top_k: int, sentences: List[str]) -> Optional[List[Dict[str, float]]]:
     """
@@ -76,6 +79,60 @@ def reranker_api(query: str, top_k: int, sentences: List[str]) -> Optional[List[
         return None
 
 
+@cached_rerank()
+@retry(stop=stop_after_attempt(MAX_RETRIES), wait=wait_exponential(multiplier=1, min=4, max=10))
+async def async_reranker_api(query: str, top_k: int, sentences: List[str]) -> Optional[List[Dict[str, float]]]:
+    """
+    异步调用 Reranker API 对候选句子进行重新排序，不阻塞事件循环
+    
+    Args:
+        query: 查询文本字符串
+        sentences: 需要排序的候选句子列表
+
+    Returns:
+        重新排序的结果列表（包含句子及其分数），如果请求失败则返回 None
+    """
+    if not query or not query.strip():
+        logger.error("输入的查询无效")
+        return None
+
+    if not sentences or not all(isinstance(sentence, str) and sentence.strip() for sentence in sentences):
+        logger.error("输入的候选句子无效")
+        return None
+
+    body = {
+        "query": query,
+        "top_k": top_k,
+        "sentences": sentences
+    }
+
+    try:
+        async with httpx.AsyncClient(timeout=REQUEST_TIMEOUT) as client:
+            response = await client.post(url=RERANKER_API_URL, json=body)
+
+        if response.status_code != 200:
+            logger.error(f"API请求失败: {response.status_code}\n响应数据: {response.text}")
+            return None
+
+        response_data = response.json()
+
+        if "results" not in response_data:
+            logger.error("API响应格式错误，缺少 'results' 字段")
+            return None
+
+        return response_data.get("results")
+
+    except httpx.TimeoutException:
+        logger.error("API请求超时")
+        return None
+    except httpx.HTTPError as e:
+        logger.error(f"API请求异常: {str(e)}")
+        return None
+    except Exception as e:
+        logger.error(f"处理响应时发生错误: {str(e)}")
+        return None
+
+
 if __name__ == "__main__":
     # 测试代码
     test_query = "What is the weather like?"
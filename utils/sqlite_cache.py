@@ -0,0 +1,149 @@
+"""
+@File   : sqlite_cache.py
+@Desc   : 基于SQLite的持久化键值缓存，按总字节数做LRU淘汰
+"""
+import os
+import time
+import sqlite3
+import threading
+from typing import Dict, Iterable, Optional, Any
+
+from loguru import logger
+
+
+class SQLiteCache:
+    """
+    A persistent key -> bytes cache stored in a single SQLite file.
+
+    Entries are evicted in least-recently-used order once the total payload size exceeds
+    `max_bytes` (down to `low_watermark * max_bytes`, so eviction does not run on every put).
+    The cache is safe to share between threads of one process; several processes may open
+    the same file thanks to WAL mode. Hit/miss counters are kept per process.
+    """
+    def __init__(self, path: str, max_bytes: int, low_watermark: float = 0.9, table: str = "cache"):
+        self.path = path
+        self.max_bytes = max_bytes
+        self.low_watermark = low_watermark
+        self.table = table
+
+        directory = os.path.dirname(os.path.abspath(path))
+        os.makedirs(directory, exist_ok=True)
+
+        self._lock = threading.Lock()
+        self._conn = sqlite3.connect(path, check_same_thread=False, timeout=30)
+        self._conn.execute("PRAGMA journal_mode=WAL")
+        self._conn.execute("PRAGMA synchronous=NORMAL")
+        self._conn.execute(
+            f"CREATE TABLE IF NOT EXISTS {table} ("
+            "key TEXT PRIMARY KEY, value BLOB NOT NULL, size INTEGER NOT NULL, last_access REAL NOT NULL)"
+        )
+        self._conn.execute(f"CREATE INDEX IF NOT EXISTS {table}_last_access ON {table}(last_access)")
+        self._conn.commit()
+
+        row = self._conn.execute(f"SELECT COALESCE(SUM(size), 0), COUNT(*) FROM {table}").fetchone()
+        self._total_bytes, self._entries = row[0], row[1]
+
+        self.hits = 0
+        self.misses = 0
+        self.evictions = 0
+
+    def get_many(self, keys: Iterable[str]) -> Dict[str, bytes]:
+        """Return the cached values of the given keys; missing keys are left out."""
+        keys = list(dict.fromkeys(keys))
+        if not keys:
+            return {}
+
+        found: Dict[str, bytes] = {}
+        with self._lock:
+            # SQLite limits the number of bound parameters, query in slices
+            for start in range(0, len(keys), 500):
+                key_slice = keys[start:start + 500]
+                placeholders = ",".join("?" * len(key_slice))
+                rows = self._conn.execute(
+                    f"SELECT key, value FROM {self.table} WHERE key IN ({placeholders})", key_slice
+                ).fetchall()
+                found.update(rows)
+            if found:
+                now = time.time()
+                self._conn.executemany(
+                    f"UPDATE {self.table} SET last_access = ? WHERE key = ?",
+                    [(now, key) for key in found]
+                )
+                self._conn.commit()
+            self.hits += len(found)
+            self.misses += len(keys) - len(found)
+        return found
+
+    def get(self, key: str) -> Optional[bytes]:
+        return self.get_many([key]).get(key)
+
+    def put_many(self, items: Dict[str, bytes]):
+        """Insert or replace the given entries and evict old entries if the cache is full."""
+        if not items:
+            return
+        now = time.time()
+        with self._lock:
+            keys = list(items.keys())
+            for start in range(0, len(keys), 500):
+                key_slice = keys[start:start + 500]
+                placeholders = ",".join("?" * len(key_slice))
+                replaced = self._conn.execute(
+                    f"SELECT COALESCE(SUM(size), 0), COUNT(*) FROM {self.table} WHERE key IN ({placeholders})", key_slice
+                ).fetchone()
+                self._total_bytes -= replaced[0]
+                self._entries -= replaced[1]
+            self._conn.executemany(
+                f"INSERT OR REPLACE INTO {self.table} (key, value, size, last_access) VALUES (?, ?, ?, ?)",
+                [(key, value, len(value), now) for key, value in items.items()]
+            )
+            self._total_bytes += sum(len(value) for value in items.values())
+            self._entries += len(items)
+            if self._total_bytes > self.max_bytes:
+                self._evict()
+            self._conn.commit()
+
+    def put(self, key: str, value: bytes):
+        self.put_many({key: value})
+
+    def _evict(self):
+        target = int(self.max_bytes * self.low_watermark)
+        while self._total_bytes > target and self._entries > 0:
+            rows = self._conn.execute(
+                f"SELECT key, size FROM {self.table} ORDER BY last_access ASC LIMIT 256"
+            ).fetchall()
+            if not rows:
+                break
+            evicted_keys = []
+            for key, size in rows:
+                if self._total_bytes <= target:
+                    break
+                evicted_keys.append((key,))
+                self._total_bytes -= size
+                self._entries -= 1
+            self._conn.executemany(f"DELETE FROM {self.table} WHERE key = ?", evicted_keys)
+            self.evictions += len(evicted_keys)
+        logger.info(f"Evicted cache entries of {self.path}, {self._entries} entries / {self._total_bytes} bytes left")
+
+    def clear(self):
+        with self._lock:
+            self._conn.execute(f"DELETE FROM {self.table}")
+            self._conn.commit()
+            self._total_bytes, self._entries = 0, 0
+
+    def stats(self) -> Dict[str, Any]:
+        with self._lock:
+            total = self.hits + self.misses
+            return {
+                "path": self.path,
+                "entries": self._entries,
+                "bytes": self._total_bytes,
+                "max_bytes": self.max_bytes,
+                "hits": self.hits,
+                "misses": self.misses,
+                "hit_rate": self.hits / total if total else 0.0,
+                "evictions": self.evictions
+            }
+
+    def close(self):
+        with self._lock:
+            self._conn.close()